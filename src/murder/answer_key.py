@@ -0,0 +1,174 @@
+import functools
+import inspect
+import typing
+
+from murder.mansion import Mansion
+from murder.questions import SeedQuestion, Worksheet, make_worksheet
+from murder.timeline import Timeline, index_game
+
+# Source code question -> (Mansion method, text that identifies the line within that method)
+SOURCE_CODE_LINES: dict[str, tuple[str, str]] = {
+    "What line number in `mansion.Mansion:next_turn()` decides how many moves a player gets?": (
+        "next_turn",
+        "player.set_moves(",
+    ),
+    "What line number in `mansion.Mansion` decides the cool_down when a murderer kills someone?": (
+        "next_turn",
+        "self.cool_down = self.time_val +",
+    ),
+    "What line number in `mansion.Mansion:next_turn()` method increments the time at the end of each turn?": (
+        "next_turn",
+        "self.time_val += TIME_MINUTE_INCREMENTS",
+    ),
+    "What line number in `mansion.Mansion` changes the current player's location attribute after they move?": (
+        "next_turn",
+        "player.set_location(",
+    ),
+    "What line number in `mansion.Mansion` returns False if the murderer wins?": (
+        "next_turn",
+        "return False",
+    ),
+    "What line number in `mansion.Mansion:__init__()` creates all the items?": (
+        "__init__",
+        "self.spawn_items()",
+    ),
+    "What line number in `mansion.Mansion:__init__()` sets the random seed with the hashed `case_number`?": (
+        "__init__",
+        "hash(case_number)",
+    ),
+}
+
+
+def format_time(start_hour: int, minutes: int) -> str:
+    """
+    :param start_hour: The hour (pm) the game started
+    :param minutes: Minutes since the start of the game
+    :returns: The time in XX:XXpm form, the same way the questions write it
+    """
+    return f"{start_hour + minutes // 60}:{minutes % 60:02d}pm"
+
+
+@functools.lru_cache(maxsize=None)
+def source_code_line(question: str) -> int:
+    """
+    Finds the line in mansion.py a source code question asks about (the source
+    is only searched once per question)
+
+    :param question: One of the source code questions from Questions.in
+    :returns: 1-based line number in mansion.py
+    """
+    method_name, text = SOURCE_CODE_LINES[question]
+    lines, first_line = inspect.getsourcelines(getattr(Mansion, method_name))
+    for offset, line in enumerate(lines):
+        if text in line and not line.strip().startswith("#"):
+            return first_line + offset
+    raise ValueError(f"{text!r} not found in Mansion.{method_name}()")
+
+
+class Solver:
+    """
+    Answers every question about one finished game, using its Timeline
+    """
+
+    def __init__(self, mansion: Mansion, timeline: Timeline) -> None:
+        self.mansion = mansion
+        self.timeline = timeline
+        self.start = mansion.get_start_and_end_times()[0]
+
+    def time(self, minutes: int) -> str:
+        return format_time(self.start, minutes)
+
+    def room_name(self, room: typing.Sequence[int]) -> str:
+        return self.mansion.room_map[room[0]][room[1]].get_room_name()
+
+    def player_index(self, seed: SeedQuestion) -> int:
+        """
+        :param seed: A seed whose second token is a player's name
+        :returns: Index of the player the seed was made for, which tells apart players with the same name
+        """
+        if seed.player >= 0:
+            return seed.player
+        return [p.get_name() for p in self.mansion.players].index(seed[1])
+
+    def item_index(self, token: str) -> int:
+        name = token.removeprefix("the ")
+        return [i.get_item_name() for i in self.mansion.items].index(name)
+
+    def hard_coded(self, question: str) -> str:
+        """
+        :param question: One of the hard coded questions from Questions.in
+        :returns: The expected answer
+        """
+        m = self.mansion
+        if question == "Who was the murderer?":
+            return m.players[m.murderer].get_name()
+        elif question == "How many items spawned total?":
+            return str(len(m.items))
+        elif question == "How many rooms were there in the mansion?":
+            return str(len(m.room_map) * len(m.room_map[0]))
+        elif question == "Who moved first each turn?":
+            return m.players[(m.murderer + 1) % len(m.players)].get_name()
+        elif question == "How many murder weapons were used?":
+            return str(sum(1 for item in m.items if item.is_marked()))
+        raise ValueError(f"Unknown question: {question!r}")
+
+    def seed(self, seed: SeedQuestion) -> str:
+        """
+        :param seed: The seed a random question was generated from
+        :returns: The expected answer, in the form the question asks for
+        """
+        t = self.timeline
+        if seed[0] == "TIME" and seed[2] == "DEATH":
+            death = t.death(self.player_index(seed))
+            return "Alive" if death is None else self.time(death.time)
+        elif seed[0] == "TIME" and seed[2] == "DROP":
+            drop = t.last_drop(self.item_index(seed[1]))
+            return "Untouched" if drop is None else self.time(drop.time)
+        elif seed[0] == "TIME" and seed[2] == "GRAB":
+            grab = t.first_grab(self.item_index(seed[1]))
+            return "Untouched" if grab is None else self.time(grab.time)
+        elif seed[0] == "ROOM" and seed[2] == "DEATH":
+            death = t.death(self.player_index(seed))
+            return "Alive" if death is None else self.room_name(death.room)
+        elif seed[0] == "ROOM" and seed[2] == "DROP":
+            drop = t.first_drop(self.item_index(seed[1]))
+            return "Untouched" if drop is None else self.room_name(drop.room)
+        elif seed[0] == "ROOM" and seed[2] == "GRAB":
+            grab = t.last_grab(self.item_index(seed[1]))
+            return "Untouched" if grab is None else self.room_name(grab.room)
+        elif seed[0] == "PLAYER" and seed[2] == "GRAB":
+            return str(t.dead_at(int(seed[1])))
+        elif seed[0] == "PLAYER" and seed[2] == "DROP":
+            return str(t.alive_at(int(seed[1])))
+        elif seed[0] == "ROOM":
+            return self.room_name(t.room_of(self.player_index(seed), int(seed[2])))
+        raise ValueError(f"Unknown question seed: {seed!r}")
+
+    def answers(self, worksheet: Worksheet) -> list[str]:
+        """
+        :param worksheet: The questions asked about this game
+        :returns: The expected answers, in the order the questions are asked
+        """
+        answers = [self.hard_coded(q) for q in worksheet.hard_coded]
+        answers += [self.seed(seed) for seed in worksheet.seeds]
+        answers += [str(source_code_line(q)) for q in worksheet.source_code]
+        return answers
+
+
+def answer_key(case_number: str, worksheet: typing.Optional[Worksheet] = None) -> list[str]:
+    """
+    Plays the game for a case number once and answers its worksheet
+
+    :param case_number: The student's "case number"
+    :param worksheet: The questions the student was asked. If not given, the
+        worksheet is regenerated the same way ask_questions() would after the game.
+    :returns: The expected answers, in the order the questions are asked
+    """
+    mansion, timeline = index_game(case_number)
+    if worksheet is None:
+        worksheet = make_worksheet(mansion)
+    return Solver(mansion, timeline).answers(worksheet)
+
+
+if __name__ == "__main__":
+    print("🔍 Hint: To start the investigation, you need to run `main.py`, not this file.")
@@ -0,0 +1,183 @@
+import argparse
+import functools
+import json
+import os
+import sys
+import typing
+from concurrent.futures import ProcessPoolExecutor
+
+from murder.doors import DoorTable
+from murder.mansion import Mansion
+
+
+class GameSummary(typing.NamedTuple):
+    case_number: str
+    murderer: str
+    victims: tuple[str, ...]
+    time_val: int
+    alive: int
+    weapons: tuple[str, ...]
+
+
+def summarize(case_number: str, mansion: Mansion) -> GameSummary:
+    """
+    Condenses a finished game into a GameSummary
+
+    :param case_number: The "case number" the mansion was seeded with
+    :param mansion: A mansion whose game has already been played out
+    :returns: Compact summary of the game's outcome
+    """
+    players = mansion.get_players()
+    return GameSummary(
+        case_number=case_number,
+        murderer=players[mansion.murderer].get_name(),
+        victims=tuple(p.get_name() for p in players if not p.is_alive()),
+        time_val=mansion.time(),
+        alive=mansion.alive_players(),
+        weapons=tuple(i.get_item_name() for i in mansion.get_items() if i.is_marked()),
+    )
+
+
+def play_case(case_number: str, *, alias: bool = False) -> GameSummary:
+    """
+    Plays a single game to completion without any printing or pauses. Doors
+    are chosen from a precomputed DoorTable, which plays the same game.
+
+    :param case_number: The "case number" used to seed the game
+    :param alias: If True, sample doors from alias tables instead. Faster,
+        but the game is not the one a student gets for this case number.
+    :returns: Summary of the finished game
+    """
+    mansion = Mansion(case_number)
+    mansion.doors = DoorTable(mansion.get_rooms(), alias=alias)
+    while mansion.next_turn():
+        pass
+    return summarize(case_number, mansion)
+
+
+T = typing.TypeVar("T")
+R = typing.TypeVar("R")
+
+
+def _apply_chunk(function: typing.Callable[[T], R], chunk: list[T]) -> list[R]:
+    return [function(value) for value in chunk]
+
+
+def map_chunked(
+    function: typing.Callable[[T], R],
+    values: list[T],
+    *,
+    workers: typing.Optional[int] = None,
+    chunk_size: typing.Optional[int] = None,
+) -> typing.Iterator[R]:
+    """
+    Calls a (picklable, module level) function on every value using a process
+    pool, handing values to the workers in chunks. Results come back in order.
+
+    :param function: The function to call on each value
+    :param values: The values to call it on
+    :param workers: Number of worker processes, defaults to the CPU count.
+        A value of 1 calls the function in the current process.
+    :param chunk_size: Number of values handed to a worker at once, defaults
+        to an even split of four chunks per worker
+    :returns: Iterator of results, one per value, in input order
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(values) <= 1:
+        yield from map(function, values)
+        return
+
+    if chunk_size is None:
+        chunk_size = max(1, len(values) // (workers * 4))
+    chunks = [values[i : i + chunk_size] for i in range(0, len(values), chunk_size)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for results in pool.map(functools.partial(_apply_chunk, function), chunks):
+            yield from results
+
+
+def iter_batch(
+    case_numbers: typing.Iterable[typing.Union[str, int]],
+    *,
+    workers: typing.Optional[int] = None,
+    chunk_size: typing.Optional[int] = None,
+    alias: bool = False,
+) -> typing.Iterator[GameSummary]:
+    """
+    Plays many games on a process pool, yielding summaries in input order
+
+    Every game seeds itself from its own case number, so the results do not
+    depend on the number of workers or on how the cases are chunked.
+
+    :param case_numbers: The case numbers to play (ints are converted to str)
+    :param workers: Number of worker processes, defaults to the CPU count.
+        A value of 1 plays every game in the current process.
+    :param chunk_size: Number of games handed to a worker at once, defaults
+        to an even split of four chunks per worker
+    :param alias: Sample doors from alias tables (see play_case())
+    :returns: Iterator of GameSummary, one per case number
+    """
+    cases = [str(c) for c in case_numbers]
+    return map_chunked(functools.partial(play_case, alias=alias), cases, workers=workers, chunk_size=chunk_size)
+
+
+def run_batch(
+    case_numbers: typing.Iterable[typing.Union[str, int]],
+    *,
+    workers: typing.Optional[int] = None,
+    chunk_size: typing.Optional[int] = None,
+    alias: bool = False,
+) -> list[GameSummary]:
+    """
+    Plays many games on a process pool. See iter_batch()
+
+    :returns: List of GameSummary, one per case number, in input order
+    """
+    return list(iter_batch(case_numbers, workers=workers, chunk_size=chunk_size, alias=alias))
+
+
+def is_case_number(text: str) -> bool:
+    """
+    :param text: A case number as typed in by a student
+    :returns: True if it's a number (ASCII digits only), which every game can be played for
+    """
+    return text.isascii() and text.isdigit()
+
+
+def parse_case_numbers(tokens: list[str]) -> list[str]:
+    """
+    Expands command line case numbers. "START-STOP" expands to the inclusive
+    integer range, anything else is used verbatim.
+
+    :param tokens: Case numbers and/or ranges
+    :returns: Flat list of case numbers
+    """
+    cases: list[str] = []
+    for token in tokens:
+        start, sep, stop = token.partition("-")
+        if sep and start.isdigit() and stop.isdigit():
+            cases.extend(str(n) for n in range(int(start), int(stop) + 1))
+        else:
+            cases.append(token)
+    return cases
+
+
+def main(argv: typing.Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Play many murder mystery cases and summarize the outcomes")
+    parser.add_argument("cases", nargs="+", help='case numbers, or inclusive ranges such as "1-1000"')
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=None, help="games handed to a worker at once")
+    parser.add_argument(
+        "--alias", action="store_true", help="sample doors from alias tables (faster, but not the students' games)"
+    )
+    args = parser.parse_args(argv)
+
+    cases = parse_case_numbers(args.cases)
+    summaries = iter_batch(cases, workers=args.workers, chunk_size=args.chunk_size, alias=args.alias)
+    for summary in summaries:
+        sys.stdout.write(json.dumps(summary._asdict()) + "\n")
+
+
+if __name__ == "__main__":
+    main()
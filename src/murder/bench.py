@@ -0,0 +1,327 @@
+import argparse
+import functools
+import json
+import pathlib
+import random
+import sys
+import time
+import typing
+
+from murder.catalog import get_catalog
+from murder.dice import Dice
+from murder.mansion import Mansion
+from murder.person import Person
+from murder.procedural import ProceduralMansion
+from murder.questions import generate_questions, get_random_question_seeds
+from murder.spatial import SpatialIndex
+from murder.trace import record, replay
+from murder.utils import Coordinates, hash
+
+# A benchmark plays `number` operations and returns the seconds they took, doing
+# any setup or resetting between operations outside of the time it reports
+Benchmark = typing.Callable[[int], float]
+
+# The "benchmarks" folder lives next to "src", two levels above this package
+DEFAULT_BASELINE = pathlib.Path(__file__).resolve().parent.parent.parent / "benchmarks" / "baseline.json"
+# Mansion sizes (width, height) to build and play, and (players, grid side) to pursue through
+MANSION_SIZES = ((4, 3), (6, 4))
+PURSUIT_SIZES = ((6, 6), (100, 32), (1000, 128))
+# (width, height, guests) of procedurally generated mansions to build and play
+PROCEDURAL_SIZES = ((100, 100, 1000),)
+
+
+@functools.lru_cache(maxsize=None)
+def cases_of_size(width: int, height: int, count: int = 20) -> tuple[str, ...]:
+    """
+    :returns: The first case numbers whose mansion is width x height
+    """
+    cases: list[str] = []
+    n = 0
+    while len(cases) < count:
+        mansion = Mansion(str(n))
+        if (len(mansion.get_rooms()), len(mansion.get_rooms()[0])) == (width, height):
+            cases.append(str(n))
+        n += 1
+    return tuple(cases)
+
+
+def time_each(
+    number: int, setup: typing.Callable[[int], typing.Any], run: typing.Callable[[typing.Any], typing.Any]
+) -> float:
+    """
+    :param number: Number of operations to time
+    :param setup: Called (untimed) with the operation's number before each operation
+    :param run: Called (timed) with what setup returned
+    :returns: Total seconds spent in run
+    """
+    total = 0.0
+    for i in range(number):
+        value = setup(i)
+        start = time.perf_counter()
+        run(value)
+        total += time.perf_counter() - start
+    return total
+
+
+def bench_init(width: int, height: int) -> Benchmark:
+    cases = cases_of_size(width, height)
+
+    def run(number: int) -> float:
+        start = time.perf_counter()
+        for i in range(number):
+            Mansion(cases[i % len(cases)])
+        return time.perf_counter() - start
+
+    return run
+
+
+def bench_init_phase(width: int, height: int, phase: str) -> Benchmark:
+    """
+    Times one of the phases of Mansion.__init__() on its own, replaying the
+    random stream and the earlier phases of a case untimed before every call
+    """
+    cases = cases_of_size(width, height)
+    mansions = [Mansion(case) for case in cases]
+
+    def setup(i: int) -> Mansion:
+        mansion = mansions[i % len(mansions)]
+        mansion.rng = Dice(hash(cases[i % len(cases)]))
+        if phase != "generate_players":
+            mansion.players = mansion.generate_players()
+        if phase == "spawn_items":
+            mansion.room_map = mansion.generate_rooms()
+        return mansion
+
+    return lambda number: time_each(number, setup, lambda mansion: getattr(mansion, phase)())
+
+
+def bench_procedural_init(width: int, height: int, guests: int) -> Benchmark:
+    def run(number: int) -> float:
+        start = time.perf_counter()
+        for i in range(number):
+            ProceduralMansion(str(i), width=width, height=height, guests=guests)
+        return time.perf_counter() - start
+
+    return run
+
+
+def bench_next_turn(width: int, height: int, guests: typing.Optional[int] = None) -> Benchmark:
+    """
+    Times single turns from the start of a game to its end, going back to
+    the start (untimed) when a game is over
+
+    :param guests: Play procedurally generated mansions with this many guests, if given
+    """
+    if guests is None:
+        mansions = [Mansion(case) for case in cases_of_size(width, height)]
+    else:
+        mansions = [ProceduralMansion(str(i), width=width, height=height, guests=guests) for i in range(3)]
+    starts = [mansion.snapshot() for mansion in mansions]
+    state = {"game": 0}
+
+    def setup(i: int) -> Mansion:
+        mansion = mansions[state["game"]]
+        if mansion.time() >= (mansion.end - mansion.start) * 60 or mansion.murderer_wins():
+            mansion.restore(starts[state["game"]])
+            state["game"] = (state["game"] + 1) % len(mansions)
+            mansion = mansions[state["game"]]
+        return mansion
+
+    return lambda number: time_each(number, setup, Mansion.next_turn)
+
+
+def bench_full_game(width: int, height: int) -> Benchmark:
+    cases = cases_of_size(width, height)
+
+    def play(case: str) -> None:
+        mansion = Mansion(case)
+        while mansion.next_turn():
+            pass
+
+    return lambda number: time_each(number, lambda i: cases[i % len(cases)], play)
+
+
+def bench_replay(width: int, height: int) -> Benchmark:
+    """
+    Times replaying the traces of the games full_game plays, to compare against it
+    """
+    traces = [record(Mansion(case), case) for case in cases_of_size(width, height)]
+    return lambda number: time_each(number, lambda i: traces[i % len(traces)], replay)
+
+
+def bench_choose_door(width: int, height: int) -> Benchmark:
+    rooms = get_catalog().rooms
+    rng = random.Random(1)
+    player = Person("Benchmark", 0)
+    spots = [(rng.randrange(width), rng.randrange(height), rooms[rng.randrange(len(rooms))]) for _ in range(64)]
+
+    def setup(i: int) -> tuple:
+        player.set_moves(7)
+        return spots[i % len(spots)]
+
+    def run(spot: tuple) -> None:
+        x, y, room = spot
+        player.choose_door(list(room.door_weights), list(room.door_costs), Coordinates(x, y), (width, height), rng)
+
+    return lambda number: time_each(number, setup, run)
+
+
+def bench_pursue(players: int, side: int, indexed: bool) -> Benchmark:
+    rng = random.Random(2)
+    people = [Person(f"Player {p}", p) for p in range(players)]
+    index = SpatialIndex(side, side)
+    for p, person in enumerate(people):
+        person.set_location(rng.randrange(side), rng.randrange(side))
+        index.place(p, *person.get_location())
+
+    def run(number: int) -> float:
+        start = time.perf_counter()
+        for i in range(number):
+            murderer = people[i % players]
+            if indexed:
+                # Same as Mansion.pursue()
+                target = index.nearest(*murderer.get_location(), exclude=(murderer.index,))
+                murderer.pursue(murderer.get_location(), [] if target < 0 else [people[target]])
+            else:
+                murderer.pursue(murderer.get_location(), people)
+        return time.perf_counter() - start
+
+    return run
+
+
+def bench_questions(width: int, height: int) -> Benchmark:
+    mansions = []
+    for case in cases_of_size(width, height):
+        mansion = Mansion(case)
+        while mansion.next_turn():
+            pass
+        mansions.append(mansion)
+
+    def run(mansion: Mansion) -> None:
+        generate_questions(mansion, get_random_question_seeds(mansion, 3))
+
+    return lambda number: time_each(number, lambda i: mansions[i % len(mansions)], run)
+
+
+def benchmarks(name_filter: str = "") -> dict[str, typing.Callable[[], Benchmark]]:
+    """
+    :param name_filter: Only keep the benchmarks whose name contains this
+    :returns: Benchmark name -> function that sets the benchmark up
+    """
+    suite: dict[str, typing.Callable[[], Benchmark]] = {}
+    for width, height in MANSION_SIZES:
+        size = f"[mansion={width}x{height}]"
+        suite[f"mansion_init{size}"] = functools.partial(bench_init, width, height)
+        for phase in ("generate_players", "generate_rooms", "spawn_items"):
+            suite[f"mansion_init.{phase}{size}"] = functools.partial(bench_init_phase, width, height, phase)
+        suite[f"next_turn{size}"] = functools.partial(bench_next_turn, width, height)
+        suite[f"full_game{size}"] = functools.partial(bench_full_game, width, height)
+        suite[f"replay{size}"] = functools.partial(bench_replay, width, height)
+        suite[f"choose_door{size}"] = functools.partial(bench_choose_door, width, height)
+        suite[f"questions{size}"] = functools.partial(bench_questions, width, height)
+    for width, height, guests in PROCEDURAL_SIZES:
+        size = f"[mansion={width}x{height},guests={guests}]"
+        suite[f"procedural_init{size}"] = functools.partial(bench_procedural_init, width, height, guests)
+        suite[f"next_turn{size}"] = functools.partial(bench_next_turn, width, height, guests)
+    for players, side in PURSUIT_SIZES:
+        for indexed in (False, True):
+            name = f"pursue[players={players},grid={side}x{side}{',indexed' if indexed else ''}]"
+            suite[name] = functools.partial(bench_pursue, players, side, indexed)
+    return {name: setup for name, setup in suite.items() if name_filter in name}
+
+
+def measure(benchmark: Benchmark, *, min_time: float = 0.05, repeat: int = 5) -> float:
+    """
+    Times a benchmark like timeit does: the number of operations per round
+    grows until a round takes min_time, and the best round counts
+
+    :param benchmark: The benchmark to time
+    :param min_time: Seconds a round should take at least
+    :param repeat: Number of rounds
+    :returns: Seconds per operation in the fastest round
+    """
+    number = 1
+    while (seconds := benchmark(number)) < min_time:
+        number *= 2 if seconds <= 0 else max(2, min(10, int(min_time / seconds) + 1))
+    best = seconds / number
+    for _ in range(repeat - 1):
+        best = min(best, benchmark(number) / number)
+    return best
+
+
+def run(
+    name_filter: str = "", *, min_time: float = 0.05, repeat: int = 5, report: typing.Optional[typing.TextIO] = None
+) -> dict[str, float]:
+    """
+    :param name_filter: Only run the benchmarks whose name contains this
+    :param min_time: Seconds a round should take at least (see measure())
+    :param repeat: Number of rounds per benchmark
+    :param report: Where to write each result as it comes in, if anywhere
+    :returns: Benchmark name -> seconds per operation
+    """
+    results = {}
+    for name, setup in benchmarks(name_filter).items():
+        results[name] = measure(setup(), min_time=min_time, repeat=repeat)
+        if report is not None:
+            report.write(f"{name:<60} {results[name] * 1e6:12.2f} us\n")
+    return results
+
+
+def regressions(results: dict[str, float], baseline: dict[str, float], threshold: float) -> dict[str, float]:
+    """
+    :param results: Benchmark name -> seconds per operation, just measured
+    :param baseline: Benchmark name -> seconds per operation, from before
+    :param threshold: Slowdown allowed, as a fraction (0.2 allows 20% slower)
+    :returns: Benchmark name -> slowdown (as a fraction) for every benchmark beyond the threshold
+    """
+    slowdowns = {name: results[name] / baseline[name] - 1 for name in results if baseline.get(name, 0) > 0}
+    return {name: slowdown for name, slowdown in slowdowns.items() if slowdown > threshold}
+
+
+def main(argv: typing.Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the murder mystery game, and compare against a baseline")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds each timing round lasts at least")
+    parser.add_argument("--repeat", type=int, default=5, help="timing rounds per benchmark (the best one counts)")
+    parser.add_argument(
+        "--baseline",
+        default=str(DEFAULT_BASELINE),
+        help="baseline JSON (default: the project's benchmarks/baseline.json)",
+    )
+    parser.add_argument("--threshold", type=float, default=0.2, help="slowdown that counts as a regression (0.2: 20%%)")
+    parser.add_argument(
+        "--save", action="store_true", help="write the results as the new baseline (with --filter, update only theirs)"
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.filter, min_time=args.min_time, repeat=args.repeat, report=sys.stdout)
+    if args.save:
+        saved = {}
+        if args.filter:
+            # Only the benchmarks that ran get new timings, the rest of the baseline stays
+            try:
+                with open(args.baseline) as file:
+                    saved = json.load(file)
+            except FileNotFoundError:
+                pass
+        saved.update(results)
+        with open(args.baseline, "w") as file:
+            json.dump(saved, file, indent=2, sort_keys=True)
+            file.write("\n")
+        return
+
+    try:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    except FileNotFoundError:
+        sys.stdout.write(f"No baseline at {args.baseline}, run with --save to make one\n")
+        sys.exit(1)
+    slower = regressions(results, baseline, args.threshold)
+    for name, slowdown in slower.items():
+        sys.stdout.write(f"REGRESSION {name}: {slowdown:+.0%} slower than the baseline\n")
+    if slower:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import functools
+import types
+import typing
+
+from murder.item import Item
+from murder.room import Room
+from murder.utils import resource_path
+
+
+class RoomTemplate(typing.NamedTuple):
+    name: str
+    door_weights: tuple[float, ...]
+    door_costs: tuple[int, ...]
+
+    def new_room(self) -> Room:
+        """
+        :returns: A fresh, empty Room built from this template
+        """
+        return Room(self.name, list(self.door_weights), list(self.door_costs))
+
+
+class ItemTemplate(typing.NamedTuple):
+    item_name: str
+    location: str
+
+    def new_item(self) -> Item:
+        """
+        :returns: A fresh, unmarked Item built from this template
+        """
+        item = Item(self.item_name)
+        item.set_location(self.location)
+        return item
+
+
+class Catalog(typing.NamedTuple):
+    """
+    Everything read from the "res" folder, parsed once and never modified.
+
+    Games only ever read from the catalog and build their own fresh Person,
+    Room and Item objects from it, so a single catalog can be shared by every
+    game (and thread) in the process.
+    """
+
+    people: tuple[str, ...]
+    rooms: tuple[RoomTemplate, ...]
+    items: tuple[ItemTemplate, ...]
+    # Room name -> item that spawns there (later lines in Items.in win)
+    item_by_location: typing.Mapping[str, ItemTemplate]
+    hard_coded_questions: tuple[str, ...]
+    seed_questions: tuple[tuple[str, str, str], ...]
+    source_code_questions: tuple[str, ...]
+
+
+def read_people() -> tuple[str, ...]:
+    """
+    People input file format is: 1 line with #ofPeople, then 1 name per line
+    """
+    with open(resource_path("People.in"), "r") as file:
+        total_available_people = int(file.readline().strip())
+        return tuple(file.readline().strip() for _ in range(total_available_people))
+
+
+def read_rooms() -> tuple[RoomTemplate, ...]:
+    """
+    Room input file format is: 1 line with #ofRooms, then 3 lines per room
+    One line with name, one line with 4 doubles for weights, one line with 4 ints for costs
+    """
+    with open(resource_path("Rooms.in"), "r") as file:
+        potential_rooms = int(file.readline().strip())
+        rooms: list[RoomTemplate] = []
+        for _ in range(potential_rooms):
+            name = file.readline().strip()
+            door_weights = tuple(map(float, file.readline().strip().split()))
+            costs = tuple(map(int, file.readline().strip().split()))
+            rooms.append(RoomTemplate(name, door_weights, costs))
+        return tuple(rooms)
+
+
+def read_items() -> tuple[ItemTemplate, ...]:
+    """
+    Item input file format is: 1 line with #ofItems, then 2 lines per item
+    One line with the item's name, one line with the room it spawns in
+    """
+    with open(resource_path("Items.in"), "r") as file:
+        number_of_items = int(file.readline().strip())
+        items: list[ItemTemplate] = []
+        for _ in range(number_of_items):
+            item_name = file.readline().strip()
+            item_location = file.readline().strip()
+            items.append(ItemTemplate(item_name, item_location))
+        return tuple(items)
+
+
+def read_questions() -> tuple[tuple[str, ...], tuple[tuple[str, str, str], ...], tuple[str, ...]]:
+    """
+    Questions input file has three sections, each 1 line with #ofQuestions
+    followed by 1 question per line: the hard coded questions, the question
+    seeds (3 comma separated tokens), and the source code questions
+
+    :returns: (hard coded questions, question seeds, source code questions)
+    """
+    with open(resource_path("Questions.in"), "r") as file:
+        num_hard_coded_questions = int(file.readline().strip())
+        hard_coded = tuple(file.readline().strip() for _ in range(num_hard_coded_questions))
+
+        random_question_count = int(file.readline().strip())
+        seeds: list[tuple[str, str, str]] = []
+        for _ in range(random_question_count):
+            split = file.readline().strip().split(",")
+            assert len(split) == 3
+            seeds.append((split[0], split[1], split[2]))
+
+        code_questions = int(file.readline().strip())
+        source_code = tuple(file.readline().strip() for _ in range(code_questions))
+
+    return hard_coded, tuple(seeds), source_code
+
+
+@functools.lru_cache(maxsize=None)
+def get_catalog() -> Catalog:
+    """
+    Parses every resource file the first time it's called, then hands out the
+    same immutable Catalog on every later call
+
+    :returns: The process-wide Catalog
+    """
+    items = read_items()
+    hard_coded, seeds, source_code = read_questions()
+    return Catalog(
+        people=read_people(),
+        rooms=read_rooms(),
+        items=items,
+        item_by_location=types.MappingProxyType({item.location: item for item in items}),
+        hard_coded_questions=hard_coded,
+        seed_questions=seeds,
+        source_code_questions=source_code,
+    )
+
+
+if __name__ == "__main__":
+    print("🔍 Hint: To start the investigation, you need to run `main.py`, not this file.")
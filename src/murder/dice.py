@@ -0,0 +1,46 @@
+import random
+import typing
+
+from murder.person import Person
+from murder.utils import Coordinates, DoorCosts, DoorWeights
+
+if typing.TYPE_CHECKING:
+    from murder.doors import DoorTable
+
+
+class Dice(random.Random):
+    """
+    A game's random stream. Mansion.next_turn() rolls every decision it leaves
+    to chance with randint(), except for the door a player takes, which is
+    door(). Both draw exactly what next_turn() always drew, so a case number
+    plays the same game it always did.
+
+    Subclasses can record the rolls and doors or play them back from a
+    recording (see murder.trace) without next_turn() knowing.
+    """
+
+    def door(
+        self,
+        player: Person,
+        weights: DoorWeights,
+        costs: DoorCosts,
+        dim: tuple[int, int],
+        table: typing.Optional["DoorTable"],
+    ) -> Coordinates:
+        """
+        Moves a player through a random door of their room
+
+        :param player: The player moving
+        :param weights: Door weights of the player's room
+        :param costs: Door costs of the player's room
+        :param dim: Dimensions of the mansion
+        :param table: The mansion's precomputed DoorTable, if it has one
+        :returns: New coordinates after (maybe) going through a door
+        """
+        if table is not None:
+            return table.choose_door(player, self)
+        return player.choose_door(weights, costs, player.get_location(), dim, self)
+
+
+if __name__ == "__main__":
+    print("🔍 Hint: To start the investigation, you need to run `main.py`, not this file.")
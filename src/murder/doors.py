@@ -0,0 +1,158 @@
+import functools
+import itertools
+import random
+import typing
+
+from murder.person import Person
+from murder.room import Room
+from murder.utils import Coordinates
+
+# Door number -> (dx, dy) of the room it leads to, (0,1,2,3) == (N,S,E,W)
+DOOR_STEPS = ((-1, 0), (1, 0), (0, 1), (0, -1))
+# Threshold of a door that can't be used: the uniform draw is never above it
+CLOSED = float("inf")
+
+
+class DoorChoice(typing.NamedTuple):
+    # Per door: the uniform draw must be above this to go through (CLOSED if it can't be used)
+    thresholds: tuple[float, ...]
+    # Alias table over the 5 outcomes (4 doors, then staying put), for alias sampling
+    probabilities: tuple[float, ...]
+    aliases: tuple[int, ...]
+
+
+def outcome_probabilities(thresholds: typing.Sequence[float]) -> list[float]:
+    """
+    Exact distribution of Person.choose_door(): the doors are tried in a random
+    order, and only the first three of them get a chance
+
+    :param thresholds: Per door, the value the uniform draw has to beat
+    :returns: Probability of leaving through each door, then of staying put
+    """
+    passes = [0.0 if t == CLOSED else 1.0 - t for t in thresholds]
+    outcomes = [0.0] * 5
+    orders = list(itertools.permutations(range(4)))
+    for order in orders:
+        reach = 1.0 / len(orders)
+        for door in order[:3]:
+            outcomes[door] += reach * passes[door]
+            reach *= 1.0 - passes[door]
+        outcomes[4] += reach
+    return outcomes
+
+
+def alias_table(probabilities: typing.Sequence[float]) -> tuple[tuple[float, ...], tuple[int, ...]]:
+    """
+    Builds a Walker/Vose alias table, so an outcome can be drawn with a single
+    uniform draw
+
+    :param probabilities: Probability of each outcome (summing to 1)
+    :returns: (probability of keeping each column's own outcome, outcome each column aliases to)
+    """
+    n = len(probabilities)
+    scaled = [p * n for p in probabilities]
+    keep = [1.0] * n
+    aliases = list(range(n))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        s, g = small.pop(), large.pop()
+        keep[s] = scaled[s]
+        aliases[s] = g
+        scaled[g] -= 1.0 - scaled[s]
+        (small if scaled[g] < 1.0 else large).append(g)
+    return tuple(keep), tuple(aliases)
+
+
+@functools.lru_cache(maxsize=None)
+def door_choices(
+    weights: tuple[float, ...], costs: tuple[int, ...], usable: tuple[bool, ...], alias: bool
+) -> tuple[DoorChoice, ...]:
+    """
+    Precomputes the door choice of a room for every number of moves left (up
+    to its priciest door). Rooms of the same kind in the same spot along the
+    walls share the result, in every mansion.
+
+    :param weights: The room's door weights
+    :param costs: The room's door costs
+    :param usable: Per door, whether it leads somewhere in the mansion and isn't shut (weight 0)
+    :param alias: Whether to build the alias tables too
+    :returns: One DoorChoice per number of moves left
+    """
+    choices = []
+    for moves in range(max(costs) + 1):
+        thresholds = tuple(weights[d] if usable[d] and moves >= costs[d] else CLOSED for d in range(4))
+        probabilities, aliases = alias_table(outcome_probabilities(thresholds)) if alias else ((), ())
+        choices.append(DoorChoice(thresholds, probabilities, aliases))
+    return tuple(choices)
+
+
+class DoorTable:
+    """
+    Everything Person.choose_door() works out on every call (which doors are in
+    bounds, open, and affordable), precomputed for every room of a mansion and
+    every number of moves left.
+
+    By default choose_door() consumes the game's random stream exactly like
+    Person.choose_door(), so games play out the same. With alias=True every
+    move takes a single draw from an alias table over the exact same outcome
+    distribution, which is faster but plays different games for a case number.
+    """
+
+    def __init__(self, room_map: typing.Sequence[typing.Sequence[Room]], *, alias: bool = False) -> None:
+        self.alias = alias
+        self.height = len(room_map[0])
+        # Per room (x * height + y): where its doors lead, what they cost,
+        # and one DoorChoice per number of moves left
+        self.targets: list[tuple[Coordinates, ...]] = []
+        self.costs: list[tuple[int, ...]] = []
+        self.choices: list[tuple[DoorChoice, ...]] = []
+        for x, column in enumerate(room_map):
+            for y, room in enumerate(column):
+                weights, costs = tuple(room.get_door_weights()), tuple(room.get_door_costs())
+                targets = tuple(Coordinates(x + dx, y + dy) for dx, dy in DOOR_STEPS)
+                usable = tuple(
+                    0 <= t.x < len(room_map) and 0 <= t.y < self.height and weights[d] != 0.0
+                    for d, t in enumerate(targets)
+                )
+                self.targets.append(targets)
+                self.costs.append(costs)
+                self.choices.append(door_choices(weights, costs, usable, alias))
+
+    def choose_door(self, player: Person, rng: random.Random) -> Coordinates:
+        """
+        Same as Person.choose_door() for the player's current room and moves
+
+        :param player: The player going through a door
+        :param rng: The game's random stream
+        :returns: New coordinates after (maybe) going through a door
+        """
+        r = player.room_id
+        choices = self.choices[r]
+        choice = choices[min(player.moves, len(choices) - 1)]
+
+        if self.alias:
+            column = rng.random() * 5
+            door = int(column)
+            if column - door >= choice.probabilities[door]:
+                door = choice.aliases[door]
+            if door == 4:
+                return player.get_location()
+        else:
+            # Try three of the four doors in a random order, as Person.choose_door() does.
+            # randrange(n) and random() draw exactly what randint(0, n - 1) and uniform(0.0, 1.0) do.
+            doors = [0, 1, 2, 3]
+            thresholds = choice.thresholds
+            while len(doors) > 1:
+                door = doors.pop(rng.randrange(len(doors)))
+                if rng.random() > thresholds[door]:
+                    break
+            else:
+                return player.get_location()
+
+        player.moves -= self.costs[r][door]
+        return self.targets[r][door]
+
+
+if __name__ == "__main__":
+    print("🔍 Hint: To start the investigation, you need to run `main.py`, not this file.")
@@ -0,0 +1,249 @@
+import enum
+import functools
+import typing
+from array import array
+
+from murder.item import Item
+from murder.person import Person
+from murder.utils import Coordinates
+
+if typing.TYPE_CHECKING:
+    from murder.mansion import Mansion
+
+
+class EventKind(enum.IntEnum):
+    MOVE = 0
+    KILL = 1
+    GRAB = 2
+    DROP = 3
+    SWAP = 4
+    COOL_DOWN = 5
+
+
+class Event(typing.NamedTuple):
+    """
+    One row of an EventLog. Unused fields are -1.
+
+    - MOVE: `player` moved into room (x, y)
+    - KILL: `player` (the victim) was killed in room (x, y) with `item` by `other` (the murderer)
+    - GRAB: `player` picked up `item` in room (x, y)
+    - DROP: `player` dropped `item` in room (x, y)
+    - SWAP: `player` picked up `item` and dropped `other` in room (x, y)
+    - COOL_DOWN: `player` (the murderer) is on cool down until time `other`
+    """
+
+    kind: EventKind
+    time: int
+    player: int
+    item: int
+    other: int
+    x: int
+    y: int
+
+
+class EventLog:
+    """
+    Opt-in recorder of everything that happens during a game.
+
+    Attach one to a mansion before playing it (`EventLog().attach(mansion)`) and
+    record_turn() is called for every player who got a turn, in the order they
+    played, after each Mansion.next_turn(). The recorder works out what changed
+    during the player's turn (who died, which items were grabbed, dropped or
+    swapped) and appends it to a set of parallel, array-backed columns instead
+    of storing an object per event. Moves are recorded as they happen, one for
+    every door a player goes through, so a player can move twice in a turn.
+
+    Players and items are referred to by their index in mansion.players and
+    mansion.items, and time is the mansion's time_val when the event happened.
+    """
+
+    def __init__(self) -> None:
+        self.kind = array("b")
+        self.time = array("i")
+        self.player = array("h")
+        self.item = array("h")
+        self.other = array("i")
+        self.x = array("i")
+        self.y = array("i")
+
+        # Where every player was when recording started
+        self.start_x = array("i")
+        self.start_y = array("i")
+        # Who held every item when recording started (-1 if it was lying in room (x, y))
+        self.item_start_holder = array("h")
+        self.item_start_x = array("i")
+        self.item_start_y = array("i")
+
+        self.player_index: dict[Person, int] = {}
+        self.item_index: dict[Item, int] = {}
+        self.last_x = array("i")
+        self.last_y = array("i")
+        self.alive = bytearray()
+        self.marked = bytearray()
+        self.cool_down = 0
+
+    def attach(self, mansion: "Mansion") -> "EventLog":
+        """
+        Takes note of the mansion's starting state, and starts recording its
+        turns. Like murder.instrument.Profiler, this puts recording versions of
+        next_turn(), choose_door() and pursue() on the mansion itself, so
+        Mansion.next_turn() never changes.
+
+        :param mansion: The mansion to record
+        :returns: This EventLog
+        """
+        self.player_index = {player: i for i, player in enumerate(mansion.players)}
+        self.item_index = {item: i for i, item in enumerate(mansion.items)}
+        for player in mansion.players:
+            x, y = player.get_location()
+            self.start_x.append(x)
+            self.start_y.append(y)
+        for item in mansion.items:
+            self.item_start_holder.append(-1)
+            self.item_start_x.append(-1)
+            self.item_start_y.append(-1)
+        for x, row in enumerate(mansion.room_map):
+            for y, room in enumerate(row):
+                for item in room.get_items():
+                    self.item_start_x[self.item_index[item]] = x
+                    self.item_start_y[self.item_index[item]] = y
+        for i, player in enumerate(mansion.players):
+            held = player.get_holds()
+            if held is not None:
+                item = self.item_index[held]
+                self.item_start_holder[item] = i
+                self.item_start_x[item] = self.start_x[i]
+                self.item_start_y[item] = self.start_y[i]
+        self.last_x = array("i", self.start_x)
+        self.last_y = array("i", self.start_y)
+        self.alive = bytearray(player.is_alive() for player in mansion.players)
+        self.marked = bytearray(item.is_marked() for item in mansion.items)
+        self.cool_down = mansion.cool_down
+        mansion.__dict__["next_turn"] = self.recording(mansion.next_turn, mansion)
+        for name in ("choose_door", "pursue"):
+            mansion.__dict__[name] = self.moving(getattr(mansion, name), mansion)
+        return self
+
+    def recording(self, next_turn: typing.Callable[[], bool], mansion: "Mansion") -> typing.Callable[[], bool]:
+        """
+        :param next_turn: The mansion's next_turn()
+        :param mansion: The mansion being recorded
+        :returns: A next_turn() that records every turn it plays
+        """
+
+        @functools.wraps(next_turn)
+        def recorded() -> bool:
+            time = mansion.time_val
+            # Everyone alive gets a turn, ending with the murderer (see Mansion.next_turn())
+            first = mansion.murderer + 1
+            order = [mansion.players[(i + first) % len(mansion.players)] for i in range(len(mansion.players))]
+            turns = [(player, player.get_holds()) for player in order if player.is_alive()]
+            playing = next_turn()
+            if mansion.time_val != time:
+                for player, held_before in turns:
+                    self.record_turn(mansion, player, held_before, time)
+            return playing
+
+        return recorded
+
+    def moving(self, move: typing.Callable[..., Coordinates], mansion: "Mansion") -> typing.Callable[..., Coordinates]:
+        """
+        :param move: The mansion's choose_door() or pursue(), which take the player moving first
+        :param mansion: The mansion being recorded
+        :returns: The same method, recording a MOVE whenever the player goes through a door
+        """
+
+        @functools.wraps(move)
+        def moved(player: Person, *args) -> Coordinates:
+            destination = move(player, *args)
+            if destination != player.get_location():
+                index = self.player_index[player]
+                self.last_x[index], self.last_y[index] = destination
+                self.append(EventKind.MOVE, mansion.time_val, index, -1, -1, destination[0], destination[1])
+            return destination
+
+        return moved
+
+    def append(self, kind: EventKind, time: int, player: int, item: int, other: int, x: int, y: int) -> None:
+        """
+        Adds one event to the end of the log
+        """
+        self.kind.append(kind)
+        self.time.append(time)
+        self.player.append(player)
+        self.item.append(item)
+        self.other.append(other)
+        self.x.append(x)
+        self.y.append(y)
+
+    def record_turn(self, mansion: "Mansion", player: Person, held_before: typing.Optional[Item], time: int) -> None:
+        """
+        Records what changed during one player's turn
+
+        :param mansion: The mansion being played
+        :param player: The player whose turn just ended
+        :param held_before: The item the player held when their turn started
+        :param time: The mansion's time_val during the turn
+        """
+        index = self.player_index[player]
+        x, y = player.get_location()
+
+        # The murderer only kills with an unmarked item, which is marked by the kill
+        if held_before is not None and player.is_murderer():
+            weapon = self.item_index[held_before]
+            if held_before.is_marked() and not self.marked[weapon]:
+                self.marked[weapon] = 1
+                self.record_kills(mansion, index, weapon, time)
+
+        held = player.get_holds()
+        if held is held_before:
+            return
+        if held_before is None and held is not None:
+            self.append(EventKind.GRAB, time, index, self.item_index[held], -1, x, y)
+        elif held_before is not None and held is None:
+            self.append(EventKind.DROP, time, index, self.item_index[held_before], -1, x, y)
+        elif held_before is not None and held is not None:
+            self.append(EventKind.SWAP, time, index, self.item_index[held], self.item_index[held_before], x, y)
+
+    def record_kills(self, mansion: "Mansion", murderer: int, weapon: int, time: int) -> None:
+        """
+        Records the victim(s) of a kill and the murderer's new cool down
+
+        :param mansion: The mansion being played
+        :param murderer: Index of the murderer
+        :param weapon: Index of the item used
+        :param time: The mansion's time_val during the kill
+        """
+        x, y = self.last_x[murderer], self.last_y[murderer]
+        for i, victim in enumerate(mansion.players):
+            if self.alive[i] and not victim.is_alive():
+                self.alive[i] = 0
+                x, y = victim.get_location()
+                self.append(EventKind.KILL, time, i, weapon, murderer, x, y)
+
+        if mansion.cool_down != self.cool_down:
+            self.cool_down = mansion.cool_down
+            self.append(EventKind.COOL_DOWN, time, murderer, -1, self.cool_down, x, y)
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def __getitem__(self, i: int) -> Event:
+        return Event(
+            EventKind(self.kind[i]), self.time[i], self.player[i], self.item[i], self.other[i], self.x[i], self.y[i]
+        )
+
+    def __iter__(self) -> typing.Iterator[Event]:
+        for i in range(len(self.kind)):
+            yield self[i]
+
+    def of_kind(self, kind: EventKind) -> list[Event]:
+        """
+        :param kind: The type of event to look for
+        :returns: Every event of that type, in the order they happened
+        """
+        return [self[i] for i in range(len(self.kind)) if self.kind[i] == kind]
+
+
+if __name__ == "__main__":
+    print("🔍 Hint: To start the investigation, you need to run `main.py`, not this file.")
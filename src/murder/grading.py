@@ -0,0 +1,165 @@
+import argparse
+import csv
+import fnmatch
+import json
+import os
+import re
+import sys
+import tarfile
+import typing
+import zipfile
+
+from murder.answer_key import answer_key
+from murder.batch import is_case_number, map_chunked
+
+
+class Submission(typing.NamedTuple):
+    name: str
+    case_number: str
+    answers: list[str]
+    # Why the submission can't be graded ("" if it can)
+    error: str = ""
+
+
+class Grade(typing.NamedTuple):
+    submission: str
+    case_number: str
+    score: int
+    total: int
+    # One character per question, "1" if correct and "0" if not
+    results: str
+    # Why the submission scored 0 without being graded ("" if it was graded)
+    error: str = ""
+
+
+def parse_submission(name: str, text: str) -> Submission:
+    """
+    Parses the contents of an Answers.out file (see questions.write_answers())
+
+    :param name: Name to report the submission under (e.g. its path)
+    :param text: The file's contents: the case number, then one answer per line
+    :returns: The parsed submission, with an error if its case number isn't a number
+    """
+    lines = text.splitlines()
+    case_number = lines[0].strip() if lines else ""
+    error = "" if is_case_number(case_number) else f"{case_number!r} is not a case number"
+    return Submission(name, case_number, [line.strip() for line in lines[1:]], error)
+
+
+def read_submissions(path: str, *, pattern: str = "*.out") -> typing.Iterator[Submission]:
+    """
+    Streams submissions from a directory (searched recursively) or from a
+    .zip / .tar(.gz) archive, one file at a time
+
+    :param path: Directory or archive holding the submissions
+    :param pattern: Only files whose name matches this glob are read
+    :returns: Iterator of submissions, named by their path inside `path`
+    """
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for file_name in sorted(fnmatch.filter(files, pattern)):
+                full_path = os.path.join(root, file_name)
+                with open(full_path, "r", errors="replace") as file:
+                    yield parse_submission(os.path.relpath(full_path, path), file.read())
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and fnmatch.fnmatch(os.path.basename(info.filename), pattern):
+                    yield parse_submission(info.filename, archive.read(info).decode(errors="replace"))
+    elif tarfile.is_tarfile(path):
+        with tarfile.open(path) as archive:
+            for member in archive:
+                if member.isfile() and fnmatch.fnmatch(os.path.basename(member.name), pattern):
+                    file = archive.extractfile(member)
+                    assert file is not None
+                    yield parse_submission(member.name, file.read().decode(errors="replace"))
+    else:
+        raise ValueError(f"{path} is not a directory, .zip or .tar archive")
+
+
+def normalize_answer(answer: str) -> str:
+    """
+    Puts an answer in a canonical form, so "07:05 PM" matches "7:05pm" and
+    "the  knife" matches "The Knife"
+
+    :param answer: An answer as written by a student (or the answer key)
+    :returns: The canonical form of the answer
+    """
+    answer = " ".join(answer.lower().split())
+    answer = re.sub(r"^0(\d:)", r"\1", answer)
+    return re.sub(r"^(\d+:\d\d) ?pm$", r"\1pm", answer)
+
+
+def grade(submission: Submission, key: list[str]) -> Grade:
+    """
+    :param submission: A student's answers
+    :param key: The expected answers for the submission's case number
+    :returns: The submission's grade. Missing answers are wrong.
+    """
+    answers = [normalize_answer(a) for a in submission.answers]
+    answers += [""] * (len(key) - len(answers))
+    results = "".join("1" if answers[i] == normalize_answer(expected) else "0" for i, expected in enumerate(key))
+    return Grade(submission.name, submission.case_number, results.count("1"), len(key), results)
+
+
+def grade_submissions(
+    submissions: typing.Iterable[Submission],
+    *,
+    workers: typing.Optional[int] = None,
+    chunk_size: typing.Optional[int] = None,
+) -> list[Grade]:
+    """
+    Grades many submissions, simulating every distinct case number only once.
+    Answer keys are computed on a process pool (see batch.map_chunked()).
+
+    :param submissions: The submissions to grade
+    :param workers: Number of worker processes, defaults to the CPU count
+    :param chunk_size: Number of answer keys handed to a worker at once
+    :returns: One grade per submission, in input order. Submissions with an error score 0 of 0.
+    """
+    submissions = list(submissions)
+    cases = sorted({s.case_number for s in submissions if not s.error})
+    keys = dict(zip(cases, map_chunked(answer_key, cases, workers=workers, chunk_size=chunk_size)))
+    return [
+        Grade(s.name, s.case_number, 0, 0, "", s.error) if s.error else grade(s, keys[s.case_number])
+        for s in submissions
+    ]
+
+
+def write_grades(grades: typing.Iterable[Grade], file: typing.TextIO, output_format: str = "csv") -> None:
+    """
+    :param grades: The grades to write
+    :param file: Where to write them
+    :param output_format: "csv" (with a header row) or "jsonl" (one JSON object per line)
+    """
+    if output_format == "csv":
+        writer = csv.writer(file)
+        writer.writerow(Grade._fields)
+        writer.writerows(grades)
+    elif output_format == "jsonl":
+        for g in grades:
+            file.write(json.dumps(g._asdict()) + "\n")
+    else:
+        raise ValueError(f"Unknown output format: {output_format}")
+
+
+def main(argv: typing.Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Grade a directory or archive of Answers.out submissions")
+    parser.add_argument("submissions", help="directory, .zip or .tar(.gz) archive of submissions")
+    parser.add_argument("--pattern", default="*.out", help='submission file names to read (default: "*.out")')
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv", help="report format (default: csv)")
+    parser.add_argument("--output", default=None, help="report file (default: standard output)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    grades = grade_submissions(read_submissions(args.submissions, pattern=args.pattern), workers=args.workers)
+    if args.output is None:
+        write_grades(grades, sys.stdout, args.format)
+    else:
+        with open(args.output, "w", newline="") as file:
+            write_grades(grades, file, args.format)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+import argparse
+import functools
+import json
+import sys
+import time
+import typing
+
+from murder.batch import map_chunked, parse_case_numbers
+from murder.mansion import Mansion
+from murder.sparse import SparseRooms
+
+# Phase -> the methods timed and counted as part of it, per kind of object they're called on
+PHASES = {
+    "movement": {"Mansion": ("choose_door", "pursue"), "Person": ("pursue",)},
+    "murder": {"Person": ("attack", "kill")},
+    "items": {"Person": ("pick_up_item", "drop_item"), "Room": ("add_item",)},
+    "rooms": {"Room": ("add_player", "remove_player")},
+}
+# Phase -> the randint() ranges Mansion.next_turn() rolls its decisions with, timed and counted as part of it
+ROLLS = {"movement": ((3, 7),), "murder": ((0, 99), (1, 3)), "items": ((0, 19), (0, 4), (0, 1))}
+# The methods every random number is drawn with in the end (see random.Random._randbelow())
+DRAWS = ("getrandbits", "random")
+
+
+class Profile:
+    """
+    Wall time, call counts and random number draws of one game (or, added
+    up, of many) per phase of Mansion.next_turn(), see PHASES and ROLLS.
+
+    Time spent in a method that is called from another phase's method (none
+    are, for now) counts towards the outer phase. Every probe adds a little
+    time of its own, so phases look a bit slower than they are.
+    """
+
+    def __init__(self, case_number: typing.Optional[str] = None) -> None:
+        """
+        :param case_number: The case number of the game profiled, if known
+        """
+        self.case_number = case_number
+        self.games = 0
+        self.turns = 0
+        self.seconds = 0.0  # Wall time spent in next_turn()
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.phase_seconds = dict.fromkeys(PHASES, 0.0)
+        self.draws = dict.fromkeys(PHASES, 0)
+        self.other_draws = 0  # Random numbers drawn outside of any phase
+        self.functions: dict[str, int] = {}  # "Person.pursue" -> number of calls
+        self.phase: typing.Optional[str] = None  # The phase being timed right now
+
+    def probe(self, phase: str, name: str, function: typing.Callable) -> typing.Callable:
+        """
+        :param phase: The phase the function is part of
+        :param name: Name the function's calls are counted under
+        :param function: The function to time and count
+        :returns: A function that calls it, timing and counting the call
+        """
+        calls, seconds, functions = self.calls, self.phase_seconds, self.functions
+        functions.setdefault(name, 0)
+
+        @functools.wraps(function)
+        def probed(*args, **kwargs):
+            calls[phase] += 1
+            functions[name] += 1
+            if self.phase is not None:
+                return function(*args, **kwargs)
+            self.phase = phase
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                seconds[phase] += time.perf_counter() - start
+                self.phase = None
+
+        return probed
+
+    def probe_rolls(self, randint: typing.Callable[[int, int], int]) -> typing.Callable[[int, int], int]:
+        """
+        :param randint: The random stream's randint()
+        :returns: A randint() that times and counts the rolls in ROLLS, as "Dice.randint(a, b)"
+        """
+        probes = {
+            roll: self.probe(phase, f"Dice.randint{roll}", randint) for phase, rolls in ROLLS.items() for roll in rolls
+        }
+
+        @functools.wraps(randint)
+        def rolled(a: int, b: int) -> int:
+            # Rolls made inside another phase's method (choosing a door) are part of that method
+            if self.phase is None and (a, b) in probes:
+                return probes[a, b](a, b)
+            return randint(a, b)
+
+        return rolled
+
+    def count_draws(self, function: typing.Callable) -> typing.Callable:
+        """
+        :param function: One of the random stream's DRAWS
+        :returns: A function that calls it, counting the draw towards the current phase
+        """
+        draws = self.draws
+
+        @functools.wraps(function)
+        def counted(*args):
+            if self.phase is None:
+                self.other_draws += 1
+            else:
+                draws[self.phase] += 1
+            return function(*args)
+
+        return counted
+
+    def time_turns(self, next_turn: typing.Callable[[], bool], mansion: Mansion) -> typing.Callable[[], bool]:
+        """
+        :param next_turn: The mansion's next_turn()
+        :param mansion: The mansion profiled
+        :returns: A next_turn() that is timed, and counted if it plays a turn
+        """
+
+        @functools.wraps(next_turn)
+        def timed() -> bool:
+            time_val = mansion.time_val
+            start = time.perf_counter()
+            playing = next_turn()
+            self.seconds += time.perf_counter() - start
+            if mansion.time_val != time_val:
+                self.turns += 1
+            return playing
+
+        return timed
+
+    def add(self, other: "Profile") -> None:
+        """
+        Adds the counts of another profile to this one
+
+        :param other: A profile of other games
+        """
+        self.games += other.games
+        self.turns += other.turns
+        self.seconds += other.seconds
+        self.other_draws += other.other_draws
+        for phase in PHASES:
+            self.calls[phase] += other.calls[phase]
+            self.phase_seconds[phase] += other.phase_seconds[phase]
+            self.draws[phase] += other.draws[phase]
+        for name, calls in other.functions.items():
+            self.functions[name] = self.functions.get(name, 0) + calls
+
+    def as_dict(self) -> dict[str, typing.Any]:
+        """
+        :returns: The counts, as plain values ready for json.dumps()
+        """
+        profile: dict[str, typing.Any] = {} if self.case_number is None else {"case_number": self.case_number}
+        profile.update(
+            games=self.games,
+            turns=self.turns,
+            seconds=self.seconds,
+            phases={
+                phase: {"calls": self.calls[phase], "seconds": self.phase_seconds[phase], "draws": self.draws[phase]}
+                for phase in PHASES
+            },
+            other_draws=self.other_draws,
+            functions=dict(sorted(self.functions.items())),
+        )
+        return profile
+
+    def to_json(self, **kwargs) -> str:
+        """
+        :param kwargs: Passed on to json.dumps() (indent=2, for example)
+        :returns: as_dict() as JSON
+        """
+        return json.dumps(self.as_dict(), **kwargs)
+
+
+class Profiler:
+    """
+    Opt-in instrumentation of Mansion.next_turn(). Attaching a profiler to a
+    mansion swaps the methods listed in PHASES (and the random stream's
+    randint() and DRAWS) for timed and counted versions on that game's own objects, and detaching
+    swaps them back. Mansion.next_turn() itself is never changed, so games
+    nobody profiles don't pay anything.
+
+    The profile of every game attached is kept in `games`, total() adds them up.
+    """
+
+    def __init__(self) -> None:
+        self.games: list[Profile] = []
+        # id(mansion) -> what puts the mansion back the way it was
+        self.attached: dict[int, typing.Callable[[], None]] = {}
+
+    def attach(self, mansion: Mansion, case_number: typing.Optional[str] = None) -> Profile:
+        """
+        Starts profiling a game. It plays exactly the same as it would have.
+
+        :param mansion: The game to profile
+        :param case_number: The game's case number, to tell profiles apart
+        :returns: The game's profile, counting from now on
+        """
+        if id(mansion) in self.attached:
+            raise ValueError("The profiler is already attached to this mansion")
+        profile = Profile(case_number)
+        profile.games = 1
+        # The mansion and its random stream get probed instance attributes, in front of their methods
+        probed: list[tuple[typing.Any, str]] = []
+        for phase, methods in PHASES.items():
+            for name in methods.get("Mansion", ()):
+                mansion.__dict__[name] = profile.probe(phase, f"Mansion.{name}", getattr(mansion, name))
+                probed.append((mansion, name))
+        mansion.rng.__dict__["randint"] = profile.probe_rolls(mansion.rng.randint)
+        probed.append((mansion.rng, "randint"))
+        for name in DRAWS:
+            mansion.rng.__dict__[name] = profile.count_draws(getattr(mansion.rng, name))
+            probed.append((mansion.rng, name))
+        mansion.__dict__["next_turn"] = profile.time_turns(mansion.next_turn, mansion)
+        probed.append((mansion, "next_turn"))
+
+        # Players and rooms have __slots__ (no instance attributes), so they get a probed subclass instead
+        subclasses: dict[type, type] = {}
+
+        def probed_class(cls: type, kind: str) -> type:
+            if cls not in subclasses:
+                probes = {
+                    name: profile.probe(phase, f"{kind}.{name}", getattr(cls, name))
+                    for phase, methods in PHASES.items()
+                    for name in methods.get(kind, ())
+                }
+                subclasses[cls] = type(cls.__name__, (cls,), {"__slots__": (), **probes})
+            return subclasses[cls]
+
+        room_map = mansion.get_rooms()
+        sparse: typing.Optional[tuple[SparseRooms, type]] = None  # (sparse room map, its own room class)
+        if isinstance(room_map, SparseRooms):
+            # Rooms that aren't made yet are made probed
+            rooms = [room for _, room in room_map.materialized()]
+            sparse = (room_map, room_map.room_class)
+            room_map.room_class = probed_class(room_map.room_class, "Room")
+        else:
+            rooms = [room for column in room_map for room in column]
+        for player in mansion.get_players():
+            player.__class__ = probed_class(type(player), "Person")
+        for room in rooms:
+            room.__class__ = probed_class(type(room), "Room")
+
+        def detach() -> None:
+            for obj, name in probed:
+                del obj.__dict__[name]
+            if sparse is not None:
+                sparse_map, room_class = sparse
+                sparse_map.room_class = room_class
+                rooms[:] = [room for _, room in sparse_map.materialized()]
+            originals = {subclass: cls for cls, subclass in subclasses.items()}
+            for obj in [*mansion.get_players(), *rooms]:
+                obj.__class__ = originals.get(type(obj), type(obj))
+
+        self.attached[id(mansion)] = detach
+        self.games.append(profile)
+        return profile
+
+    def detach(self, mansion: Mansion) -> None:
+        """
+        Stops profiling a game, leaving its profile in `games`
+
+        :param mansion: A game the profiler is attached to
+        """
+        self.attached.pop(id(mansion))()
+
+    def total(self) -> Profile:
+        """
+        :returns: The profiles of every game attached so far, added up
+        """
+        total = Profile()
+        for profile in self.games:
+            total.add(profile)
+        return total
+
+    def as_dict(self) -> dict[str, typing.Any]:
+        """
+        :returns: The total and every game's profile, as plain values ready for json.dumps()
+        """
+        return {"total": self.total().as_dict(), "games": [profile.as_dict() for profile in self.games]}
+
+    def to_json(self, **kwargs) -> str:
+        """
+        :param kwargs: Passed on to json.dumps() (indent=2, for example)
+        :returns: as_dict() as JSON
+        """
+        return json.dumps(self.as_dict(), **kwargs)
+
+
+def profile_case(case_number: str) -> Profile:
+    """
+    Plays a game to completion with a profiler attached
+
+    :param case_number: The case number to play
+    :returns: The game's profile
+    """
+    mansion = Mansion(case_number)
+    profiler = Profiler()
+    profile = profiler.attach(mansion, case_number)
+    while mansion.next_turn():
+        pass
+    profiler.detach(mansion)
+    return profile
+
+
+def main(argv: typing.Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Profile the phases of murder mystery turns, as JSON")
+    parser.add_argument("cases", nargs="+", help='case numbers, or inclusive ranges such as "1-1000"')
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (default: 1, times are per game)")
+    parser.add_argument("--games", action="store_true", help="also print every game's own profile")
+    parser.add_argument("--indent", type=int, default=None, help="indent the JSON by this many spaces")
+    args = parser.parse_args(argv)
+
+    profiler = Profiler()
+    profiler.games.extend(map_chunked(profile_case, parse_case_numbers(args.cases), workers=args.workers))
+    result = profiler.as_dict() if args.games else profiler.total().as_dict()
+    sys.stdout.write(json.dumps(result, indent=args.indent) + "\n")
+
+
+if __name__ == "__main__":
+    main()
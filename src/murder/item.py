@@ -7,6 +7,8 @@ class Item:
     if it was used as a murder weapon yet, and where it spawns
     """
 
+    __slots__ = ("item_name", "location", "marked")
+
     def __init__(self, item_name: str) -> None:
         self.item_name = item_name
         self.location: typing.Optional[str] = None
@@ -0,0 +1,323 @@
+import itertools
+import typing
+
+import numpy as np
+
+from murder.config import END_TIME, START_TIME, TIME_MINUTE_INCREMENTS
+from murder.mansion import Mansion
+
+# Per door (0,1,2,3) == (N,S,E,W): the change in x and y going through it, as in Person.choose_door()
+DOOR_DX = np.array([-1, 1, 0, 0])
+DOOR_DY = np.array([0, 0, 1, -1])
+# The first three doors of every order the four doors can be tried in
+DOOR_ORDERS = np.array(list(itertools.permutations(range(4))))[:, :3]
+# Threshold of a door that can't be used: the uniform draw is never above it
+CLOSED = 2.0
+# Every turn a player rolls 3-7 moves and gets two tries to go through a door
+MIN_MOVES, MAX_MOVES = 3, 7
+TRIES_PER_TURN = 2
+
+
+class LockstepGames:
+    """
+    Plays many games at once, one turn at a time, with NumPy.
+
+    Every game is kept in struct-of-arrays form (one row per game): player
+    positions, alive mask, moves, held item, the item lying in each room and
+    which items are murder weapons. A turn is played with array operations
+    across all running games, one player slot at a time, following the same
+    rules as Mansion.next_turn(), Person.choose_door(), Person.pursue() and the
+    item pickup/drop/swap logic. The number of alive people in each room comes
+    from np.bincount().
+
+    The starting state (layout, cast, items) is copied from reference Mansions.
+    The turns draw from the engine's own NumPy random stream, so results match
+    the reference engine statistically, not game by game.
+    """
+
+    def __init__(
+        self, mansions: typing.Sequence[Mansion], *, repeat: int = 1, seed: typing.Optional[int] = None
+    ) -> None:
+        """
+        :param mansions: Freshly built mansions (no turns played yet) to copy the starting state from
+        :param repeat: Number of games to play from each mansion's starting state
+        :param seed: Seed for the engine's random stream
+        """
+        self.rng = np.random.default_rng(seed)
+        self.width = max(len(m.get_rooms()) for m in mansions)
+        self.height = max(len(m.get_rooms()[0]) for m in mansions)
+        self.max_players = max(len(m.get_players()) for m in mansions)
+        self.max_items = max(len(m.get_items()) for m in mansions)
+
+        layouts = [self.layout(m) for m in mansions]
+
+        def stacked(name: str) -> np.ndarray:
+            # One row per game: every mansion's starting state, `repeat` times over
+            return np.repeat(np.stack([layout[name] for layout in layouts]), repeat, axis=0)
+
+        # Per room (x * height + y), and per door for the first two
+        self.thresholds: np.ndarray = stacked("thresholds")
+        self.costs: np.ndarray = stacked("costs")
+        self.room_item: np.ndarray = stacked("room_item")
+        # Per item
+        self.marked: np.ndarray = stacked("marked")
+        # Per player
+        self.x: np.ndarray = stacked("x")
+        self.y: np.ndarray = stacked("y")
+        self.alive: np.ndarray = stacked("alive")
+        self.held: np.ndarray = stacked("held")
+        self.moves: np.ndarray = stacked("moves")
+        # One value per game
+        self.num_players: np.ndarray = stacked("num_players")
+        self.murderer: np.ndarray = stacked("murderer")
+        self.cool_down: np.ndarray = stacked("cool_down")
+        self.num_games = len(mansions) * repeat
+        self.time_val = np.zeros(self.num_games, dtype=np.int64)
+        self.running = np.ones(self.num_games, dtype=bool)
+        # Per player: the time_val of the turn they were killed, -1 if alive
+        self.death_time = np.full((self.num_games, self.max_players), -1, dtype=np.int64)
+
+    @classmethod
+    def from_cases(
+        cls, case_numbers: typing.Iterable[str], *, repeat: int = 1, seed: typing.Optional[int] = None
+    ) -> "LockstepGames":
+        """
+        :param case_numbers: Case numbers whose starting states to play from
+        :param repeat: Number of games to play from each starting state
+        :param seed: Seed for the engine's random stream
+        :returns: The engine, with no turns played yet
+        """
+        return cls([Mansion(str(c)) for c in case_numbers], repeat=repeat, seed=seed)
+
+    def layout(self, mansion: Mansion) -> dict[str, np.ndarray]:
+        """
+        :param mansion: A mansion with no turns played yet
+        :returns: One game's starting state, padded to the largest mansion
+        """
+        room_map, players, items = mansion.get_rooms(), mansion.get_players(), mansion.get_items()
+        item_index = {id(item): i for i, item in enumerate(items)}
+        rooms = self.width * self.height
+
+        # Per room and door: the weight to beat (CLOSED if out of bounds or shut) and the cost
+        thresholds = np.full((rooms, 4), CLOSED)
+        costs = np.zeros((rooms, 4), dtype=np.int64)
+        room_item = np.full(rooms, -1, dtype=np.int64)
+        for x, column in enumerate(room_map):
+            for y, room in enumerate(column):
+                r = x * self.height + y
+                costs[r] = room.get_door_costs()
+                for door, weight in enumerate(room.get_door_weights()):
+                    tx, ty = x + DOOR_DX[door], y + DOOR_DY[door]
+                    if 0 <= tx < len(room_map) and 0 <= ty < len(column) and weight != 0.0:
+                        thresholds[r, door] = weight
+                if room.get_items():
+                    room_item[r] = item_index[id(room.get_items()[0])]
+
+        x = np.zeros(self.max_players, dtype=np.int64)
+        y = np.zeros(self.max_players, dtype=np.int64)
+        alive = np.zeros(self.max_players, dtype=bool)
+        held = np.full(self.max_players, -1, dtype=np.int64)
+        for p, player in enumerate(players):
+            x[p], y[p] = player.get_location()
+            alive[p] = player.is_alive()
+            if player.get_holds() is not None:
+                held[p] = item_index[id(player.get_holds())]
+
+        return {
+            "thresholds": thresholds,
+            "costs": costs,
+            "room_item": room_item,
+            "marked": np.array([i < len(items) and items[i].is_marked() for i in range(self.max_items)]),
+            "x": x,
+            "y": y,
+            "alive": alive,
+            "held": held,
+            "moves": np.zeros(self.max_players, dtype=np.int64),
+            "num_players": np.array(len(players)),
+            "murderer": np.array(mansion.murderer),
+            "cool_down": np.array(mansion.cool_down),
+        }
+
+    def alive_players(self) -> np.ndarray:
+        """
+        :returns: Per game, the number of alive people
+        """
+        return self.alive.sum(axis=1)
+
+    def weapons_used(self) -> np.ndarray:
+        """
+        :returns: Per game, the number of items used as murder weapons
+        """
+        return self.marked.sum(axis=1)
+
+    def run(self) -> None:
+        """
+        Plays every game to completion
+        """
+        while self.next_turn():
+            pass
+
+    def next_turn(self) -> bool:
+        """
+        Plays one turn of every running game (see Mansion.next_turn())
+
+        :returns: True if any game is not over after the turn
+        """
+        # Games where everyone except the murderer is dead end without playing the turn
+        games = np.arange(self.num_games)
+        murderer_wins = (self.alive_players() == 1) & self.alive[games, self.murderer]
+        self.running &= ~murderer_wins
+        games = games[self.running]
+
+        # Each player gets a turn, ending with the murderer
+        for slot in range(self.max_players):
+            g = games[slot < self.num_players[games]]
+            p = (slot + self.murderer[g] + 1) % self.num_players[g]
+            acting = self.alive[g, p]
+            g, p = g[acting], p[acting]
+            is_murderer = p == self.murderer[g]
+            self.guest_turn(g[~is_murderer], p[~is_murderer])
+            self.murderer_turn(g[is_murderer], p[is_murderer])
+
+        self.time_val[games] += TIME_MINUTE_INCREMENTS
+        self.running[games] = self.time_val[games] < (END_TIME - START_TIME) * 60
+        return bool(self.running.any())
+
+    def guest_turn(self, g: np.ndarray, p: np.ndarray) -> None:
+        """
+        :param g: Games whose current player is not the murderer
+        :param p: The player taking their turn in each of those games
+        """
+        self.moves[g, p] = self.rng.integers(MIN_MOVES, MAX_MOVES + 1, len(g))
+        for _ in range(TRIES_PER_TURN):
+            can_move = self.moves[g, p] > 0
+            self.choose_door(g[can_move], p[can_move])
+
+        # Randomly drop (1/20), pick up (4/5) or swap (1/2) an item, never picking up a murder weapon
+        room_item, held = self.room_item[g, self.room(g, p)], self.held[g, p]
+        in_room, holding = room_item >= 0, held >= 0
+        weapon_in_room = in_room & self.marked[g, np.maximum(room_item, 0)]
+        drop = holding & ~in_room & (self.rng.integers(0, 20, len(g)) == 0)
+        pick_up = ~holding & in_room & ~weapon_in_room & (self.rng.integers(0, 5, len(g)) != 0)
+        swap = holding & in_room & ~weapon_in_room & (self.rng.integers(0, 2, len(g)) == 0)
+        self.exchange_items(g[drop | pick_up | swap], p[drop | pick_up | swap])
+
+    def murderer_turn(self, g: np.ndarray, p: np.ndarray) -> None:
+        """
+        :param g: Games whose current player is the murderer
+        :param p: The murderer of each of those games
+        """
+        self.moves[g, p] = self.rng.integers(MIN_MOVES, MAX_MOVES + 1, len(g))
+        for _ in range(TRIES_PER_TURN):
+            can_move = self.moves[g, p] > 0
+            self.murderer_try(g[can_move], p[can_move])
+
+        # Drop a murder weapon in an empty room, or trade it for a fresh item. Pick up (4/5) if empty handed.
+        room_item, held = self.room_item[g, self.room(g, p)], self.held[g, p]
+        in_room, holding = room_item >= 0, held >= 0
+        weapon_in_room = in_room & self.marked[g, np.maximum(room_item, 0)]
+        holding_weapon = holding & self.marked[g, np.maximum(held, 0)]
+        drop = holding_weapon & ~in_room
+        pick_up = ~holding & in_room & ~weapon_in_room & (self.rng.integers(0, 5, len(g)) != 0)
+        swap = holding_weapon & in_room & ~weapon_in_room
+        self.exchange_items(g[drop | pick_up | swap], p[drop | pick_up | swap])
+
+    def murderer_try(self, g: np.ndarray, p: np.ndarray) -> None:
+        """
+        One of the murderer's tries to move: maybe kill, then wander or pursue
+
+        :param g: Games whose murderer still has moves left
+        :param p: The murderer of each of those games
+        """
+        held = self.held[g, p]
+        rooms_per_game = self.width * self.height
+
+        # Alive people in every room of these games
+        rooms = self.room(g[:, None], np.arange(self.max_players))
+        keys = np.arange(len(g))[:, None] * rooms_per_game + rooms
+        occupancy = np.bincount(keys[self.alive[g]], minlength=len(g) * rooms_per_game)
+        here = self.room(g, p)
+        alone_with_someone = occupancy[np.arange(len(g)) * rooms_per_game + here] == 2
+
+        # Attack if off cool_down (or 1/100 chance anyway), holding an item that isn't a murder weapon yet
+        ignore_cool_down = self.rng.integers(0, 100, len(g)) == 0
+        attack = (self.cool_down[g] < self.time_val[g]) | ignore_cool_down
+        armed = (held >= 0) & ~self.marked[g, np.maximum(held, 0)]
+        kill = alone_with_someone & attack & armed
+        if kill.any():
+            kg, kp, kh = g[kill], p[kill], held[kill]
+            others = self.alive[kg] & (rooms[kill] == here[kill][:, None])
+            others[np.arange(len(kg)), kp] = False
+            victim = others.argmax(axis=1)
+            self.alive[kg, victim] = False
+            self.death_time[kg, victim] = self.time_val[kg]
+            self.marked[kg, kh] = True
+            self.cool_down[kg] = self.time_val[kg] + self.rng.integers(1, 4, len(kg)) * 5
+
+        # On cool_down, move like a guest, otherwise pursue the closest alive player
+        wander = self.cool_down[g] > self.time_val[g]
+        self.choose_door(g[wander], p[wander])
+        self.pursue(g[~wander], p[~wander])
+
+    def room(self, g: np.ndarray, p: np.ndarray) -> np.ndarray:
+        """
+        :returns: Room numbers (x * height + y) of players p in games g
+        """
+        return self.x[g, p] * self.height + self.y[g, p]
+
+    def exchange_items(self, g: np.ndarray, p: np.ndarray) -> None:
+        """
+        Swaps what each player holds with what lies in their room. Dropping,
+        picking up and swapping an item are all this same exchange (-1 is nothing).
+        """
+        room = self.room(g, p)
+        held = self.held[g, p]
+        self.held[g, p] = self.room_item[g, room]
+        self.room_item[g, room] = held
+
+    def choose_door(self, g: np.ndarray, p: np.ndarray) -> None:
+        """
+        Same as Person.choose_door(): three of the four doors are tried in a
+        random order, and the first one that is open, affordable and beats its
+        weight is taken
+        """
+        n = len(g)
+        if n == 0:
+            return
+        order = DOOR_ORDERS[self.rng.integers(0, len(DOOR_ORDERS), n)]
+        # Index of each tried door in the flattened (game, room, door) tables
+        doors = ((g * self.width * self.height + self.room(g, p)) * 4)[:, None] + order
+        moves = self.moves[g, p]
+        costs = self.costs.reshape(-1)[doors]
+        passes = (self.rng.random((n, 3)) > self.thresholds.reshape(-1)[doors]) & (moves[:, None] >= costs)
+        went = passes.any(axis=1)
+        tried = passes.argmax(axis=1)[went]
+        door = order[went, tried]
+        g, p = g[went], p[went]
+        self.moves[g, p] = moves[went] - costs[went, tried]
+        self.x[g, p] += DOOR_DX[door]
+        self.y[g, p] += DOOR_DY[door]
+
+    def pursue(self, g: np.ndarray, p: np.ndarray) -> None:
+        """
+        Same as Person.pursue(): step towards the closest alive player (lowest
+        index on ties), along x first
+        """
+        n = len(g)
+        if n == 0:
+            return
+        x, y = self.x[g, p], self.y[g, p]
+        targets = self.alive[g]
+        targets[np.arange(n), p] = False
+        distance = (self.x[g] - x[:, None]) ** 2 + (self.y[g] - y[:, None]) ** 2
+        distance = np.where(targets, distance, np.iinfo(np.int64).max)
+        closest = distance.argmin(axis=1)
+        found = targets.any(axis=1)
+        dx = np.sign(self.x[g, closest] - x) * found
+        dy = np.where(dx == 0, np.sign(self.y[g, closest] - y), 0) * found
+        self.x[g, p] += dx
+        self.y[g, p] += dy
+
+
+if __name__ == "__main__":
+    print("🔍 Hint: To start the investigation, you need to run `main.py`, not this file.")
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 from murder.mansion import Mansion
 from murder.questions import ask_questions, write_answers
-from murder.utils import clear_screen, valid_case_number, wait
+from murder.utils import TERMINAL_RENDERER, Renderer, clear_screen, valid_case_number
 
 
 class MurderMystery:
@@ -26,46 +26,46 @@ class MurderMystery:
     http://nifty.stanford.edu/2025/sullivan-chen-centeno-murder-mystery/
     """
 
-    def __init__(self, case_number: str, show_intro: bool) -> None:
-        self.mansion = Mansion(case_number, show_intro=show_intro)
+    def __init__(self, case_number: str, show_intro: bool, renderer: Renderer = TERMINAL_RENDERER) -> None:
+        self.mansion = Mansion(case_number, show_intro=show_intro, renderer=renderer)
 
     def end_game_stats(self) -> None:
         """
         Prints end game message with end time, # murdered.
         """
-        print(" _____                     _____                ")
-        print("|   __| ___  _____  ___   |     | _ _  ___  ___ ")
-        print("|  |  || . ||     || -_|  |  |  || | || -_||  _|")
-        print("|_____||__1||_|_|_||___|  |_____| \\_/ |___||_| \n")
-        wait(3000)
+        self.mansion.renderer.print(" _____                     _____                ")
+        self.mansion.renderer.print("|   __| ___  _____  ___   |     | _ _  ___  ___ ")
+        self.mansion.renderer.print("|  |  || . ||     || -_|  |  |  || | || -_||  _|")
+        self.mansion.renderer.print("|_____||__1||_|_|_||___|  |_____| \\_/ |___||_| \n")
+        self.mansion.renderer.wait(3000)
 
         hrs = self.mansion.time() // 60
         mins = self.mansion.time() % 60
-        print(f"The game ended at {self.mansion.get_start_and_end_times()[0] + hrs}:", end="")
+        self.mansion.renderer.print(f"The game ended at {self.mansion.get_start_and_end_times()[0] + hrs}:", end="")
         if mins < 10:
-            print(f"0{mins}pm")
+            self.mansion.renderer.print(f"0{mins}pm")
         else:
-            print(f"{mins}pm")
+            self.mansion.renderer.print(f"{mins}pm")
 
-        wait(2000)
+        self.mansion.renderer.wait(2000)
 
         # 5 Players + A murderer
         num_starting = len(self.mansion.get_players())
         num_alive = self.mansion.alive_players()
         if num_alive > 1:
-            print(f"{num_starting - num_alive} players were murdered. The murderer was caught.")
+            self.mansion.renderer.print(f"{num_starting - num_alive} players were murdered. The murderer was caught.")
         else:
-            print(f"{num_starting - num_alive} players were murdered. The murderer got away.")
+            self.mansion.renderer.print(f"{num_starting - num_alive} players were murdered. The murderer got away.")
 
-        wait(3500)
-        clear_screen()
+        self.mansion.renderer.wait(3500)
+        self.mansion.renderer.clear_screen()
 
     def play_game(self) -> None:
         continue_game = True
         while continue_game:
             continue_game = self.mansion.next_turn()
 
-        clear_screen()
+        self.mansion.renderer.clear_screen()
         self.end_game_stats()
 
 
@@ -1,5 +1,6 @@
-import random
+import typing
 
+from murder.catalog import get_catalog
 from murder.config import (
     END_TIME,
     MURDER_COOL_DOWN,
@@ -7,10 +8,14 @@ from murder.config import (
     START_TIME,
     TIME_MINUTE_INCREMENTS,
 )
+from murder.dice import Dice
+from murder.doors import DoorTable
 from murder.item import Item
 from murder.person import Person
 from murder.room import Room
-from murder.utils import Coordinates, clear_screen, hash, wait
+from murder.snapshot import Snapshot, restore_snapshot, take_snapshot
+from murder.spatial import SpatialIndex
+from murder.utils import TERMINAL_RENDERER, Coordinates, Renderer, hash, resource_path
 
 
 class Mansion:
@@ -34,24 +39,19 @@ class Mansion:
     debugging techniques to solve the mystery, and close the case.
     """
 
-    def __init__(self, case_number: str, *, show_intro=False) -> None:
+    def __init__(self, case_number: str, *, show_intro=False, renderer: Renderer = TERMINAL_RENDERER) -> None:
         """
         Mansion constructor which sets random seed based on case_number
 
-        Time starts at 0, representing minutes passed since "start" hour attribute
-
         :param case_number: The value to use for random seeding
         :param show_intro: If True, show the intro screen (takes time)
+        :param renderer: Where the intro (and anything else about this game) is shown
         """
-        # Time starts at 0 minutes past starting time, moves in +5 (min) increments
-        self.time_val = 0
-        # Game start at 6pm and ends at "end" pm. "end" should be > "start"
-        self.start = START_TIME
+        self.time_val = 0  # Time starts at 0 minutes past starting time, moves in +5 (min) increments
+        self.start = START_TIME  # Game start at 6pm and ends at "end" pm. "end" should be > "start"
         self.end = END_TIME
-        # The murderer has to wait 5 turns to attack initially
-        self.cool_down = MURDER_COOL_DOWN
-        # Set custom case_number seed for game
-        random.seed(hash(case_number))
+        self.cool_down = MURDER_COOL_DOWN  # The murderer has to wait 5 turns to attack initially
+        self.rng = Dice(hash(case_number))  # Seed the game's own random stream with the case_number
 
         # Generate rooms, players, items
         self.players = self.generate_players()  # Generate players, choose murderer
@@ -60,65 +60,66 @@ class Mansion:
         if self.total_items < 5:
             self.total_items = 5
         self.items: list[Item] = self.spawn_items()
+        self.doors: typing.Optional[DoorTable] = None  # Used instead of Person.choose_door() if set
 
         # Print intro and lore
+        self.renderer = renderer
         if show_intro:
-            self.print_intro(self.players)
+            self.print_intro(self.players, renderer)
 
     @staticmethod
-    def print_intro(players: list[Person]) -> None:
+    def print_intro(players: list[Person], renderer: Renderer = TERMINAL_RENDERER) -> None:
         """
         Intro text generator. Reads from "Intro.in" file.
 
         :param players: List of players to introduce
+        :param renderer: Where to show the intro
         """
-        with open("res/Intro.in", "r") as file:
-            clear_screen()
+        with open(resource_path("Intro.in"), "r") as file:
+            renderer.clear_screen()
 
             lines = int(file.readline().rstrip())  # Number of lines for first paragraph
             for _ in range(lines):  # Read and print lines adding pauses in between
-                print(file.readline().rstrip())
-                wait_time = int(file.readline().rstrip())
-                wait(wait_time)
+                renderer.print(file.readline().rstrip())
+                renderer.wait(int(file.readline().rstrip()))
 
-            clear_screen()
+            renderer.clear_screen()
 
             lines_in_cloud = int(file.readline().rstrip())
             lines_in_lightning = int(file.readline().rstrip())
 
             for _ in range(lines_in_cloud):  # Print cloud (all at once)
-                print(file.readline().rstrip())
+                renderer.print(file.readline().rstrip())
 
             for line in range(lines_in_lightning):  # Animate lightning by printing with pauses
                 if line == 0:
-                    wait(800)
+                    renderer.wait(800)
                 elif line < lines_in_lightning - 1:
-                    wait(30)
+                    renderer.wait(30)
                 else:
-                    wait(100)  # After done fully printing, wait longer
+                    renderer.wait(100)  # After done fully printing, wait longer
 
-                print(file.readline().rstrip())
+                renderer.print(file.readline().rstrip())
 
             title_screen_lines = int(file.readline().rstrip())
             for _ in range(title_screen_lines):
-                print(file.readline().rstrip())
+                renderer.print(file.readline().rstrip())
 
-            wait(3500)
-            clear_screen()
+            renderer.wait(3500)
+            renderer.clear_screen()
 
             intro_text = int(file.readline().rstrip())
             for _ in range(intro_text):
-                print(file.readline().rstrip() + "\n")
-                wait(2500)
+                renderer.print(file.readline().rstrip() + "\n")
+                renderer.wait(2500)
 
-            wait(1500)
+            renderer.wait(1500)
             for p in range(len(players)):
                 if p % 2 != 0 or p == 1:
-                    print("\t\t" + players[p].get_name())
-                    wait(1200)
+                    renderer.print("\t\t" + players[p].get_name())
                 else:
-                    print(players[p].get_name())
-                    wait(1200)
+                    renderer.print(players[p].get_name())
+                renderer.wait(1200)
 
     def time(self) -> int:
         """
@@ -126,7 +127,7 @@ class Mansion:
         """
         return self.time_val
 
-    def get_rooms(self) -> list[list[Room]]:
+    def get_rooms(self) -> typing.Sequence[typing.Sequence[Room]]:
         """
         :returns: 2d array of rooms
         """
@@ -146,13 +147,12 @@ class Mansion:
 
     def alive_players(self) -> int:
         """
+        The count is kept up to date by kill() every time someone dies,
+        so the players aren't recounted after every single turn
+
         :returns: Count of number of alive people
         """
-        alive = 0
-        for player in self.players:
-            if player.is_alive():
-                alive += 1
-        return alive
+        return self.num_alive
 
     def get_start_and_end_times(self) -> tuple[int, int]:
         """
@@ -185,7 +185,7 @@ class Mansion:
                 continue
 
             # Set movement based on dice roll
-            player.set_moves(random.randint(3, 7))
+            player.set_moves(self.rng.randint(3, 7))
 
             # Each player gets to try to move twice
             for tried in range(2):
@@ -194,7 +194,7 @@ class Mansion:
 
                 # People in current room
                 x, y = player.get_location()
-                people_in_room = self.room_map[x][y].get_people()
+                people_in_room = self.room_map[x][y].occupants.values()
                 # Door weights
                 weights = self.room_map[x][y].get_door_weights()
                 # Door costs
@@ -211,7 +211,7 @@ class Mansion:
                     # attack anyway
                     murderer_alone_with_player = bool(self.room_map[x][y].alive_people() == 2)
                     murderer_should_attack = (
-                        player.attack(self.time_val, self.cool_down, random.randint(0, 99) == 0)
+                        player.attack(self.time_val, self.cool_down, self.rng.randint(0, 99) == 0)
                         and player_item
                         and not player_item.is_marked()
                     )
@@ -221,13 +221,13 @@ class Mansion:
                         for p in people_in_room:
                             if p.get_name() != player.get_name() and p.is_alive():
                                 # Mark victim as dead
-                                p.kill()
+                                self.kill(p)
                                 # Mark the item used in the murder
                                 if player_item:
                                     player_item.set_marked(True)
 
                                 # Set the murderer's new random cool_down
-                                self.cool_down = self.time_val + (random.randint(1, 3) * 5)  # Update cool_down
+                                self.cool_down = self.time_val + (self.rng.randint(1, 3) * 5)  # Update cool_down
 
                     # After possibly committing murder, move like a normal player.
                     # If did not commit murder, then pursue the closest player.
@@ -236,11 +236,11 @@ class Mansion:
                     self.room_map[player.get_location()[0]][player.get_location()[1]].remove_player(player.get_name())
                     # If on cool_down, act like a normal player
                     if self.cool_down > self.time_val:
-                        destination_room = player.choose_door(weights, costs, player.get_location(), dim)
+                        destination_room = self.choose_door(player, weights, costs, dim)
                         tried += 1
                     # If not on cool_down, pursue closest alive player
                     else:
-                        destination_room = player.pursue(player.get_location(), self.players)
+                        destination_room = self.pursue(player)
                         tried += 1
                 # If it's not the murderer, move randomly
                 else:
@@ -248,7 +248,7 @@ class Mansion:
                     x, y = player.get_location()
                     self.room_map[x][y].remove_player(player.get_name())
                     # Calculate new coordinates of player
-                    destination_room = player.choose_door(weights, costs, Coordinates(x, y), dim)
+                    destination_room = self.choose_door(player, weights, costs, dim)
                     tried += 1
 
                 # Move player by changing location attribute
@@ -265,11 +265,11 @@ class Mansion:
                 if player.is_murderer() and player_item.is_marked():
                     current_room.add_item(player.drop_item())
                 # If not murderer, randomly drop item
-                elif not player.is_murderer() and random.randint(0, 19) == 0:  # 1 / 20 chance
+                elif not player.is_murderer() and self.rng.randint(0, 19) == 0:  # 1 / 20 chance
                     current_room.add_item(player.drop_item())  # currentRoom holds dropped Item
             # If player doesn't have item and room has item
             elif not player_item and room_has_item:
-                if random.randint(0, 4) != 0:  # 4 / 5 chance
+                if self.rng.randint(0, 4) != 0:  # 4 / 5 chance
                     # Pick up item
                     # If item is valid and not a murder weapon, pick up
                     if current_room.get_items()[0] is not None and not current_room.get_items()[0].is_marked():
@@ -286,7 +286,7 @@ class Mansion:
                         # Pick up the fresh item
                         player.pick_up_item(current_room.get_items().pop(0))
                 # Else if the player is not the murderer and a coin flip
-                elif not player.is_murderer() and random.randint(0, 1) == 0:  # 1 / 2 chance
+                elif not player.is_murderer() and self.rng.randint(0, 1) == 0:  # 1 / 2 chance
                     # If items are valid and the room's item isn't a murder weapon
                     if (
                         current_room.get_items()[0] is not None
@@ -313,33 +313,33 @@ class Mansion:
 
         :returns: Array of Person objects who are the players of the game
         """
-        with open("res/People.in", "r") as file:
-            total_available_people = int(file.readline().strip())  # Number of people contained in People.in
+        # All potential people, read from People.in once and shared between games
+        people_to_choose_from = get_catalog().people
+        total_available_people = len(people_to_choose_from)  # Number of people contained in People.in
 
-            cast_of_players: list[Person] = []
+        cast_of_players: list[Person] = []
 
-            people_to_choose_from = []  # Holds all potential people
-            for i in range(total_available_people):  # Reads in all potential people
-                to_add = Person(file.readline().strip())
-                people_to_choose_from.append(to_add)
+        # Only the chosen people are turned into Person objects, so every game
+        # gets its own fresh players without building the whole list of
+        # potential people first
 
-            taken: list[int] = []
-            p = 0
-            while p < NUM_PLAYERS:  # Loop to choose each character
-                chosen_person = random.randint(0, total_available_people - 1)  # Choose a character from list
-                if chosen_person in taken or (p % 2 == 0 and chosen_person % 2 != 0):
-                    continue
-                taken.append(chosen_person)
-                person = people_to_choose_from[chosen_person]
-                cast_of_players.append(person)  # Remove chosen character from list and add to game
-                p += 1
+        taken: list[int] = []
+        p = 0
+        while p < NUM_PLAYERS:  # Loop to choose each character
+            chosen_person = self.rng.randint(0, total_available_people - 1)  # Choose a character from list
+            if chosen_person in taken or (p % 2 == 0 and chosen_person % 2 != 0):
+                continue
+            taken.append(chosen_person)
+            person = Person(people_to_choose_from[chosen_person], p)
+            cast_of_players.append(person)  # Add chosen character to game
+            p += 1
 
-            self.murderer = random.randint(0, len(cast_of_players) - 1)  # choose index in players[] to be the murderer
-            cast_of_players[self.murderer].set_murderer(True)
+        self.murderer = self.rng.randint(0, len(cast_of_players) - 1)  # choose index in players[] of the murderer
+        cast_of_players[self.murderer].set_murderer(True)
 
-            return cast_of_players
+        return cast_of_players
 
-    def generate_rooms(self) -> list[list[Room]]:
+    def generate_rooms(self) -> typing.Sequence[typing.Sequence[Room]]:
         """
         Generates randomly the room_map array of rooms representing the mansion
 
@@ -353,63 +353,71 @@ class Mansion:
 
         :returns: 2D array representing rooms containing items/people
         """
-        with open("res/Rooms.in", "r") as file:
-            potential_rooms = int(file.readline().strip())  # Total rooms to choose from (minus starting room)
-
-            # Generate Mansion size
-            mansion_width = random.randint(4, 6)
-            mansion_height = random.randint(3, 4)
-
-            # Read rooms into a temp array, to randomly choose from
-            # Room input file format is: 1 line with #ofRooms, then 3 lines per room
-            # One line with name, one line with 4 doubles for weights, one line with 4 ints for costs
-            rooms_to_choose_from: list[Room] = []
-            for _ in range(potential_rooms):  # Read in all potential rooms, including name, weights, cost
-                name = file.readline().strip()
-                door_weights = list(map(float, file.readline().strip().split()))
-                costs = list(map(int, file.readline().strip().split()))
-                to_add = Room(name, door_weights, costs)
-                rooms_to_choose_from.append(to_add)
-
-            # Populates board with random rooms from potential rooms
-            mansion: list[list[Room]] = []
-            for x in range(mansion_width):
-                mansion_row: list[Room] = []
-                for y in range(mansion_height):
-                    chosen_room = random.randint(0, len(rooms_to_choose_from) - 1)
-                    mansion_row.append(rooms_to_choose_from.pop(chosen_room))
-                mansion.append(mansion_row)
-
-            # Logic for placing starting room, always at one of the four edges of the grid
-            # Decide which edge (N, S, E, W)
-            side_of_board = random.randint(0, 3)
-
-            starting_weights = [0.25, 0.25, 0.25, 0.25]
-            starting_costs = [3, 3, 3, 3]
-
-            if side_of_board == 0:  # North
-                x = 0  # Top edge
-                y = random.randint(0, mansion_height - 1)  # Any spot
-                mansion[x][y] = Room("The Foyer", starting_weights, starting_costs)
-            elif side_of_board == 1:  # South
-                x = mansion_width - 1  # Bottom edge
-                y = random.randint(0, mansion_height - 1)  # Any spot
-                mansion[x][y] = Room("The Foyer", starting_weights, starting_costs)
-            elif side_of_board == 2:  # East
-                x = random.randint(0, mansion_width - 1)  # Any spot
-                y = mansion_height - 1  # Right edge
-                mansion[x][y] = Room("The Foyer", starting_weights, starting_costs)
-            else:  # West
-                x = random.randint(0, mansion_width - 1)  # Any spot
-                y = 0  # Left edge
-                mansion[x][y] = Room("The Foyer", starting_weights, starting_costs)
-
-            # Add players into starting room (The Foyer)
-            for p in range(len(self.players)):
-                self.players[p].set_location(x, y)
-                mansion[x][y].add_player(self.players[p])
-
-            return mansion
+        # Total rooms to choose from (minus starting room), read from Rooms.in once and shared between games
+        rooms_to_choose_from = list(get_catalog().rooms)
+
+        # Generate Mansion size
+        mansion_width = self.rng.randint(4, 6)
+        mansion_height = self.rng.randint(3, 4)
+
+        # Populates board with random rooms from potential rooms
+        mansion: list[list[Room]] = []
+        for x in range(mansion_width):
+            mansion_row: list[Room] = []
+            for y in range(mansion_height):
+                chosen_room = self.rng.randint(0, len(rooms_to_choose_from) - 1)
+                mansion_row.append(rooms_to_choose_from.pop(chosen_room).new_room())
+            mansion.append(mansion_row)
+
+        # Logic for placing starting room, always at one of the four edges of the grid
+        # Decide which edge (N, S, E, W)
+        side_of_board = self.rng.randint(0, 3)
+
+        starting_weights = [0.25, 0.25, 0.25, 0.25]
+        starting_costs = [3, 3, 3, 3]
+
+        if side_of_board == 0:  # North
+            x = 0  # Top edge
+            y = self.rng.randint(0, mansion_height - 1)  # Any spot
+            mansion[x][y] = Room("The Foyer", starting_weights, starting_costs)
+        elif side_of_board == 1:  # South
+            x = mansion_width - 1  # Bottom edge
+            y = self.rng.randint(0, mansion_height - 1)  # Any spot
+            mansion[x][y] = Room("The Foyer", starting_weights, starting_costs)
+        elif side_of_board == 2:  # East
+            x = self.rng.randint(0, mansion_width - 1)  # Any spot
+            y = mansion_height - 1  # Right edge
+            mansion[x][y] = Room("The Foyer", starting_weights, starting_costs)
+        else:  # West
+            x = self.rng.randint(0, mansion_width - 1)  # Any spot
+            y = 0  # Left edge
+            mansion[x][y] = Room("The Foyer", starting_weights, starting_costs)
+
+        # Add players into starting room (The Foyer)
+        self.enter_players(mansion, x, y)
+
+        return mansion
+
+    def enter_players(self, mansion: typing.Sequence[typing.Sequence[Room]], x: int, y: int) -> None:
+        """
+        Helper for generate_rooms()
+        Puts every player in the starting room, and keeps count of who's alive from now on
+
+        :param mansion: The rooms of the mansion being generated
+        :param x: The starting room is mansion[x][y]
+        :param y: The starting room is mansion[x][y]
+        """
+        self.num_alive = len(self.players)
+        self.spatial_index = SpatialIndex(len(mansion), len(mansion[0]))
+        self.grid = self.spatial_index.grid
+        # Player name -> indexes of the players with that name (People.in has namesakes)
+        self.namesakes: dict[str, list[int]] = {}
+        for p in range(len(self.players)):
+            self.players[p].grid = self.grid
+            self.players[p].set_location(x, y)
+            self.spatial_index.place(p, x, y)
+            self.namesakes.setdefault(self.players[p].get_name(), []).append(p)
+            mansion[x][y].add_player(self.players[p])
 
     def spawn_items(self) -> list[Item]:
         """
@@ -421,42 +429,33 @@ class Mansion:
 
         :returns: List of created items
         """
-        with open("res/Items.in", "r") as file:
-            number_of_items = int(file.readline().strip())  # Reads the number of Items
-
-            location_to_item_map: dict[str, Item] = {}
-
-            for _ in range(number_of_items):
-                item_name = file.readline().strip()
-                item_location = file.readline().strip()
+        # Room name -> the item that spawns there, read from Items.in once and shared between games
+        location_to_item_map = dict(get_catalog().item_by_location)
 
-                item = Item(item_name)  # Create new Item with its room name
-                item.set_location(item_location)
-                location_to_item_map[item_location] = item  # Store in the hashmap
-
-            items: list[Item] = []
-            for x in range(len(self.room_map)):
-                for y in range(len(self.room_map[x])):
-                    if len(items) > self.total_items:
-                        break
-                    current_room = self.room_map[x][y]
-                    # No item spawns in The Foyer
-                    if current_room.get_room_name() == "The Foyer":
+        items: list[Item] = []
+        for x in range(len(self.room_map)):
+            for y in range(len(self.room_map[x])):
+                if len(items) > self.total_items:
+                    break
+                current_room = self.room_map[x][y]
+                # No item spawns in The Foyer
+                if current_room.get_room_name() == "The Foyer":
+                    continue
+                # If the current room doesn't have an item
+                elif len(current_room.get_items()) == 0 and self.place_item_in_room(x, y):
+                    template = location_to_item_map.pop(current_room.get_room_name(), None)  # Get item from dict
+                    if template is None:
                         continue
-                    # If the current room doesn't have an item
-                    elif len(current_room.get_items()) == 0 and self.place_item_in_room(x, y):
-                        item = location_to_item_map.pop(current_room.get_room_name(), None)  # Get item from dict
-                        if item is None:
-                            continue
-                        current_room.add_item(item)  # Add item to room
-                        items.append(item)
+                    item = template.new_item()
+                    current_room.add_item(item)  # Add item to room
+                    items.append(item)
 
-            # The murderer starts with the revolver. DO NOT COUNT THIS AS AN ITEM PICKUP.
-            revolver = Item("Revolver")
-            self.players[self.murderer].pick_up_item(revolver)
-            items.append(revolver)
+        # The murderer starts with the revolver. DO NOT COUNT THIS AS AN ITEM PICKUP.
+        revolver = Item("Revolver")
+        self.players[self.murderer].pick_up_item(revolver)
+        items.append(revolver)
 
-            return items
+        return items
 
     def place_item_in_room(self, x: int, y: int) -> bool:
         """
@@ -481,7 +480,52 @@ class Mansion:
                     if surrounding_room.get_items() and len(surrounding_room.get_items()) > 0:
                         surround += 1
 
-        return random.randint(0, 2) != 0 and surround < 2
+        return self.rng.randint(0, 2) != 0 and surround < 2
+
+    def kill(self, victim: Person) -> None:
+        """
+        Kills a player, keeping the alive counts of the mansion and its rooms up to date
+
+        :param victim: The person to kill
+        """
+        victim.kill()
+        self.num_alive -= 1
+        # Rooms go by name, so anyone with the victim's name may be listed as the victim (see Room.remove_player())
+        for x, y in {self.players[p].get_location() for p in self.namesakes[victim.get_name()]}:
+            self.room_map[x][y].person_died(victim)
+        self.spatial_index.remove(victim.index)
+
+    def choose_door(
+        self, player: Person, weights: typing.Sequence[float], costs: typing.Sequence[int], dim: tuple[int, int]
+    ) -> Coordinates:
+        """
+        Moves a player through a random door of their room (see Dice.door()), with
+        the mansion's precomputed DoorTable if it has one
+
+        :param player: The player moving
+        :param weights: Door weights of the player's room
+        :param costs: Door costs of the player's room
+        :param dim: Dimensions of the mansion
+        :returns: New coordinates after (maybe) going through a door
+        """
+        destination = self.rng.door(player, weights, costs, dim, self.doors)
+        self.spatial_index.place(player.index, destination[0], destination[1])
+        return destination
+
+    def pursue(self, player: Person) -> Coordinates:
+        """
+        Moves the murderer one room towards the closest player (see Person.pursue()),
+        found with the mansion's spatial index instead of checking every player
+
+        :param player: The murderer
+        :returns: New coordinates after pursuing the closest player
+        """
+        x, y = player.get_location()
+        # Like Person.pursue(), never go after someone with the murderer's name
+        target = self.spatial_index.nearest(x, y, exclude=self.namesakes[player.get_name()])
+        destination = player.pursue(player.get_location(), [] if target < 0 else [self.players[target]])
+        self.spatial_index.place(player.index, destination[0], destination[1])
+        return destination
 
     def murderer_wins(self) -> bool:
         """
@@ -489,6 +533,106 @@ class Mansion:
         """
         return self.alive_players() == 1 and self.players[self.murderer].is_alive()
 
+    def snapshot(self, previous: typing.Optional[Snapshot] = None) -> Snapshot:
+        """
+        Captures the state of the game (players, rooms, items, time and random
+        stream), to go back to with restore(). Pass the previous snapshot of
+        this game to share everything that hasn't changed since, so keeping one
+        snapshot per turn stays cheap.
+
+        :param previous: An earlier snapshot of this game
+        :returns: The game's current state
+        """
+        return take_snapshot(self, previous)
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """
+        Puts the game back in the state of a snapshot, after which it plays on
+        exactly like it did from there. The recorder (if any) is not rewound.
+
+        :param snapshot: A snapshot of this game
+        """
+        restore_snapshot(self, snapshot)
+
+    def turns(self) -> typing.Iterator["TurnDelta"]:
+        """
+        Plays the rest of the game lazily: each turn is only played when it is
+        asked for, so consumers can stop (or pause) between turns. Only
+        what changed is yielded, so memory doesn't grow with the game.
+
+        :returns: Iterator of what changed in each turn played
+        """
+        # id(item) -> index, id(None) isn't in it
+        item_index = {id(item): i for i, item in enumerate(self.items)}
+        while self.time_val < ((self.end - self.start) * 60):
+            time_val = self.time_val
+            rooms = [p.room_id for p in self.players]
+            alive = [p.is_alive() for p in self.players]
+            holds = [item_index.get(id(p.get_holds()), -1) for p in self.players]
+            marked = [item.is_marked() for item in self.items]
+
+            playing = self.next_turn()
+            if self.time_val == time_val:
+                return  # The murderer had already won, no turn was played
+            if playing and self.murderer_wins():
+                playing = self.next_turn()  # Ends the game like the next call to next_turn() would
+
+            held = [item_index.get(id(p.get_holds()), -1) for p in self.players]
+            yield TurnDelta(
+                time_val=time_val,
+                moved=tuple((i, p.room_id) for i, p in enumerate(self.players) if p.room_id != rooms[i]),
+                died=tuple(i for i, p in enumerate(self.players) if alive[i] and not p.is_alive()),
+                items=tuple((i, held[i], holds[i]) for i in range(len(self.players)) if held[i] != holds[i]),
+                weapons=tuple(i for i, item in enumerate(self.items) if item.is_marked() and not marked[i]),
+                over=not playing,
+            )
+            if not playing:
+                return
+
+    def step(self, n: int = 1) -> list["TurnDelta"]:
+        """
+        :param n: Number of turns to play
+        :returns: What changed in each turn played (fewer than n if the game ended)
+        """
+        deltas: list[TurnDelta] = []
+        if n > 0:
+            for delta in self.turns():
+                deltas.append(delta)
+                if len(deltas) == n:
+                    break
+        return deltas
+
+    def run_until(self, predicate: typing.Callable[["TurnDelta"], bool]) -> typing.Optional["TurnDelta"]:
+        """
+        Plays turns until one of them meets the predicate, or the game ends
+
+        :param predicate: Called with what changed in every turn played
+        :returns: The turn that met the predicate, None if the game ended first
+        """
+        for delta in self.turns():
+            if predicate(delta):
+                return delta
+        return None
+
+
+class TurnDelta(typing.NamedTuple):
+    """
+    What changed during one turn (see Mansion.turns()). Players and items are
+    their indexes in mansion.players and mansion.items.
+    """
+
+    # time_val the turn was played at
+    time_val: int
+    # (player, room id) for everyone who ended the turn in another room
+    moved: tuple[tuple[int, int], ...]
+    died: tuple[int, ...]
+    # (player, item held now, item held before) for everyone whose item changed, -1 for no item
+    items: tuple[tuple[int, int, int], ...]
+    # Items that became murder weapons
+    weapons: tuple[int, ...]
+    # True if the game is over after this turn
+    over: bool
+
 
 if __name__ == "__main__":
     print("🔍 Hint: To start the investigation, you need to run `main.py`, not this file.")
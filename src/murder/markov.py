@@ -0,0 +1,233 @@
+import math
+import typing
+
+from murder.doors import DoorTable, outcome_probabilities
+from murder.mansion import Mansion
+from murder.utils import Coordinates
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, solve() falls back to solve_python() without it
+    np = None
+
+# Every turn a player rolls 3-7 moves (see Mansion.next_turn()) and gets two tries to go through a door
+MOVE_ROLLS = range(3, 8)
+TRIES_PER_TURN = 2
+
+
+def solve(matrix: list[list[float]], rhs: list[float]) -> list[float]:
+    """
+    Solves matrix @ x == rhs with numpy.linalg.solve() if NumPy is installed,
+    otherwise with solve_python()
+
+    :param matrix: Square matrix (it is not modified)
+    :param rhs: Right hand side
+    :returns: The solution x
+    :raises ValueError: If the matrix is singular
+    """
+    if np is None:
+        return solve_python(matrix, rhs)
+    try:
+        return np.linalg.solve(np.array(matrix, dtype=float), np.array(rhs, dtype=float)).tolist()
+    except np.linalg.LinAlgError:
+        raise ValueError("Singular system, the chain has more than one solution") from None
+
+
+def solve_python(matrix: list[list[float]], rhs: list[float]) -> list[float]:
+    """
+    Solves matrix @ x == rhs with Gaussian elimination and partial pivoting
+
+    :param matrix: Square matrix (it is not modified)
+    :param rhs: Right hand side
+    :returns: The solution x
+    :raises ValueError: If the matrix is singular
+    """
+    n = len(matrix)
+    rows = [list(row) + [b] for row, b in zip(matrix, rhs)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(rows[r][col]))
+        if abs(rows[pivot][col]) < 1e-12:
+            raise ValueError("Singular system, the chain has more than one solution")
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for r in range(col + 1, n):
+            factor = rows[r][col] / rows[col][col]
+            if factor != 0.0:
+                for c in range(col, n + 1):
+                    rows[r][c] -= factor * rows[col][c]
+
+    x = [0.0] * n
+    for r in reversed(range(n)):
+        x[r] = (rows[r][n] - sum(rows[r][c] * x[c] for c in range(r + 1, n))) / rows[r][r]
+    return x
+
+
+class MovementChain:
+    """
+    Exact Markov chain of where a guest (anyone but the murderer) is from one
+    turn to the next, built from a mansion's layout: the door weights and costs
+    of its rooms, the 3-7 moves rolled every turn and the two tries to move.
+
+    States are rooms, numbered x * height + y. The transition matrix is kept
+    sparse (one {room: probability} dict per room), and the linear systems for
+    stationary distributions and hitting times are solved exactly.
+    """
+
+    def __init__(self, mansion: Mansion) -> None:
+        room_map = mansion.get_rooms()
+        self.width = len(room_map)
+        self.height = len(room_map[0])
+        self.size = self.width * self.height
+        self.doors = DoorTable(room_map)
+        self.rows: list[dict[int, float]] = [self.turn_from(room) for room in range(self.size)]
+
+    def index(self, room: typing.Sequence[int]) -> int:
+        """
+        :param room: (x, y) coordinates of a room
+        :returns: The room's state number
+        """
+        return room[0] * self.height + room[1]
+
+    def room(self, index: int) -> Coordinates:
+        """
+        :param index: A state number
+        :returns: (x, y) coordinates of the room
+        """
+        return Coordinates(index // self.height, index % self.height)
+
+    def door_outcomes(self, room: int, moves: int) -> typing.Iterator[tuple[int, int, float]]:
+        """
+        :param room: State number of the room the guest is in
+        :param moves: Moves the guest has left
+        :returns: (room, moves left, probability) after one try to go through a door
+        """
+        choices = self.doors.choices[room]
+        choice = choices[min(moves, len(choices) - 1)]
+        for door, p in enumerate(outcome_probabilities(choice.thresholds)):
+            if p == 0.0:
+                continue
+            if door == 4:
+                yield room, moves, p
+            else:
+                yield self.index(self.doors.targets[room][door]), moves - self.doors.costs[room][door], p
+
+    def turn_from(self, room: int) -> dict[int, float]:
+        """
+        :param room: State number of the room a guest starts their turn in
+        :returns: {room: probability} of where they end their turn
+        """
+        # (room, moves left) -> probability, after each try
+        states = {(room, moves): 1.0 / len(MOVE_ROLLS) for moves in MOVE_ROLLS}
+        for _ in range(TRIES_PER_TURN):
+            next_states: dict[tuple[int, int], float] = {}
+            for (here, moves), p in states.items():
+                if moves <= 0:
+                    next_states[here, moves] = next_states.get((here, moves), 0.0) + p
+                    continue
+                for there, left, q in self.door_outcomes(here, moves):
+                    next_states[there, left] = next_states.get((there, left), 0.0) + p * q
+            states = next_states
+
+        row: dict[int, float] = {}
+        for (there, _), p in states.items():
+            row[there] = row.get(there, 0.0) + p
+        return row
+
+    def transition_matrix(self) -> list[list[float]]:
+        """
+        :returns: Dense matrix, [i][j] is the chance of going from room i to room j in one turn
+        """
+        matrix = [[0.0] * self.size for _ in range(self.size)]
+        for i, row in enumerate(self.rows):
+            for j, p in row.items():
+                matrix[i][j] = p
+        return matrix
+
+    def step(self, distribution: typing.Sequence[float]) -> list[float]:
+        """
+        :param distribution: Chance of the guest being in each room
+        :returns: The same, one turn later
+        """
+        result = [0.0] * self.size
+        for i, p in enumerate(distribution):
+            if p != 0.0:
+                for j, q in self.rows[i].items():
+                    result[j] += p * q
+        return result
+
+    def occupancy(self, start: typing.Sequence[int], turns: int) -> list[list[float]]:
+        """
+        :param start: (x, y) room the guest starts in (everyone starts in the Foyer)
+        :param turns: Number of turns to follow the guest for
+        :returns: turns + 1 distributions, the chance of being in each room after 0, 1, ... turns
+        """
+        distribution = [0.0] * self.size
+        distribution[self.index(start)] = 1.0
+        result = [distribution]
+        for _ in range(turns):
+            distribution = self.step(distribution)
+            result.append(distribution)
+        return result
+
+    def stationary(self) -> list[float]:
+        """
+        :returns: The long run chance of a guest being in each room
+        :raises ValueError: If the layout splits the mansion in parts a guest can't leave
+        """
+        # pi @ P == pi, with the last equation swapped for sum(pi) == 1
+        matrix = [[-self.rows[j].get(i, 0.0) for j in range(self.size)] for i in range(self.size)]
+        for i in range(self.size):
+            matrix[i][i] += 1.0
+        matrix[-1] = [1.0] * self.size
+        rhs = [0.0] * (self.size - 1) + [1.0]
+        return solve(matrix, rhs)
+
+    def hitting_times(self, target: typing.Sequence[int]) -> list[float]:
+        """
+        :param target: (x, y) room to reach
+        :returns: Expected number of turns to first reach the target from each
+            room (0 for the target itself, inf if it might never be reached)
+        """
+        goal = self.index(target)
+
+        # Only rooms the target can be reached from have a finite hitting time
+        into: list[list[int]] = [[] for _ in range(self.size)]
+        for i, row in enumerate(self.rows):
+            for j, p in row.items():
+                if p > 0.0:
+                    into[j].append(i)
+        reaches = {goal}
+        frontier = [goal]
+        while frontier:
+            for i in into[frontier.pop()]:
+                if i not in reaches:
+                    reaches.add(i)
+                    frontier.append(i)
+
+        # Rooms that can move to a room that doesn't reach the target might never
+        # reach it either: drop them (and then the rooms that can move to them)
+        sure = reaches
+        leaking = [goal]
+        while leaking:
+            leaking = [i for i in sure if i != goal and any(j not in sure for j, p in self.rows[i].items() if p > 0.0)]
+            sure = sure.difference(leaking)
+
+        # h[i] - sum(P[i][j] * h[j]) == 1 for every other room i that surely reaches the target
+        others = sorted(sure - {goal})
+        position = {room: k for k, room in enumerate(others)}
+        matrix = [[0.0] * len(others) for _ in others]
+        for k, i in enumerate(others):
+            matrix[k][k] += 1.0
+            for j, p in self.rows[i].items():
+                if j in position:
+                    matrix[k][position[j]] -= p
+        times = solve(matrix, [1.0] * len(others)) if others else []
+
+        result = [math.inf] * self.size
+        result[goal] = 0.0
+        for k, i in enumerate(others):
+            result[i] = times[k]
+        return result
+
+
+if __name__ == "__main__":
+    print("🔍 Hint: To start the investigation, you need to run `main.py`, not this file.")
@@ -0,0 +1,292 @@
+import argparse
+import mmap
+import struct
+import sys
+import typing
+
+from murder.batch import map_chunked
+from murder.config import NUM_PLAYERS
+from murder.doors import DoorTable
+from murder.mansion import Mansion
+
+MAGIC = b"MMOS"
+VERSION = 1
+# magic, version, first case number, number of cases, death time columns
+HEADER = struct.Struct("<4sHqIH")
+# Columns are stored one after the other, each starting on a multiple of this
+ALIGNMENT = 8
+# The array typecodes the columns use (the ones memoryview.cast() accepts)
+Typecode = typing.Literal["B", "h", "H", "Q"]
+# Column name -> array typecode. death_times holds one value per player slot, -1 for survivors
+COLUMNS: dict[str, Typecode] = {
+    "murderer": "B",
+    "players": "B",
+    "victims": "Q",
+    "deaths": "B",
+    "death_times": "h",
+    "time_val": "H",
+    "width": "B",
+    "height": "B",
+    "items": "B",
+    "weapons": "Q",
+}
+
+
+class Outcome(typing.NamedTuple):
+    case_number: int
+    # Index of the murderer in mansion.players
+    murderer: int
+    players: int
+    # Bit i is set if mansion.players[i] was killed
+    victims: int
+    deaths: int
+    # Per player, time_val of the turn they were killed in (-1 if they survived)
+    death_times: tuple[int, ...]
+    time_val: int
+    width: int
+    height: int
+    items: int
+    # Bit i is set if mansion.items[i] was used as a murder weapon
+    weapons: int
+
+
+def play_outcome(case_number: int) -> Outcome:
+    """
+    Plays a game to the end, keeping track of when everyone died
+
+    :param case_number: The case number to play
+    :returns: The game's outcome
+    """
+    mansion = Mansion(str(case_number))
+    mansion.doors = DoorTable(mansion.get_rooms())
+    players = mansion.get_players()
+    death_times = [-1] * len(players)
+    playing = True
+    while playing:
+        time_val = mansion.time()
+        playing = mansion.next_turn()
+        for i, player in enumerate(players):
+            if death_times[i] < 0 and not player.is_alive():
+                death_times[i] = time_val
+
+    return Outcome(
+        case_number=case_number,
+        murderer=mansion.murderer,
+        players=len(players),
+        victims=sum(1 << i for i, t in enumerate(death_times) if t >= 0),
+        deaths=sum(t >= 0 for t in death_times),
+        death_times=tuple(death_times),
+        time_val=mansion.time(),
+        width=len(mansion.get_rooms()),
+        height=len(mansion.get_rooms()[0]),
+        items=len(mansion.get_items()),
+        weapons=sum(1 << i for i, item in enumerate(mansion.get_items()) if item.is_marked()),
+    )
+
+
+def column_offsets(count: int, slots: int) -> dict[str, tuple[int, int]]:
+    """
+    :param count: Number of cases in the file
+    :param slots: Number of death time columns
+    :returns: Column name -> (byte offset, number of values)
+    """
+    offsets = {}
+    offset = HEADER.size
+    for name, typecode in COLUMNS.items():
+        offset += -offset % ALIGNMENT
+        values = count * slots if name == "death_times" else count
+        offsets[name] = (offset, values)
+        offset += values * struct.calcsize(typecode)
+    return offsets
+
+
+def build(
+    path: str,
+    start: int,
+    stop: int,
+    *,
+    workers: typing.Optional[int] = None,
+    chunk_size: typing.Optional[int] = None,
+) -> None:
+    """
+    Plays every case number in range(start, stop) on a process pool, and
+    writes their outcomes to a columnar file
+
+    :param path: File to write
+    :param start: First case number
+    :param stop: One past the last case number
+    :param workers: Number of worker processes (see batch.map_chunked())
+    :param chunk_size: Number of games handed to a worker at once
+    :raises ValueError: If a game has more players than the store has death time columns
+    """
+    count = max(0, stop - start)
+    slots = NUM_PLAYERS
+    offsets = column_offsets(count, slots)
+    end = max((o + n * struct.calcsize(COLUMNS[c]) for c, (o, n) in offsets.items()), default=HEADER.size)
+
+    with open(path, "w+b") as file:
+        file.truncate(max(end, 1))
+        with mmap.mmap(file.fileno(), 0) as buffer:
+            HEADER.pack_into(buffer, 0, MAGIC, VERSION, start, count, slots)
+            columns = {
+                name: memoryview(buffer)[offset : offset + values * struct.calcsize(COLUMNS[name])].cast(COLUMNS[name])
+                for name, (offset, values) in offsets.items()
+            }
+            outcomes = map_chunked(play_outcome, list(range(start, stop)), workers=workers, chunk_size=chunk_size)
+            try:
+                for row, outcome in enumerate(outcomes):
+                    if len(outcome.death_times) > slots:
+                        raise ValueError(
+                            f"Case {outcome.case_number} has {len(outcome.death_times)} players,"
+                            f" the store only has room for {slots}"
+                        )
+                    for name, column in columns.items():
+                        if name == "death_times":
+                            times = outcome.death_times + (-1,) * (slots - len(outcome.death_times))
+                            packed = memoryview(struct.pack(f"{slots}h", *times)).cast("h")
+                            column[row * slots : (row + 1) * slots] = packed
+                        else:
+                            column[row] = getattr(outcome, name)
+            finally:
+                # The mmap can only be closed once nothing looks into it
+                for column in columns.values():
+                    column.release()
+
+
+class OutcomeStore:
+    """
+    Read-only, memory-mapped view of a file written by build(). Looking up a
+    case reads one value per column straight from the page cache, and every
+    column is a flat memoryview (np.asarray(store.column("time_val")) wraps
+    one without copying, for anyone with NumPy).
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: File written by build()
+        :raises ValueError: If the file isn't an outcome store this version can read
+        """
+        with open(path, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.start, self.count, self.slots = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a version {VERSION} murder mystery outcome store")
+        self.columns = {
+            name: memoryview(self.buffer)[offset : offset + values * struct.calcsize(COLUMNS[name])].cast(COLUMNS[name])
+            for name, (offset, values) in column_offsets(self.count, self.slots).items()
+        }
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, case_number: int) -> bool:
+        return self.start <= case_number < self.start + self.count
+
+    def column(self, name: str) -> memoryview:
+        """
+        :param name: One of COLUMNS
+        :returns: Every case's value, in case number order (death_times has
+            `slots` values per case)
+        """
+        return self.columns[name]
+
+    def __getitem__(self, case_number: int) -> Outcome:
+        """
+        :param case_number: A case number in the store
+        :returns: The case's outcome
+        :raises KeyError: If the case isn't in the store
+        """
+        if case_number not in self:
+            raise KeyError(case_number)
+        row = case_number - self.start
+        values = {name: column[row] for name, column in self.columns.items() if name != "death_times"}
+        players = values["players"]
+        death_times = tuple(self.columns["death_times"][row * self.slots : row * self.slots + players])
+        return Outcome(case_number=case_number, death_times=death_times, **values)
+
+    def scan(self, **conditions: typing.Union[int, tuple[int, int]]) -> list[int]:
+        """
+        Finds the cases whose columns meet every condition, one column at a
+        time (and only looking at the rows still in the running)
+
+        :param conditions: Column name -> a value, or an inclusive (low, high) range,
+            for example scan(deaths=(3, 5), time_val=(180, 300))
+        :returns: The matching case numbers, in order
+        """
+        rows: typing.Optional[list[int]] = None
+        for name, condition in conditions.items():
+            if name == "death_times" or name not in self.columns:
+                raise ValueError(f"Can't scan column {name!r}")
+            low, high = condition if isinstance(condition, tuple) else (condition, condition)
+            column = self.columns[name]
+            if rows is None:
+                rows = [row for row, value in enumerate(column) if low <= value <= high]
+            else:
+                rows = [row for row in rows if low <= column[row] <= high]
+        return [self.start + row for row in (range(self.count) if rows is None else rows)]
+
+    def close(self) -> None:
+        for column in self.columns.values():
+            column.release()
+        self.buffer.close()
+
+    def __enter__(self) -> "OutcomeStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def parse_range(text: str) -> tuple[int, int]:
+    """
+    :param text: A case number, or an inclusive range such as "0-99999"
+    :returns: (start, stop) of the matching range()
+    """
+    start, _, stop = text.partition("-")
+    return int(start), int(stop or start) + 1
+
+
+def parse_condition(text: str) -> tuple[str, tuple[int, int]]:
+    """
+    :param text: A condition such as "deaths=3" or "time_val=180-300"
+    :returns: (column, inclusive range) for OutcomeStore.scan()
+    """
+    name, sep, values = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"{text!r} is not COLUMN=VALUE or COLUMN=LOW-HIGH")
+    start, stop = parse_range(values)
+    return name, (start, stop - 1)
+
+
+def main(argv: typing.Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Precompute murder mystery outcomes, and look them up")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="play a range of cases and store their outcomes")
+    build_parser.add_argument("store", help="file to write")
+    build_parser.add_argument("cases", type=parse_range, help='inclusive range of case numbers such as "0-99999"')
+    build_parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    build_parser.add_argument("--chunk-size", type=int, default=None, help="games handed to a worker at once")
+    show_parser = commands.add_parser("show", help="print the outcome of some cases")
+    show_parser.add_argument("store", help="file written by build")
+    show_parser.add_argument("cases", nargs="+", type=int, help="case numbers")
+    scan_parser = commands.add_parser("scan", help="print the case numbers whose outcome meets some conditions")
+    scan_parser.add_argument("store", help="file written by build")
+    scan_parser.add_argument(
+        "--where", type=parse_condition, action="append", default=[], help='condition such as "deaths=3-5"'
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        build(args.store, *args.cases, workers=args.workers, chunk_size=args.chunk_size)
+        return
+    with OutcomeStore(args.store) as store:
+        if args.command == "show":
+            for case_number in args.cases:
+                sys.stdout.write(f"{store[case_number]}\n")
+        else:
+            for case_number in store.scan(**dict(args.where)):
+                sys.stdout.write(f"{case_number}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@ import random
 import typing
 
 from murder.item import Item
-from murder.utils import Coordinates
+from murder.utils import LOOSE_GRID, Coordinates, DoorCosts, DoorWeights
 
 
 class Person:
@@ -12,16 +12,19 @@ class Person:
     Includes methods which make movement/murderer decisions
     """
 
-    def __init__(self, name: str) -> None:
+    __slots__ = ("name", "index", "holds", "is_murderer_flag", "is_alive_flag", "moves", "grid", "room_id")
+
+    def __init__(self, name: str, index: int = 0) -> None:
         self.name = name
+        self.index = index  # Index of the person in the mansion's players[]
         self.holds: typing.Optional[Item] = None
         self.is_murderer_flag = False
         self.is_alive_flag = True
         self.moves = 0
-        self.room = Coordinates(0, 0)  # The (x,y) coordinates of the player in room_map
+        self.grid, self.room_id = LOOSE_GRID, 0  # The person is in room grid.location(room_id) of the mansion
 
     def choose_door(
-        self, weights: list[float], costs: list[int], coords: Coordinates, dim: tuple[int, int]
+        self, weights: DoorWeights, costs: DoorCosts, coords: Coordinates, dim: tuple[int, int], rng: random.Random
     ) -> Coordinates:
         """
         Given info about four doors (weight and cost array, plus location and bounds)
@@ -31,6 +34,7 @@ class Person:
         :param costs: List[int] array of door costs
         :param coords: Starting coordinates of player
         :param dim: List[int] dimensions of the mansion
+        :param rng: The game's random stream
         :returns: New coordinates after (maybe) going through a door
         """
         assert len(coords) == 2
@@ -42,9 +46,9 @@ class Person:
         # While doors to try remain
         while len(doors) > 1:
             # Randomly choose one of the four doors
-            chosen_door = doors.pop(random.randint(0, len(doors) - 1))
+            chosen_door = doors.pop(rng.randint(0, len(doors) - 1))
             # Decide probability we go through the door
-            door_check = random.uniform(0.0, 1.0)
+            door_check = rng.uniform(0.0, 1.0)
 
             # If the player is not trying to move out of bounds or through a door
             x, y = coords
@@ -155,20 +159,16 @@ class Person:
         """
         return self.is_alive_flag
 
-    def set_location(self, x: int, y: int) -> None:
-        """
-        Sets the (x,y) location
-
-        :param x: x coordinate in room_map[x,y]
-        :param y: y coordinate in room_map[x,y]
-        """
-        self.room = Coordinates(x, y)
-
     def get_location(self) -> Coordinates:
         """
         :returns: Coordinates of location of person
         """
-        return self.room
+        return self.grid.location(self.room_id)
+
+    @property
+    def room(self) -> Coordinates:
+        """The (x,y) coordinates of the player in room_map, same as get_location()"""
+        return self.grid.location(self.room_id)
 
     def get_name(self) -> str:
         """
@@ -250,6 +250,15 @@ class Person:
         self.holds = None
         return item
 
+    def set_location(self, x: int, y: int) -> None:
+        """
+        Sets the (x,y) location
+
+        :param x: x coordinate in room_map[x,y]
+        :param y: y coordinate in room_map[x,y]
+        """
+        self.room_id = self.grid.room_id(x, y)
+
 
 if __name__ == "__main__":
     print("🔍 Hint: To start the investigation, you need to run `main.py`, not this file.")
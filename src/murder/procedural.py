@@ -0,0 +1,172 @@
+import random
+import typing
+from array import array
+
+from murder.catalog import get_catalog
+from murder.item import Item
+from murder.mansion import Mansion
+from murder.person import Person
+from murder.room import Room
+
+T = typing.TypeVar("T")
+
+
+class Deck(typing.Generic[T]):
+    """
+    Draws cards at random without putting them back, for as long as it
+    takes: once every card was drawn, the deck is shuffled back together and
+    `copy` goes up by one. Drawing swaps the card with the last one before
+    removing it, so every draw takes the same time however big the deck is.
+    """
+
+    def __init__(self, cards: typing.Sequence[T]) -> None:
+        """
+        :param cards: The cards in the deck (at least one)
+        """
+        if not cards:
+            raise ValueError("A deck needs at least one card")
+        self.cards = tuple(cards)
+        self.left = list(self.cards)
+        self.copy = 0  # Number of times every card was drawn so far
+
+    def draw(self, rng: random.Random) -> tuple[T, int]:
+        """
+        :param rng: The game's random stream
+        :returns: (a card, how many times that card was drawn before)
+        """
+        if not self.left:
+            self.left = list(self.cards)
+            self.copy += 1
+        i = rng.randrange(len(self.left))
+        self.left[i], self.left[-1] = self.left[-1], self.left[i]
+        return self.left.pop(), self.copy
+
+
+def copy_name(name: str, copy: int) -> str:
+    """
+    :param name: A name from the catalog
+    :param copy: How many times it was used before
+    :returns: The name, numbered from its second use on ("Lounge", "Lounge 2", ...)
+    """
+    return name if copy == 0 else f"{name} {copy + 1}"
+
+
+class ProceduralMansion(Mansion):
+    """
+    A mansion of any size, with any number of guests, for stress testing the
+    engine. Rooms, items and guests are derived from the catalog: once every
+    room (or person) was used, they are used again with a number after their
+    name, and every copy of a room spawns its own copy of the room's item.
+
+    Guests are cast like in Mansion.generate_players(), alternating between
+    the even and odd people of People.in. Mansion itself (and so every case
+    number a student gets) is not changed by any of this.
+    """
+
+    def __init__(self, case_number: str, *, width: int, height: int, guests: int, **kwargs) -> None:
+        """
+        :param case_number: The value to use for random seeding
+        :param width: Number of rooms along x (len(room_map))
+        :param height: Number of rooms along y (len(room_map[0]))
+        :param guests: Number of players, murderer included
+        :param kwargs: Passed on to Mansion (renderer, ...)
+        :raises ValueError: If the mansion has no rooms, or fewer than two guests
+        """
+        if width < 1 or height < 1:
+            raise ValueError(f"A mansion can't be {width}x{height} rooms")
+        if guests < 2:
+            raise ValueError("A murder mystery needs at least two guests")
+        self.width = width
+        self.height = height
+        self.guests = guests
+        # Per room id: index of the room's template in catalog.rooms, and which copy of it the room is
+        self.room_templates = array("H")
+        self.room_copies = array("I")
+        super().__init__(case_number, **kwargs)
+
+    def generate_players(self) -> list[Person]:
+        """
+        :returns: `guests` players, one of them the murderer
+        """
+        people = get_catalog().people
+        decks = (Deck(range(0, len(people), 2)), Deck(range(1, len(people), 2)))
+        cast_of_players: list[Person] = []
+        for p in range(self.guests):
+            chosen_person, copy = decks[p % 2].draw(self.rng)
+            cast_of_players.append(Person(copy_name(people[chosen_person], copy), p))
+
+        self.murderer = self.rng.randrange(len(cast_of_players))
+        cast_of_players[self.murderer].set_murderer(True)
+        return cast_of_players
+
+    def generate_rooms(self) -> typing.Sequence[typing.Sequence[Room]]:
+        """
+        :returns: A width x height mansion, with The Foyer on one of its edges and everybody in it
+        """
+        rooms = get_catalog().rooms
+        deck = Deck(range(len(rooms)))
+        mansion: list[list[Room]] = []
+        for x in range(self.width):
+            mansion_row: list[Room] = []
+            for y in range(self.height):
+                chosen_room, copy = deck.draw(self.rng)
+                self.room_templates.append(chosen_room)
+                self.room_copies.append(copy)
+                room = rooms[chosen_room].new_room()
+                room.set_room_name(copy_name(room.get_room_name(), copy))
+                mansion_row.append(room)
+            mansion.append(mansion_row)
+
+        x, y = self.place_foyer(mansion)
+        self.enter_players(mansion, x, y)
+        return mansion
+
+    def place_foyer(self, mansion: typing.Any) -> tuple[int, int]:
+        """
+        Helper for generate_rooms()
+        Puts The Foyer on one of the four edges (N, S, E, W), like Mansion.generate_rooms()
+
+        :param mansion: The rooms of the mansion being generated
+        :returns: (x, y) of The Foyer
+        """
+        side_of_board = self.rng.randint(0, 3)
+        if side_of_board < 2:
+            x, y = (0 if side_of_board == 0 else self.width - 1), self.rng.randrange(self.height)
+        else:
+            x, y = self.rng.randrange(self.width), (self.height - 1 if side_of_board == 2 else 0)
+        mansion[x][y] = Room("The Foyer", [0.25, 0.25, 0.25, 0.25], [3, 3, 3, 3])
+        return x, y
+
+    def spawn_items(self) -> list[Item]:
+        """
+        Spawns items like Mansion.spawn_items(), each copy of a room with its own copy of the room's item
+
+        :returns: List of created items
+        """
+        catalog = get_catalog()
+        items: list[Item] = []
+        for x in range(self.width):
+            for y in range(self.height):
+                if len(items) > self.total_items:
+                    break
+                current_room = self.room_map[x][y]
+                if current_room.get_room_name() == "The Foyer":
+                    continue
+                elif len(current_room.get_items()) == 0 and self.place_item_in_room(x, y):
+                    room_id = self.grid.room_id(x, y)
+                    template = catalog.item_by_location.get(catalog.rooms[self.room_templates[room_id]].name)
+                    if template is None:
+                        continue
+                    item = Item(copy_name(template.item_name, self.room_copies[room_id]))
+                    item.set_location(current_room.get_room_name())
+                    current_room.add_item(item)
+                    items.append(item)
+
+        revolver = Item("Revolver")
+        self.players[self.murderer].pick_up_item(revolver)
+        items.append(revolver)
+        return items
+
+
+if __name__ == "__main__":
+    print("🔍 Hint: To start the investigation, you need to run `main.py`, not this file.")
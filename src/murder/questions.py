@@ -1,14 +1,16 @@
 import random
 import typing
 
+from murder.catalog import get_catalog
 from murder.mansion import Mansion
-from murder.utils import clear_screen
 
 
 class SeedQuestion(typing.NamedTuple):
     t_0: str
     t_1: str
     t_2: str
+    # Index in mansion.players of the player t_1 names, -1 if it isn't a player (names aren't unique)
+    player: int = -1
 
 
 def get_random_question_seeds(mansion: Mansion, num_seed_q: int) -> list[SeedQuestion]:
@@ -22,140 +24,140 @@ def get_random_question_seeds(mansion: Mansion, num_seed_q: int) -> list[SeedQue
     Parses the random selection for game specific attributes
     like item names, times, players, etc.
 
+    :param mansion: The mansion (after the game is played) to draw from, including its random stream
     :param num_seed_q: Number of seed questions to generate
     :returns: A 2D String array, where each row is a question, and
         each of 3 columns is a component of the question
     """
-    with open("res/Questions.in", "r") as file:
-        # Skip the set questions (read in driver)
-        skip = int(file.readline().strip())
-        for _ in range(skip):
-            file.readline()
-
-        # Read in random question pool size
-        random_question_count = int(file.readline().strip())
-        # Create 2D strs array to hold question parts
-        question_list: list[SeedQuestion] = []
-
-        # Store each question in a row of the list, parse the string based on ',' delimiter,
-        # and store each part in a column
-        for _ in range(random_question_count):
-            raw_string = file.readline().strip()
-            split = raw_string.split(",")
-            assert len(split) == 3
-            # Read in first part of question
-            t_0 = split[0]
-
-            # Add random variables to second token
-            if split[1] == "ITEM":
-                # Randomly select item name
-                item = mansion.items[random.randint(0, len(mansion.items) - 1)]
-                tried = len(mansion.items) * 2
-                while item.get_item_name() == item.get_location() and tried > 0:
-                    item = mansion.items[random.randint(0, len(mansion.items) - 1)]
-                    tried -= 1
-                t_1 = "the " + mansion.items[random.randint(0, len(mansion.items) - 1)].get_item_name()
-            elif split[1] == "TIME":
-                t_1 = str(random.randint(0, (mansion.time() // 5) + 1) * 5)
-            else:
-                # Randomly select player name
-                player = mansion.players[random.randint(0, len(mansion.players) - 1)]
-                n = 0
-                while player.is_alive() and n < 12:
-                    player = mansion.players[random.randint(0, len(mansion.players) - 1)]
-                    n += 1
-                t_1 = player.get_name()
-
-            # Add random variables to third token
-            if split[2] == "TIME":
-                t_2 = str(random.randint(0, (mansion.time() // 5) + 1) * 5)
-            else:
-                t_2 = split[2]
+    # Create 2D strs array to hold question parts
+    question_list: list[SeedQuestion] = []
+
+    # Store each question in a row of the list, with each of its (already split)
+    # ',' delimited parts in a column
+    for split in get_catalog().seed_questions:
+        # Read in first part of question
+        t_0 = split[0]
+
+        # Add random variables to second token
+        player_index = -1
+        if split[1] == "ITEM":
+            # Randomly select item name
+            item = mansion.items[mansion.rng.randint(0, len(mansion.items) - 1)]
+            tried = len(mansion.items) * 2
+            while item.get_item_name() == item.get_location() and tried > 0:
+                item = mansion.items[mansion.rng.randint(0, len(mansion.items) - 1)]
+                tried -= 1
+            t_1 = "the " + mansion.items[mansion.rng.randint(0, len(mansion.items) - 1)].get_item_name()
+        elif split[1] == "TIME":
+            t_1 = str(mansion.rng.randint(0, (mansion.time() // 5) + 1) * 5)
+        else:
+            # Randomly select player name
+            player = mansion.players[mansion.rng.randint(0, len(mansion.players) - 1)]
+            n = 0
+            while player.is_alive() and n < 12:
+                player = mansion.players[mansion.rng.randint(0, len(mansion.players) - 1)]
+                n += 1
+            t_1 = player.get_name()
+            player_index = player.index
+
+        # Add random variables to third token
+        if split[2] == "TIME":
+            t_2 = str(mansion.rng.randint(0, (mansion.time() // 5) + 1) * 5)
+        else:
+            t_2 = split[2]
 
-            question_list.append(SeedQuestion(t_0, t_1, t_2))
+        question_list.append(SeedQuestion(t_0, t_1, t_2, player_index))
 
-        chosen_to_parse: list[SeedQuestion] = []
-        for _ in range(num_seed_q):
-            chosen_index = random.randint(0, len(question_list) - 1)
-            chosen = question_list.pop(chosen_index)
-            chosen_to_parse.append(SeedQuestion(chosen[0], chosen[1], chosen[2]))
+    chosen_to_parse: list[SeedQuestion] = []
+    for _ in range(num_seed_q):
+        chosen_index = mansion.rng.randint(0, len(question_list) - 1)
+        chosen = question_list.pop(chosen_index)
+        chosen_to_parse.append(SeedQuestion(chosen[0], chosen[1], chosen[2], chosen.player))
 
-        return chosen_to_parse
+    return chosen_to_parse
 
 
-def get_source_code_questions(num_source_q: int) -> list[str]:
+def get_source_code_questions(num_source_q: int, rng: typing.Optional[random.Random] = None) -> list[str]:
     """
     Gets a randomly selected list of pre-created questions about the source code
 
     :param num_source_q: Number of source code questions to select
+    :param rng: The random stream to select with (normally the game's), the random module's if None
     :returns: List of randomly selected pre-created questions about the source code
     """
-    with open("res/Questions.in", "r") as file:
-        # Skip the set questions (read in driver)
-        skip = int(file.readline().strip())
-        for _ in range(skip):
-            file.readline()
+    randint = random.randint if rng is None else rng.randint
+    questions = list(get_catalog().source_code_questions)
 
-        skip = int(file.readline().strip())  # Skip the random questions
-        for _ in range(skip):
-            file.readline()
+    chosen_questions = []
+    for _ in range(num_source_q):
+        chosen_index = randint(0, len(questions) - 1)
+        chosen_questions.append(questions.pop(chosen_index))
 
-        code_questions = int(file.readline().strip())
-        questions = []
-        for _ in range(code_questions):
-            questions.append(file.readline().strip())
+    return chosen_questions
 
-        chosen_questions = []
-        for _ in range(num_source_q):
-            chosen_index = random.randint(0, len(questions) - 1)
-            chosen_questions.append(questions.pop(chosen_index))
 
-        return chosen_questions
+class Worksheet(typing.NamedTuple):
+    hard_coded: list[str]
+    seeds: list[SeedQuestion]
+    random_questions: list[str]
+    source_code: list[str]
 
+    def questions(self) -> list[str]:
+        """
+        :returns: Every question, in the order they are asked
+        """
+        return self.hard_coded + self.random_questions + self.source_code
 
-def ask_questions(
+
+def make_worksheet(
     mansion: Mansion,
     *,
     num_random_questions: int = 3,
     num_source_code_questions: int = 2,
-) -> list[str]:
+) -> Worksheet:
     """
-    Generate and ask questions through the terminal. Questions are composed of:
+    Generate the questions for a game. Questions are composed of:
     - A list of "hard coded" questions to ask every student
     - A randomly generated list of questions based on "question seeds"
     - A randomly selected list of pre-created questions about the source code
 
-    :returns: List of user answers
+    :param mansion: The mansion (after the game is played) to ask about
+    :returns: The questions, along with the seeds the random questions were built from
     """
-    # Read in non random questions
-    with open("res/Questions.in", "r") as file:
-        num_hard_coded_questions = int(file.readline().strip())
-        hard_coded_question_pool = []
-        for _ in range(num_hard_coded_questions):
-            hard_coded_question_pool.append(file.readline().strip())
-
     question_seeds = get_random_question_seeds(mansion, num_random_questions)
-    random_question_pool = generate_questions(mansion, question_seeds)
-    code_question_pool = get_source_code_questions(num_source_code_questions)
+    return Worksheet(
+        hard_coded=list(get_catalog().hard_coded_questions),
+        seeds=question_seeds,
+        random_questions=generate_questions(mansion, question_seeds),
+        source_code=get_source_code_questions(num_source_code_questions, mansion.rng),
+    )
 
-    # Ask questions and record answers
-    total_questions = num_random_questions + num_source_code_questions + num_hard_coded_questions
-    questions: list[str] = []
-    for question_num in range(total_questions):
-        if question_num < num_hard_coded_questions:
-            questions.append(hard_coded_question_pool[question_num])
-        elif question_num < num_hard_coded_questions + num_random_questions:
-            questions.append(random_question_pool[question_num - num_hard_coded_questions])
-        else:
-            questions.append(code_question_pool[question_num - num_hard_coded_questions - num_random_questions])
+
+def ask_questions(
+    mansion: Mansion,
+    *,
+    num_random_questions: int = 3,
+    num_source_code_questions: int = 2,
+    read: typing.Callable[[], str] = input,
+) -> list[str]:
+    """
+    Generate (see make_worksheet()) and ask questions through the terminal.
+
+    :param read: Reads one answer, input() unless another source is given
+    :returns: List of user answers
+    """
+    worksheet = make_worksheet(
+        mansion, num_random_questions=num_random_questions, num_source_code_questions=num_source_code_questions
+    )
+    questions = worksheet.questions()
 
     # Ask questions and record answers
     answers: list[str] = []
     for i, question in enumerate(questions):
-        print(f"Question {i + 1} / {len(questions)}")
-        print(question)
-        answers.append(input().strip())
-        clear_screen()
+        mansion.renderer.print(f"Question {i + 1} / {len(questions)}")
+        mansion.renderer.print(question)
+        answers.append(read().strip())
+        mansion.renderer.clear_screen()
 
     return answers
 
@@ -245,14 +247,15 @@ def generate_questions(mansion: Mansion, q_seeds: list[SeedQuestion]) -> list[st
     return parsed
 
 
-def write_answers(case_number: str, ans: list[str]) -> None:
+def write_answers(case_number: str, ans: list[str], path: str = "Answers.out") -> None:
     """
     Write answers to output file
 
     :param case_number: User's "case number" used to seed random
     :param ans: List of answers
+    :param path: The output file
     """
-    with open("Answers.out", "w") as file:
+    with open(path, "w") as file:
         file.write(case_number + "\n")
         for answer in ans:
             file.write(answer + "\n")
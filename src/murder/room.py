@@ -2,6 +2,7 @@ import typing
 
 from murder.item import Item
 from murder.person import Person
+from murder.utils import DoorCosts, DoorWeights
 
 
 class Room:
@@ -9,14 +10,21 @@ class Room:
     Room class, representing a room in the mansion
     """
 
-    def __init__(self, room_name: str, weights: list[float], costs: list[int]) -> None:
+    __slots__ = ("room_name", "occupants", "names", "entered", "alive", "items", "door_weights", "door_costs")
+
+    def __init__(self, room_name: str, weights: DoorWeights, costs: DoorCosts) -> None:
         """
         :param name: The name of the room
         :param weights: A list array of door weights (probabilities)
         :param costs: A list array of door costs (for use with dice roll)
         """
         self.room_name = room_name
-        self.people: list[Person] = []
+        # Entry number -> Person for everyone in the room, in the order they came in
+        self.occupants: dict[int, Person] = {}
+        # Name -> entry numbers of the occupants with that name, in the order they came in
+        self.names: dict[str, list[int]] = {}
+        self.entered = 0  # Entry number of the next person to come in
+        self.alive = 0  # How many of the occupants are alive
         self.items: list[Item] = []
         self.door_weights = weights
         self.door_costs = costs
@@ -35,23 +43,33 @@ class Room:
 
         :param player: The Person object to add
         """
-        self.people.append(player)
+        self.occupants[self.entered] = player
+        self.names.setdefault(player.get_name(), []).append(self.entered)
+        self.entered += 1
+        if player.is_alive():
+            self.alive += 1
 
     def get_people(self) -> list[Person]:
         """
         :returns: The Person list
         """
-        return self.people
+        return list(self.occupants.values())
 
     def alive_people(self) -> int:
         """
         :returns: The number of alive people in a room
         """
-        alive = 0
-        for person in self.people:
-            if person.is_alive():
-                alive += 1
-        return alive
+        return self.alive
+
+    def person_died(self, victim: Person) -> None:
+        """
+        Updates the alive count after someone is killed
+
+        :param victim: The person who was just killed, listed in the room or not
+        """
+        for entry in self.names.get(victim.get_name(), ()):
+            if self.occupants[entry] is victim:
+                self.alive -= 1
 
     def remove_player(self, name: str) -> None:
         """
@@ -59,10 +77,15 @@ class Room:
 
         :param name: The name of the player to remove
         """
-        for i, person in enumerate(self.people):
-            if person.get_name() == name:
-                self.people.pop(i)
-                return
+        entries = self.names.get(name)
+        if not entries:
+            return
+        # The first person with that name to come in leaves (a namesake of the player, maybe)
+        person = self.occupants.pop(entries.pop(0))
+        if not entries:
+            del self.names[name]
+        if person.is_alive():
+            self.alive -= 1
 
     def get_room_name(self) -> str:
         """
@@ -96,25 +119,25 @@ class Room:
         """
         self.items = items
 
-    def get_door_weights(self) -> list[float]:
+    def get_door_weights(self) -> DoorWeights:
         """
         :returns: door weights
         """
         return self.door_weights
 
-    def set_door_weights(self, door_weights: list[float]):
+    def set_door_weights(self, door_weights: DoorWeights):
         """
         Set door weights
         """
         self.door_weights = door_weights
 
-    def get_door_costs(self) -> list[int]:
+    def get_door_costs(self) -> DoorCosts:
         """
         :returns: door costs
         """
         return self.door_costs
 
-    def set_door_costs(self, door_costs: list[int]) -> None:
+    def set_door_costs(self, door_costs: DoorCosts) -> None:
         """
         Set door costs
         """
@@ -0,0 +1,205 @@
+import argparse
+import functools
+import itertools
+import json
+import os
+import sys
+import typing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from murder.batch import GameSummary, parse_case_numbers, summarize
+from murder.config import END_TIME, START_TIME, TIME_MINUTE_INCREMENTS
+from murder.doors import DoorTable
+from murder.mansion import Mansion
+
+# The murderer gets two tries to act every turn, and can kill once per try
+KILLS_PER_TURN = 2
+
+
+class Constraints(typing.NamedTuple):
+    """
+    What a case's outcome has to look like to match a search. Every field
+    left at its default matches anything.
+    """
+
+    min_victims: int = 0
+    max_victims: typing.Optional[int] = None
+    # Minutes since the start of the game the game has to last until (at least / at most)
+    min_time: int = 0
+    max_time: typing.Optional[int] = None
+    # Items that have to end up as murder weapons
+    weapons: tuple[str, ...] = ()
+    murderer: typing.Optional[str] = None
+
+    def matches(self, summary: GameSummary) -> bool:
+        """
+        :param summary: The outcome of a finished game
+        :returns: True if the outcome meets every constraint
+        """
+        return (
+            self.min_victims <= len(summary.victims)
+            and (self.max_victims is None or len(summary.victims) <= self.max_victims)
+            and self.min_time <= summary.time_val
+            and (self.max_time is None or summary.time_val <= self.max_time)
+            and all(weapon in summary.weapons for weapon in self.weapons)
+            and (self.murderer is None or summary.murderer == self.murderer)
+        )
+
+    def still_possible(self, mansion: Mansion) -> bool:
+        """
+        Checks a game that is still being played. Only rules out games that
+        can't match whatever happens in the turns left, never the other way round.
+
+        :param mansion: A mansion in the middle of its game
+        :returns: False if the game can no longer match
+        """
+        if self.murderer is not None and mansion.get_players()[mansion.murderer].get_name() != self.murderer:
+            return False
+        if self.max_time is not None and mansion.time() > self.max_time:
+            return False
+
+        victims = len(mansion.get_players()) - mansion.alive_players()
+        if self.max_victims is not None and victims > self.max_victims:
+            return False
+        turns_left = -(-((END_TIME - START_TIME) * 60 - mansion.time()) // TIME_MINUTE_INCREMENTS)
+        kills_left = min(mansion.alive_players() - 1, KILLS_PER_TURN * turns_left)
+        if victims + kills_left < self.min_victims:
+            return False
+        # Every weapon still missing needs a kill of its own (and has to be in the game at all)
+        names = {item.get_item_name() for item in mansion.get_items()}
+        marked = {item.get_item_name() for item in mansion.get_items() if item.is_marked()}
+        return names.issuperset(self.weapons) and len(set(self.weapons) - marked) <= kills_left
+
+
+def check_case(case_number: str, constraints: Constraints, *, alias: bool = False) -> typing.Optional[GameSummary]:
+    """
+    Plays a game until it ends or can no longer meet the constraints
+
+    :param case_number: The "case number" used to seed the game
+    :param constraints: What the outcome has to look like
+    :param alias: Sample doors from alias tables (see murder.batch.play_case())
+    :returns: Summary of the game if it meets the constraints, None if not
+    """
+    mansion = Mansion(case_number)
+    mansion.doors = DoorTable(mansion.get_rooms(), alias=alias)
+    if not constraints.still_possible(mansion):
+        return None
+    while mansion.next_turn():
+        if not constraints.still_possible(mansion):
+            return None
+    summary = summarize(case_number, mansion)
+    return summary if constraints.matches(summary) else None
+
+
+def _check_chunk(constraints: Constraints, alias: bool, chunk: list[str]) -> list[GameSummary]:
+    return [s for s in (check_case(case, constraints, alias=alias) for case in chunk) if s is not None]
+
+
+def search(
+    case_numbers: typing.Iterable[typing.Union[str, int]],
+    constraints: Constraints,
+    *,
+    workers: typing.Optional[int] = None,
+    chunk_size: int = 500,
+    alias: bool = False,
+    limit: typing.Optional[int] = None,
+) -> typing.Iterator[GameSummary]:
+    """
+    Searches case numbers for games that meet the constraints, on a process
+    pool. Matches are yielded as soon as the chunk they are in is done, so
+    they don't come in case number order (each chunk's matches do).
+
+    :param case_numbers: The case numbers to search (ints are converted to str)
+    :param constraints: What the outcome has to look like
+    :param workers: Number of worker processes, defaults to the CPU count.
+        A value of 1 searches in the current process, in order.
+    :param chunk_size: Number of games handed to a worker at once
+    :param alias: Sample doors from alias tables (see murder.batch.play_case())
+    :param limit: Stop once this many matches were found
+    :returns: Iterator of GameSummary, one per matching case number
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    cases = [str(c) for c in case_numbers]
+    found = 0
+    if limit is not None and limit <= 0:
+        return
+
+    if workers <= 1:
+        for case in cases:
+            summary = check_case(case, constraints, alias=alias)
+            if summary is not None:
+                yield summary
+                found += 1
+                if found == limit:
+                    return
+        return
+
+    check = functools.partial(_check_chunk, constraints, alias)
+    chunks = iter([cases[i : i + chunk_size] for i in range(0, len(cases), chunk_size)])
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        # Keep every worker busy, without queueing the whole range at once
+        pending = {pool.submit(check, chunk) for chunk in itertools.islice(chunks, workers * 2)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for summary in future.result():
+                    yield summary
+                    found += 1
+                    if found == limit:
+                        return
+                pending |= {pool.submit(check, chunk) for chunk in itertools.islice(chunks, 1)}
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def parse_clock(text: str) -> int:
+    """
+    :param text: A time of the evening such as "9pm" or "9:30pm"
+    :returns: Minutes since the start of the game
+    :raises ValueError: If the text isn't a time
+    """
+    clock = text.strip().lower().removesuffix("pm")
+    hour, _, minute = clock.partition(":")
+    if not hour.isdigit() or (minute and not minute.isdigit()):
+        raise ValueError(f"{text!r} is not a time such as 9pm or 9:30pm")
+    return (int(hour) - START_TIME) * 60 + int(minute or 0)
+
+
+def main(argv: typing.Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Find murder mystery cases whose outcome meets some constraints")
+    parser.add_argument("cases", nargs="+", help='case numbers, or inclusive ranges such as "1-100000"')
+    parser.add_argument("--min-victims", type=int, default=0, help="at least this many guests die")
+    parser.add_argument("--max-victims", type=int, default=None, help="at most this many guests die")
+    parser.add_argument("--lasts-until", type=parse_clock, default=0, help='the game lasts until at least, e.g. "9pm"')
+    parser.add_argument("--ends-by", type=parse_clock, default=None, help='the game is over by, e.g. "8:30pm"')
+    parser.add_argument("--weapon", action="append", default=[], help="item used as a murder weapon (repeatable)")
+    parser.add_argument("--murderer", default=None, help="name of the murderer")
+    parser.add_argument("--limit", type=int, default=None, help="stop after this many matches")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="games handed to a worker at once")
+    parser.add_argument(
+        "--alias", action="store_true", help="sample doors from alias tables (faster, but not the students' games)"
+    )
+    args = parser.parse_args(argv)
+
+    constraints = Constraints(
+        min_victims=args.min_victims,
+        max_victims=args.max_victims,
+        min_time=args.lasts_until,
+        max_time=args.ends_by,
+        weapons=tuple(args.weapon),
+        murderer=args.murderer,
+    )
+    cases = parse_case_numbers(args.cases)
+    matches = search(
+        cases, constraints, workers=args.workers, chunk_size=args.chunk_size, alias=args.alias, limit=args.limit
+    )
+    for summary in matches:
+        sys.stdout.write(json.dumps(summary._asdict()) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+import argparse
+import asyncio
+import itertools
+import multiprocessing
+import os
+import re
+import sys
+import typing
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from murder.batch import is_case_number
+from murder.main import MurderMystery
+from murder.questions import make_worksheet, write_answers
+from murder.utils import ScriptRenderer, valid_case_number
+
+# Sent to the client in place of clearing the terminal
+CLEAR = "\x1b[2J\x1b[H"
+CASE_NUMBER_REQUEST = 'Please enter your "case number":'
+INTRO_REQUEST = "Print Intro? (y/N)"
+
+
+def prepare_game(case_number: str, intro: bool) -> tuple[list[tuple[str, typing.Any]], list[str]]:
+    """
+    Plays a game without pausing, keeping everything it shows for later.
+    This is the part of a session that runs off the event loop.
+
+    :param case_number: The student's case number
+    :param intro: Whether to show the intro
+    :returns: (the game's ScriptRenderer steps, the questions to ask)
+    """
+    renderer = ScriptRenderer()
+    game = MurderMystery(case_number, intro, renderer)
+    game.play_game()
+    return renderer.steps, make_worksheet(game.mansion).questions()
+
+
+def answers_path(answers_dir: str, case_number: str, session: int) -> str:
+    """
+    :param answers_dir: Folder the answers files go in
+    :param case_number: The student's case number, as they typed it
+    :param session: Number of the session, to tell apart sessions with the same case number
+    :returns: Path of the session's answers file, which is always inside answers_dir
+    :raises ValueError: If the file would end up outside answers_dir anyway (through a symlink)
+    """
+    # Case numbers are whatever the client sent, so only letters, digits, _ and - make it into the file name
+    name = re.sub(r"[^\w-]", "_", case_number)
+    folder = os.path.realpath(answers_dir)
+    path = os.path.realpath(os.path.join(folder, f"{name}-{session}.out"))
+    if os.path.dirname(path) != folder:
+        raise ValueError(f"The answers file for case {case_number!r} would be outside {answers_dir}")
+    return path
+
+
+class GameServer:
+    """
+    Runs many games at once, one session per connection, speaking plain
+    text lines: everything main.py would print is sent to the client, and
+    every line the client sends is an answer to the last prompt.
+
+    Sessions only ever wait on the event loop (for the client, or to pause
+    for effect). Games are simulated on an executor (a process pool unless
+    told otherwise), all at once before anything is shown, and what they
+    show is then played back with the pauses as asyncio sleeps.
+    """
+
+    def __init__(
+        self,
+        *,
+        speed: float = 1.0,
+        answers_dir: typing.Optional[str] = None,
+        timeout: typing.Optional[float] = None,
+        executor: typing.Optional[Executor] = None,
+    ) -> None:
+        """
+        :param speed: Pauses are divided by this (0 doesn't pause at all)
+        :param answers_dir: Folder to write every session's answers file to (not written if None)
+        :param timeout: Seconds to wait for the client to answer before giving up on the session
+        :param executor: Where games are simulated, a process pool of the server's own if None
+        """
+        self.speed = speed
+        self.answers_dir = answers_dir
+        self.timeout = timeout
+        self.own_executor = executor is None  # Shut down by close()
+        if executor is None:
+            # Forked workers would keep a copy of every open connection, so clients wouldn't see them close
+            executor = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+        self.executor = executor
+        self.sessions = itertools.count(1)
+        self.active = 0
+
+    async def ask(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, prompt: str) -> str:
+        """
+        :param prompt: Shown before waiting for the answer
+        :returns: The client's answer (without surrounding whitespace)
+        :raises ConnectionError: If the client hung up instead of answering
+        :raises ValueError: If the answer is longer than the reader's limit
+        """
+        writer.write(f"{prompt}\n".encode())
+        await writer.drain()
+        try:
+            line = await asyncio.wait_for(reader.readline(), self.timeout)
+        except ValueError:
+            raise ValueError("That answer is too long.") from None
+        if not line:
+            raise ConnectionError("The client hung up")
+        return line.decode(errors="replace").strip()
+
+    async def play_back(self, writer: asyncio.StreamWriter, steps: list[tuple[str, typing.Any]]) -> None:
+        """
+        Sends what a ScriptRenderer kept to the client, pausing between steps
+        """
+        for kind, value in steps:
+            if kind == "print":
+                writer.write(value.encode())
+            elif kind == "clear":
+                writer.write(CLEAR.encode())
+            elif self.speed > 0:
+                await writer.drain()
+                await asyncio.sleep(value / 1000 / self.speed)
+        await writer.drain()
+
+    async def session(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        One student's game: case entry, the intro, the game, then the questions
+        """
+        session = next(self.sessions)
+        self.active += 1
+        try:
+            writer.write(CLEAR.encode())
+            case_number = await self.ask(reader, writer, CASE_NUMBER_REQUEST)
+            # Only numbers make it to the executor (a blank case number can't even seed a game)
+            if not valid_case_number(case_number) or not is_case_number(case_number):
+                writer.write(b"That is not a valid case number.\n")
+                return
+            intro = (await self.ask(reader, writer, INTRO_REQUEST)).lower().startswith("y")
+
+            loop = asyncio.get_running_loop()
+            steps, questions = await loop.run_in_executor(self.executor, prepare_game, case_number, intro)
+            await self.play_back(writer, steps)
+
+            answers = []
+            for i, question in enumerate(questions):
+                answers.append(await self.ask(reader, writer, f"Question {i + 1} / {len(questions)}\n{question}"))
+                writer.write(CLEAR.encode())
+            if self.answers_dir is not None:
+                path = answers_path(self.answers_dir, case_number, session)
+                await loop.run_in_executor(self.executor, write_answers, case_number, answers, path)
+            writer.write(b"Your answers have been recorded.\n")
+        except (ConnectionError, asyncio.TimeoutError):
+            pass
+        except ValueError as error:
+            # Tell the client why the session ends, rather than leaving the error to the event loop
+            writer.write(f"{error}\n".encode())
+        finally:
+            self.active -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def start(
+        self, host: str = "127.0.0.1", port: int = 0, *, path: typing.Optional[str] = None
+    ) -> asyncio.Server:
+        """
+        :param host: Interface to listen on
+        :param port: TCP port to listen on (0 picks a free one)
+        :param path: Listen on this Unix socket instead of TCP
+        :returns: The listening server
+        """
+        if path is not None:
+            return await asyncio.start_unix_server(self.session, path)
+        return await asyncio.start_server(self.session, host, port)
+
+    def close(self) -> None:
+        """
+        Shuts down the process pool games are simulated on, if the server made it
+        """
+        if self.own_executor:
+            self.executor.shutdown()
+
+
+async def connect(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    *,
+    path: typing.Optional[str] = None,
+    lines: typing.Optional[typing.Iterable[str]] = None,
+    output: typing.TextIO = sys.stdout,
+) -> None:
+    """
+    A client that stands in for the terminal: whatever the server sends is
+    written to output, and every line typed (or given) is sent to the server
+
+    :param host: Server host
+    :param port: Server port
+    :param path: Connect to this Unix socket instead of TCP
+    :param lines: Send these lines instead of what is typed on stdin
+    :param output: Where to write what the server sends
+    """
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+
+    async def send() -> None:
+        if lines is not None:
+            for line in lines:
+                writer.write(f"{line}\n".encode())
+        else:
+            loop = asyncio.get_running_loop()
+            while line := await loop.run_in_executor(None, sys.stdin.readline):
+                writer.write(line.encode())
+                await writer.drain()
+        await writer.drain()
+
+    sender = asyncio.create_task(send())
+    while data := await reader.read(4096):
+        output.write(data.decode(errors="replace"))
+        output.flush()
+    sender.cancel()
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except ConnectionError:
+        pass
+
+
+async def serve_forever(server: GameServer, host: str, port: int, path: typing.Optional[str]) -> None:
+    listening = await server.start(host, port, path=path)
+    try:
+        async with listening:
+            await listening.serve_forever()
+    finally:
+        server.close()
+
+
+def main(argv: typing.Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve murder mystery games to many students at once")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="run the game server")
+    connect_parser = commands.add_parser("connect", help="play on a game server from this terminal")
+    for command in (serve_parser, connect_parser):
+        command.add_argument("--host", default="127.0.0.1", help="interface/host (default: 127.0.0.1)")
+        command.add_argument("--port", type=int, default=4242, help="TCP port (default: 4242)")
+        command.add_argument("--unix", default=None, help="use this Unix socket instead of TCP")
+    serve_parser.add_argument("--speed", type=float, default=1.0, help="pauses are divided by this (0: no pauses)")
+    serve_parser.add_argument("--answers", default=None, help="folder to write every session's answers to")
+    serve_parser.add_argument("--timeout", type=float, default=None, help="seconds to wait for an answer")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        server = GameServer(speed=args.speed, answers_dir=args.answers, timeout=args.timeout)
+        asyncio.run(serve_forever(server, args.host, args.port, args.unix))
+    else:
+        asyncio.run(connect(args.host, args.port, path=args.unix))
+
+
+if __name__ == "__main__":
+    main()
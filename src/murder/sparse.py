@@ -0,0 +1,253 @@
+import random
+import typing
+
+from murder.catalog import RoomTemplate, get_catalog
+from murder.item import Item
+from murder.procedural import ProceduralMansion, copy_name
+from murder.room import Room
+
+
+def shuffled(rng: random.Random, n: int) -> typing.Iterator[int]:
+    """
+    Yields range(n) in random order, one number at a time. Drawn numbers are
+    swapped out of the way like in a Fisher-Yates shuffle, but only the swaps
+    are stored, so drawing k numbers takes O(k) time and memory however big n is.
+
+    :param rng: The game's random stream
+    :param n: How many numbers to shuffle
+    :returns: Iterator of the numbers
+    """
+    moved: dict[int, int] = {}
+    for left in range(n, 0, -1):
+        i = rng.randrange(left)
+        yield moved.get(i, i)
+        moved[i] = moved.pop(left - 1, left - 1)
+
+
+class SparseColumn(typing.Sequence[Room]):
+    """
+    One column of a SparseRooms, so room_map[x][y] works like it does on a list of lists
+    """
+
+    __slots__ = ("rooms", "x")
+
+    def __init__(self, rooms: "SparseRooms", x: int) -> None:
+        self.rooms = rooms
+        self.x = x
+
+    def __len__(self) -> int:
+        return self.rooms.height
+
+    @typing.overload
+    def __getitem__(self, y: int) -> Room: ...
+
+    @typing.overload
+    def __getitem__(self, y: slice) -> list[Room]: ...
+
+    def __getitem__(self, y: typing.Union[int, slice]) -> typing.Union[Room, list[Room]]:
+        rooms = self.rooms
+        if isinstance(y, slice):
+            return [rooms.room(self.x, i) for i in range(*y.indices(rooms.height))]
+        if 0 <= y < rooms.height:
+            room = rooms.rooms.get(self.x * rooms.height + y)
+            if room is not None:
+                return room
+        return rooms.room(self.x, rooms.check(y, rooms.height))
+
+    def __setitem__(self, y: int, room: Room) -> None:
+        room_id = self.rooms.room_id(self.x, self.rooms.check(y, self.rooms.height))
+        self.rooms.rooms[room_id] = room
+        self.rooms.kept.add(room_id)
+
+    def __iter__(self) -> typing.Iterator[Room]:
+        """
+        Makes every room of the column (a huge mansion is better looked at with SparseRooms.materialized())
+        """
+        return (self.rooms.room(self.x, y) for y in range(self.rooms.height))
+
+
+class SparseRooms(typing.Sequence[SparseColumn]):
+    """
+    Stand-in for a mansion's room_map (list[list[Room]]) that only makes a
+    Room the first time it is looked at, which in a game is when a player
+    enters it or an item spawns in it. Rooms nobody and nothing is in take
+    no memory (see prune()): what a room is follows from its room id alone.
+
+    Room ids are cut into blocks of one room per catalog template. Every
+    block holds each template once, in an order that follows from the
+    block's number, and the block's number tells which copy of the template
+    the room is (see procedural.copy_name()). Door weights and costs are
+    the template's own, shared by every copy.
+    """
+
+    def __init__(self, width: int, height: int, seed: int) -> None:
+        """
+        :param width: Number of rooms along x
+        :param height: Number of rooms along y
+        :param seed: Decides which template every room is
+        """
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.templates = get_catalog().rooms
+        self.room_class = Room  # Rooms are made with this (see murder.instrument)
+        # Room id -> Room, for the rooms made so far (and not pruned since)
+        self.rooms: dict[int, Room] = {}
+        # Ids of the rooms put in with room_map[x][y] = room, which can't be made again
+        self.kept: set[int] = set()
+        self.columns = tuple(SparseColumn(self, x) for x in range(width))
+
+    def __len__(self) -> int:
+        return self.width
+
+    @typing.overload
+    def __getitem__(self, x: int) -> SparseColumn: ...
+
+    @typing.overload
+    def __getitem__(self, x: slice) -> tuple[SparseColumn, ...]: ...
+
+    def __getitem__(self, x: typing.Union[int, slice]) -> typing.Union[SparseColumn, tuple[SparseColumn, ...]]:
+        return self.columns[x]
+
+    def __iter__(self) -> typing.Iterator[SparseColumn]:
+        return iter(self.columns)
+
+    @staticmethod
+    def check(index: int, size: int) -> int:
+        """
+        :returns: index as a list of that size would take it (negative counts from the end)
+        :raises IndexError: If the index is out of range
+        """
+        if not -size <= index < size:
+            raise IndexError("room index out of range")
+        return index % size
+
+    def room_id(self, x: int, y: int) -> int:
+        """
+        :returns: The id of room_map[x][y] (see utils.Grid)
+        """
+        return x * self.height + y
+
+    def template(self, room_id: int) -> tuple[RoomTemplate, int]:
+        """
+        :param room_id: A room's id
+        :returns: (the room's template, which copy of it the room is)
+        """
+        block, slot = divmod(room_id, len(self.templates))
+        order = random.Random((self.seed << 32) + block).sample(range(len(self.templates)), len(self.templates))
+        return self.templates[order[slot]], block
+
+    def room(self, x: int, y: int) -> Room:
+        """
+        :returns: room_map[x][y], made first if nobody looked at it before
+        """
+        room_id = x * self.height + y
+        room = self.rooms.get(room_id)
+        if room is None:
+            template, copy = self.template(room_id)
+            room = self.room_class(copy_name(template.name, copy), template.door_weights, template.door_costs)
+            self.rooms[room_id] = room
+        return room
+
+    def peek(self, x: int, y: int) -> typing.Optional[Room]:
+        """
+        :returns: room_map[x][y] if it was made already, None if not (without making it)
+        """
+        return self.rooms.get(x * self.height + y)
+
+    def materialized(self) -> typing.Iterator[tuple[int, Room]]:
+        """
+        :returns: Iterator of (room id, Room) for every room made so far
+        """
+        return iter(list(self.rooms.items()))
+
+    def prune(self) -> None:
+        """
+        Forgets the rooms nobody (dead or alive) and nothing is in, except the
+        kept ones. They are made again, the same as new, if looked at later.
+        """
+        empty = [
+            room_id
+            for room_id, room in self.rooms.items()
+            if not room.occupants and not room.items and room_id not in self.kept
+        ]
+        for room_id in empty:
+            del self.rooms[room_id]
+
+
+class SparseMansion(ProceduralMansion):
+    """
+    A ProceduralMansion whose room_map is a SparseRooms, for mansions too big
+    to build every room of. Memory grows with the rooms players and items
+    are in, not with the size of the mansion.
+
+    Items don't spawn by walking every room: `items` rooms are picked at
+    random instead (see shuffled()), each spawning its template's item.
+    Anything that needs every room at once (a DoorTable, snapshots, an
+    EventLog) still works, but makes every room.
+    """
+
+    def __init__(
+        self, case_number: str, *, width: int, height: int, guests: int, items: typing.Optional[int] = None, **kwargs
+    ) -> None:
+        """
+        :param items: Number of items to spawn (besides the revolver), one per guest if None
+        :param kwargs: See ProceduralMansion
+        """
+        self.item_count = guests if items is None else items
+        super().__init__(case_number, width=width, height=height, guests=guests, **kwargs)
+
+    def generate_rooms(self) -> SparseRooms:
+        """
+        :returns: A width x height SparseRooms, with The Foyer on one of its edges and everybody in it
+        """
+        mansion = SparseRooms(self.width, self.height, self.rng.getrandbits(32))
+        x, y = self.place_foyer(mansion)
+        self.enter_players(mansion, x, y)
+        return mansion
+
+    def spawn_items(self) -> list[Item]:
+        """
+        Spawns items in `item_count` random rooms (fewer if the mansion runs out of rooms with items)
+
+        :returns: List of created items
+        """
+        catalog = get_catalog()
+        room_map: SparseRooms = typing.cast(SparseRooms, self.room_map)
+        items: list[Item] = []
+        for room_id in shuffled(self.rng, self.width * self.height):
+            if len(items) >= self.item_count:
+                break
+            x, y = divmod(room_id, self.height)
+            foyer = room_map.peek(x, y)
+            if foyer is not None and foyer.get_room_name() == "The Foyer":
+                continue
+            template, copy = room_map.template(room_id)
+            item_template = catalog.item_by_location.get(template.name)
+            if item_template is None:
+                continue
+            current_room = room_map.room(x, y)
+            item = Item(copy_name(item_template.item_name, copy))
+            item.set_location(current_room.get_room_name())
+            current_room.add_item(item)
+            items.append(item)
+
+        revolver = Item("Revolver")
+        self.players[self.murderer].pick_up_item(revolver)
+        items.append(revolver)
+        return items
+
+    def next_turn(self) -> bool:
+        """
+        Plays a turn like Mansion.next_turn(), then forgets the rooms everybody left (see SparseRooms.prune())
+
+        :returns: True if the game is not over after the turn
+        """
+        playing = super().next_turn()
+        if isinstance(self.room_map, SparseRooms):
+            self.room_map.prune()
+        return playing
+
+
+if __name__ == "__main__":
+    print("🔍 Hint: To start the investigation, you need to run `main.py`, not this file.")
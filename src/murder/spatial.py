@@ -0,0 +1,105 @@
+import typing
+
+from murder.utils import shared_grid
+
+
+class SpatialIndex:
+    """
+    Grid-bucketed index of where the living players are, used by the murderer
+    to find the closest player without checking every player in the game.
+
+    The mansion is cut into square cells of cell_size x cell_size rooms, each
+    holding the indexes of the players inside it (cells are only made once
+    someone enters them, so a huge mansion costs no more than its players).
+    A nearest player query searches rings of cells outwards from the query
+    room, and stops as soon as no cell left could hold a player at least as
+    close as the best one so far.
+    """
+
+    def __init__(self, width: int, height: int, cell_size: int = 4) -> None:
+        """
+        :param width: Number of rooms along x (len(room_map))
+        :param height: Number of rooms along y (len(room_map[0]))
+        :param cell_size: Width/height of a cell, in rooms
+        """
+        self.cell_size = cell_size
+        self.cols = -(-width // cell_size)
+        self.rows = -(-height // cell_size)
+        # Cell number -> players in the cell, for the cells anyone has been in
+        self.cells: dict[int, set[int]] = {}
+        # Player index -> (x, y) room, for every player in the index
+        self.where: dict[int, tuple[int, int]] = {}
+        self.grid = shared_grid(width, height)  # Numbers the mansion's rooms, see utils.Grid
+
+    def cell(self, x: int, y: int) -> set[int]:
+        number = (x // self.cell_size) * self.rows + y // self.cell_size
+        cell = self.cells.get(number)
+        if cell is None:
+            cell = self.cells[number] = set()
+        return cell
+
+    def place(self, player: int, x: int, y: int) -> None:
+        """
+        Adds a player to the index, or moves them if they are already in it
+
+        :param player: Index of the player in mansion.players
+        :param x: x coordinate of the player's room
+        :param y: y coordinate of the player's room
+        """
+        self.remove(player)
+        self.where[player] = (x, y)
+        self.cell(x, y).add(player)
+
+    def remove(self, player: int) -> None:
+        """
+        Removes a player from the index (does nothing if they are not in it)
+
+        :param player: Index of the player in mansion.players
+        """
+        room = self.where.pop(player, None)
+        if room is not None:
+            self.cell(room[0], room[1]).discard(player)
+
+    def __len__(self) -> int:
+        return len(self.where)
+
+    def nearest(self, x: int, y: int, exclude: typing.Collection[int] = ()) -> int:
+        """
+        Finds the player closest to a room. Ties go to the lowest player index,
+        the same player Person.pursue() picks when checking every player.
+
+        :param x: x coordinate of the room
+        :param y: y coordinate of the room
+        :param exclude: Indexes of players to ignore (Person.pursue() skips everyone with the murderer's name)
+        :returns: Index of the closest player, -1 if there is nobody else
+        """
+        cx, cy = x // self.cell_size, y // self.cell_size
+        last_ring = max(cx, self.cols - 1 - cx, cy, self.rows - 1 - cy)
+        best, best_distance = -1, 0
+
+        for ring in range(last_ring + 1):
+            # Every room in this ring of cells is at least `reach` rooms away along x or y
+            reach = (ring - 1) * self.cell_size + 1
+            if best >= 0 and ring > 0 and reach * reach > best_distance:
+                break
+
+            for i in range(max(cx - ring, 0), min(cx + ring, self.cols - 1) + 1):
+                # Only the edges of the ring: every row for its first and last
+                # column, just the top and bottom rows for the columns between
+                if abs(i - cx) == ring:
+                    rows = range(max(cy - ring, 0), min(cy + ring, self.rows - 1) + 1)
+                else:
+                    rows = [j for j in (cy - ring, cy + ring) if 0 <= j < self.rows]
+                for j in rows:
+                    for player in self.cells.get(i * self.rows + j, ()):
+                        if player in exclude:
+                            continue
+                        px, py = self.where[player]
+                        distance = (px - x) ** 2 + (py - y) ** 2
+                        if best < 0 or distance < best_distance or (distance == best_distance and player < best):
+                            best, best_distance = player, distance
+        return best
+
+
+if __name__ == "__main__":
+    print("🔍 Hint: To start the investigation, you need to run `main.py`, not this file.")
@@ -0,0 +1,604 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import typing
+
+from murder.config import TIME_MINUTE_INCREMENTS
+from murder.dice import Dice
+from murder.mansion import Mansion
+from murder.person import Person
+from murder.room import Room
+from murder.sparse import SparseMansion, SparseRooms
+from murder.spatial import SpatialIndex
+from murder.utils import Coordinates, DoorCosts, DoorWeights
+
+# (door weights, door costs) of a room
+Doors = tuple[DoorWeights, DoorCosts]
+
+
+class Traveler(typing.NamedTuple):
+    """
+    A player going from one tile to another between turns
+    """
+
+    player: int
+    room_id: int
+    holds: int  # Index of the held item in mansion.items, -1 for nothing
+
+
+class TileReport(typing.NamedTuple):
+    """
+    What happened in one tile during one turn
+    """
+
+    # (player, room id) for every player of the tile who ended the turn in another room of the tile
+    moved: list[tuple[int, int]]
+    # Players who walked into another tile's room, to be handed over before the next turn
+    travelers: list[Traveler]
+    # (victim, item used as the murder weapon, -1 for none)
+    kills: list[tuple[int, int]]
+    cool_down: int
+
+
+class TileState(typing.NamedTuple):
+    """
+    Everything a tile holds, to write back into the Mansion when the game is done
+    """
+
+    # Player -> (room id, alive, held item) for every player in the tile
+    players: dict[int, tuple[int, bool, int]]
+    # Room id -> players in the room, in the order they came in
+    occupants: dict[int, list[int]]
+    # Room id -> items lying in the room
+    room_items: dict[int, list[int]]
+
+
+def columns_of(tile: int, tiles: int, width: int) -> range:
+    """
+    :returns: The x coordinates of the rooms a tile owns (tiles are strips of whole columns)
+    """
+    return range(tile * width // tiles, (tile + 1) * width // tiles)
+
+
+class Tile:
+    """
+    The rooms of a strip of columns of the mansion, and the players in them.
+    Turns are played like Mansion.next_turn() plays them, only for the
+    players in the tile (in the same order), with the tile's own random stream.
+
+    A player who walks into a room of another tile stops there for the rest
+    of the turn (no second try, no item pickup/drop/swap): they are handed
+    over as a Traveler, and play on in the other tile from the next turn on.
+    Murders only ever happen between players in the same room, so they never
+    need more than one tile. The murderer pursues a target chosen by the
+    TiledGame at the start of the turn.
+    """
+
+    def __init__(
+        self,
+        index: int,
+        columns: range,
+        dim: tuple[int, int],
+        murderer: int,
+        num_players: int,
+        marked: set[int],
+        layout: typing.Optional[tuple[int, int, int]] = None,
+    ) -> None:
+        """
+        :param index: Number of the tile
+        :param columns: x coordinates of the rooms the tile owns
+        :param dim: Dimensions of the mansion
+        :param murderer: Index of the murderer in mansion.players
+        :param num_players: Number of players in the game
+        :param marked: Items that are murder weapons already
+        :param layout: (width, height, seed) of the SparseRooms to take the doors of
+            rooms missing from `doors` from, if the mansion is sparse
+        """
+        self.index = index
+        self.columns = columns
+        self.dim = dim
+        self.height = dim[1]
+        self.murderer = murderer
+        self.num_players = num_players
+        self.marked = marked
+        self.layout = None if layout is None else SparseRooms(*layout)
+        self.doors: dict[int, Doors] = {}  # Room id -> (door weights, door costs), filled in by the game
+        self.where: dict[int, int] = {}  # Player -> room id
+        self.alive: dict[int, bool] = {}
+        self.holds: dict[int, int] = {}  # Player -> held item, -1 for nothing
+        self.occupants: dict[int, list[int]] = {}
+        self.room_items: dict[int, list[int]] = {}
+        self.walker = Person("Walker")  # Goes through doors and attacks for every player, see door()
+
+    def owns(self, room_id: int) -> bool:
+        return room_id // self.height in self.columns
+
+    def doors_of(self, room_id: int) -> Doors:
+        """
+        :returns: (door weights, door costs) of a room, from `doors` or else the sparse layout
+        :raises ValueError: If the room isn't in `doors` and the mansion isn't sparse
+        """
+        doors = self.doors.get(room_id)
+        if doors is None:
+            if self.layout is None:
+                raise ValueError(f"Tile {self.index} doesn't know the doors of room {room_id} (and has no layout)")
+            template, _ = self.layout.template(room_id)
+            doors = self.doors[room_id] = (template.door_weights, template.door_costs)
+        return doors
+
+    def enter(self, player: int, room_id: int, alive: bool, holds: int) -> None:
+        """
+        Puts a player in one of the tile's rooms
+        """
+        self.where[player] = room_id
+        self.alive[player] = alive
+        self.holds[player] = holds
+        self.occupants.setdefault(room_id, []).append(player)
+
+    def leave(self, player: int) -> None:
+        """
+        Takes a player out of their room (and out of the tile)
+        """
+        room = self.occupants[self.where[player]]
+        room.remove(player)
+        if not room:
+            del self.occupants[self.where[player]]
+
+    def alive_in(self, room_id: int) -> int:
+        return sum(self.alive[p] for p in self.occupants.get(room_id, ()))
+
+    def door(self, player: int, moves: int, rng: Dice) -> tuple[int, int]:
+        """
+        Moves a player through a random door of their room, like Person.choose_door()
+
+        :returns: (room id the player ends up in, moves left)
+        """
+        room_id = self.where[player]
+        weights, costs = self.doors_of(room_id)
+        self.walker.set_moves(moves)
+        x, y = self.walker.choose_door(
+            list(weights), list(costs), Coordinates(*divmod(room_id, self.height)), self.dim, rng
+        )
+        return x * self.height + y, self.walker.get_moves()
+
+    def pursue(self, player: int, target: typing.Optional[tuple[int, int]]) -> int:
+        """
+        Steps a player towards a room, like Person.pursue()
+
+        :returns: Room id the player ends up in
+        """
+        x, y = divmod(self.where[player], self.height)
+        if target is not None:
+            if x < target[0]:
+                x += 1
+            elif x > target[0]:
+                x -= 1
+            elif y < target[1]:
+                y += 1
+            elif y > target[1]:
+                y -= 1
+        return x * self.height + y
+
+    def play_turn(
+        self,
+        seed: int,
+        time_val: int,
+        cool_down: int,
+        target: typing.Optional[tuple[int, int]],
+        marked: list[int],
+        arrivals: list[Traveler],
+    ) -> TileReport:
+        """
+        Plays one turn of every living player in the tile
+
+        :param seed: The game's seed (the tile's random stream follows from it, the turn and the tile)
+        :param time_val: The turn's time_val
+        :param cool_down: The murderer's cool_down
+        :param target: Room the murderer pursues, None if there's nobody to pursue
+        :param marked: Items that became murder weapons since the last turn
+        :param arrivals: Players handed over to the tile since the last turn, by player index
+        :returns: What happened during the turn
+        """
+        rng = Dice(f"{seed}:{time_val}:{self.index}")
+        self.marked.update(marked)
+        for traveler in arrivals:
+            self.enter(traveler.player, traveler.room_id, True, traveler.holds)
+        start = dict(self.where)
+        travelers: list[Traveler] = []
+        kills: list[tuple[int, int]] = []
+
+        # Each player gets a turn, ending with the murderer
+        first = self.murderer + 1
+        order = sorted((p for p in self.where if self.alive[p]), key=lambda p: (p - first) % self.num_players)
+        for p in order:
+            if not self.alive[p]:
+                continue
+            player_item = self.holds[p]
+            moves = rng.randint(3, 7)
+            gone = False
+            for tried in range(2):
+                if moves <= 0:
+                    break
+                room_id = self.where[p]
+                if p == self.murderer:
+                    murderer_should_attack = (
+                        self.walker.attack(time_val, cool_down, rng.randint(0, 99) == 0)
+                        and player_item >= 0
+                        and player_item not in self.marked
+                    )
+                    if self.alive_in(room_id) == 2 and murderer_should_attack:
+                        victim = next(v for v in self.occupants[room_id] if v != p and self.alive[v])
+                        self.alive[victim] = False
+                        self.marked.add(player_item)
+                        kills.append((victim, player_item))
+                        cool_down = time_val + rng.randint(1, 3) * 5
+                    if cool_down > time_val:
+                        destination, moves = self.door(p, moves, rng)
+                    else:
+                        destination = self.pursue(p, target)
+                else:
+                    destination, moves = self.door(p, moves, rng)
+
+                self.leave(p)
+                if not self.owns(destination):
+                    travelers.append(Traveler(p, destination, self.holds.pop(p)))
+                    del self.where[p], self.alive[p]
+                    gone = True
+                    break
+                self.where[p] = destination
+                self.occupants.setdefault(destination, []).append(p)
+            if not gone:
+                self.items_turn(p, player_item, rng)
+
+        moved = [(p, room_id) for p, room_id in self.where.items() if start.get(p) != room_id]
+        return TileReport(moved=moved, travelers=travelers, kills=kills, cool_down=cool_down)
+
+    def items_turn(self, p: int, player_item: int, rng: Dice) -> None:
+        """
+        Picks up, drops or swaps a player's item, like Mansion.next_turn()
+
+        :param p: The player
+        :param player_item: What the player held at the start of their turn
+        """
+        room_id = self.where[p]
+        room_items = self.room_items.setdefault(room_id, [])
+        is_murderer = p == self.murderer
+        if player_item >= 0 and not room_items:
+            if is_murderer and player_item in self.marked:
+                room_items.append(player_item)
+                self.holds[p] = -1
+            elif not is_murderer and rng.randint(0, 19) == 0:
+                room_items.append(player_item)
+                self.holds[p] = -1
+        elif player_item < 0 and room_items:
+            if rng.randint(0, 4) != 0 and room_items[0] not in self.marked:
+                self.holds[p] = room_items.pop(0)
+        elif player_item >= 0 and room_items:
+            if is_murderer and player_item in self.marked:
+                if room_items[0] not in self.marked:
+                    room_items.append(player_item)
+                    self.holds[p] = room_items.pop(0)
+            elif not is_murderer and rng.randint(0, 1) == 0:
+                if room_items[0] not in self.marked:
+                    picked_up_item = room_items.pop(0)
+                    room_items.append(player_item)
+                    self.holds[p] = picked_up_item
+        if not room_items:
+            del self.room_items[room_id]
+
+    def state(self) -> TileState:
+        """
+        :returns: Everything the tile holds
+        """
+        return TileState(
+            players={p: (room_id, self.alive[p], self.holds[p]) for p, room_id in self.where.items()},
+            occupants={room_id: list(players) for room_id, players in self.occupants.items()},
+            room_items={room_id: list(items) for room_id, items in self.room_items.items()},
+        )
+
+
+def serve_tile(connection: typing.Any, tile: Tile) -> None:
+    """
+    Worker process of a tile: calls the tile's methods for the TiledGame until told to stop
+
+    :param connection: This end of the pipe to the TiledGame
+    :param tile: The tile the worker owns
+    """
+    while (message := connection.recv()) is not None:
+        name, args = message
+        connection.send(getattr(tile, name)(*args))
+    connection.close()
+
+
+class LocalTile:
+    """
+    A tile played in the TiledGame's own process, with the same interface as a TileProcess
+    """
+
+    def __init__(self, tile: Tile) -> None:
+        self.tile = tile
+        self.result: typing.Any = None
+
+    def send(self, name: str, *args) -> None:
+        self.result = getattr(self.tile, name)(*args)
+
+    def recv(self) -> typing.Any:
+        return self.result
+
+    def close(self) -> None:
+        pass
+
+
+class TileProcess:
+    """
+    A tile played in a worker process of its own
+    """
+
+    def __init__(self, tile: Tile) -> None:
+        self.connection, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=serve_tile, args=(child, tile), daemon=True)
+        self.process.start()
+        child.close()
+
+    def send(self, name: str, *args) -> None:
+        self.connection.send((name, args))
+
+    def recv(self) -> typing.Any:
+        return self.connection.recv()
+
+    def close(self) -> None:
+        self.connection.send(None)
+        self.process.join()
+        self.connection.close()
+
+
+def rooms_in(room_map: typing.Any) -> typing.Iterator[tuple[int, Room]]:
+    """
+    :returns: Iterator of (room id, Room) for every room of a room_map (only the ones made so far if it's sparse)
+    """
+    if isinstance(room_map, SparseRooms):
+        yield from room_map.materialized()
+        return
+    height = len(room_map[0])
+    for x, column in enumerate(room_map):
+        for y, room in enumerate(column):
+            yield x * height + y, room
+
+
+class TiledGame:
+    """
+    Plays one (huge) game on many processes at once. The mansion is cut into
+    tiles, strips of whole columns, each owned by a worker process that plays
+    the turns of the players in its rooms (see Tile). Between turns, players
+    who walked into another tile are handed over to it, and everything that
+    concerns the whole game is merged here, always in tile order: kills, the
+    alive count, the murderer's cool_down and who the murderer pursues.
+
+    The starting state is copied from a Mansion, but turns draw from one
+    random stream per tile and turn, so games are statistically (not exactly)
+    the same as Mansion.next_turn()'s, and the same for a given seed and number
+    of tiles however the worker processes are scheduled.
+    """
+
+    def __init__(
+        self, mansion: Mansion, tiles: int, *, seed: typing.Optional[int] = None, processes: bool = True
+    ) -> None:
+        """
+        :param mansion: The mansion to play, which write_back() updates at the end
+        :param tiles: Number of tiles (at most one per column)
+        :param seed: Seed of the tiles' random streams, drawn from mansion.rng if None
+        :param processes: Play every tile in a worker process of its own, or all of them in this process
+        """
+        self.mansion = mansion
+        room_map = mansion.get_rooms()
+        self.width, self.height = len(room_map), len(room_map[0])
+        self.tiles = max(1, min(tiles, self.width))
+        self.seed = mansion.rng.getrandbits(64) if seed is None else seed
+        self.time_val = mansion.time_val
+        self.cool_down = mansion.cool_down
+        self.end = mansion.end
+        self.start = mansion.start
+
+        players, items = mansion.get_players(), mansion.get_items()
+        item_index = {id(item): i for i, item in enumerate(items)}
+        self.murderer = mansion.murderer
+        # The murderer never pursues anyone with their own name, see Mansion.pursue()
+        self.spared = mansion.namesakes[players[self.murderer].get_name()]
+        self.where = [p.room_id for p in players]
+        self.alive = [p.is_alive() for p in players]
+        self.num_alive = sum(self.alive)
+        self.marked = [item.is_marked() for item in items]
+        self.new_marked: list[int] = []
+        self.spatial_index = SpatialIndex(self.width, self.height)
+        for p, room_id in enumerate(self.where):
+            if self.alive[p]:
+                self.spatial_index.place(p, *divmod(room_id, self.height))
+        self.owner = [t for t in range(self.tiles) for _ in columns_of(t, self.tiles, self.width)]
+        self.arrivals: list[list[Traveler]] = [[] for _ in range(self.tiles)]
+        # Rooms that had someone or something in them at the start, emptied by write_back()
+        self.used_rooms: list[Room] = []
+
+        layout = None
+        if isinstance(room_map, SparseRooms):
+            layout = (room_map.width, room_map.height, room_map.seed)
+        marked = {i for i, is_marked in enumerate(self.marked) if is_marked}
+        dim = (self.width, self.height)
+        tiles_made = [
+            Tile(t, columns_of(t, self.tiles, self.width), dim, self.murderer, len(players), set(marked), layout)
+            for t in range(self.tiles)
+        ]
+        for room_id, room in rooms_in(room_map):
+            tile = tiles_made[self.owner[room_id // self.height]]
+            tile.doors[room_id] = (tuple(room.get_door_weights()), tuple(room.get_door_costs()))
+            if room.get_items():
+                tile.room_items[room_id] = [item_index[id(item)] for item in room.get_items()]
+            if room.occupants or room.get_items():
+                self.used_rooms.append(room)
+        # Rooms list people by name (see Room.remove_player()), so players enter the tiles by where they are
+        for p, player in enumerate(players):
+            held = player.get_holds()
+            tile = tiles_made[self.owner[player.room_id // self.height]]
+            tile.enter(p, player.room_id, player.is_alive(), -1 if held is None else item_index[id(held)])
+
+        self.links = [TileProcess(tile) if processes else LocalTile(tile) for tile in tiles_made]
+
+    def murderer_wins(self) -> bool:
+        """
+        :returns: True if the murderer is the last alive
+        """
+        return self.num_alive == 1 and self.alive[self.murderer]
+
+    def target(self) -> typing.Optional[tuple[int, int]]:
+        """
+        :returns: Room of the living player closest to the murderer, None if there is nobody
+        """
+        mx, my = divmod(self.where[self.murderer], self.height)
+        victim = self.spatial_index.nearest(mx, my, exclude=self.spared)
+        return None if victim < 0 else divmod(self.where[victim], self.height)
+
+    def next_turn(self) -> bool:
+        """
+        Plays one turn on every tile at once, then merges what happened
+
+        :returns: True if the game is not over after the turn
+        """
+        if self.murderer_wins():
+            self.end = self.time_val
+            return False
+
+        target = self.target()
+        murderer_tile = self.owner[self.where[self.murderer] // self.height]
+        for t, link in enumerate(self.links):
+            link.send("play_turn", self.seed, self.time_val, self.cool_down, target, self.new_marked, self.arrivals[t])
+        reports: list[TileReport] = [link.recv() for link in self.links]
+
+        # Merge in tile order, so the outcome never depends on which worker finished first
+        self.new_marked = []
+        self.arrivals = [[] for _ in range(self.tiles)]
+        for t, report in enumerate(reports):
+            for p, room_id in report.moved:
+                self.where[p] = room_id
+                if self.alive[p]:
+                    self.spatial_index.place(p, *divmod(room_id, self.height))
+            for victim, weapon in report.kills:
+                self.alive[victim] = False
+                self.num_alive -= 1
+                self.spatial_index.remove(victim)
+                if weapon >= 0 and not self.marked[weapon]:
+                    self.marked[weapon] = True
+                    self.new_marked.append(weapon)
+            for traveler in report.travelers:
+                self.where[traveler.player] = traveler.room_id
+                self.spatial_index.place(traveler.player, *divmod(traveler.room_id, self.height))
+                self.arrivals[self.owner[traveler.room_id // self.height]].append(traveler)
+            if t == murderer_tile:
+                self.cool_down = report.cool_down
+        for arrivals in self.arrivals:
+            arrivals.sort()
+
+        self.time_val += TIME_MINUTE_INCREMENTS
+        return self.time_val < ((self.end - self.start) * 60)
+
+    def run(self) -> None:
+        """
+        Plays the rest of the game
+        """
+        while self.next_turn():
+            pass
+
+    def write_back(self) -> None:
+        """
+        Puts the state of the game into the mansion (players, rooms, items,
+        time and cool_down), so it can be looked at like any played Mansion.
+        Players handed over between tiles are put in the room they walked into.
+        """
+        mansion = self.mansion
+        players, items = mansion.get_players(), mansion.get_items()
+        for link in self.links:
+            link.send("state")
+        states: list[TileState] = [link.recv() for link in self.links]
+
+        for room in self.used_rooms:
+            room.occupants, room.names, room.alive, room.items = {}, {}, 0, []
+        self.used_rooms = []
+        for item, marked in zip(items, self.marked):
+            item.set_marked(marked)
+        room_map = mansion.get_rooms()
+
+        def room_of(room_id: int) -> Room:
+            x, y = divmod(room_id, self.height)
+            return room_map[x][y]
+
+        for state, arrivals in zip(states, self.arrivals):
+            occupants = {room_id: list(players) for room_id, players in state.occupants.items()}
+            holders = {p: holds for p, (_, _, holds) in state.players.items()}
+            for traveler in arrivals:
+                occupants.setdefault(traveler.room_id, []).append(traveler.player)
+                holders[traveler.player] = traveler.holds
+            for room_id, in_room in occupants.items():
+                room = room_of(room_id)
+                for p in in_room:
+                    players[p].room_id = room_id
+                    players[p].is_alive_flag = self.alive[p]
+                    players[p].holds = None if holders[p] < 0 else items[holders[p]]
+                    room.add_player(players[p])
+                self.used_rooms.append(room)
+            for room_id, room_items in state.room_items.items():
+                room = room_of(room_id)
+                room.items = [items[i] for i in room_items]
+                self.used_rooms.append(room)
+
+        mansion.time_val = self.time_val
+        mansion.cool_down = self.cool_down
+        mansion.end = self.end
+        mansion.num_alive = self.num_alive
+        mansion.spatial_index = self.spatial_index
+        if isinstance(room_map, SparseRooms):
+            room_map.prune()
+
+    def close(self) -> None:
+        """
+        Stops the worker processes
+        """
+        for link in self.links:
+            link.close()
+        self.links = []
+
+    def __enter__(self) -> "TiledGame":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def main(argv: typing.Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Play one huge murder mystery game on many processes at once")
+    parser.add_argument("case", help="case number to seed the mansion with")
+    parser.add_argument("--width", type=int, default=1000, help="rooms along x (default: 1000)")
+    parser.add_argument("--height", type=int, default=1000, help="rooms along y (default: 1000)")
+    parser.add_argument("--guests", type=int, default=5000, help="number of players (default: 5000)")
+    parser.add_argument(
+        "--tiles", type=int, default=os.cpu_count() or 1, help="tiles, one process each (default: CPU count)"
+    )
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    mansion = SparseMansion(args.case, width=args.width, height=args.height, guests=args.guests)
+    with TiledGame(mansion, args.tiles, processes=args.tiles > 1) as game:
+        game.run()
+        game.write_back()
+    summary = {
+        "tiles": game.tiles,
+        "time_val": mansion.time(),
+        "alive": mansion.alive_players(),
+        "weapons": [item.get_item_name() for item in mansion.get_items() if item.is_marked()],
+        "seconds": time.perf_counter() - started,
+    }
+    sys.stdout.write(json.dumps(summary) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import bisect
+import typing
+from array import array
+
+from murder.events import EventKind, EventLog
+from murder.mansion import Mansion
+from murder.utils import Coordinates
+
+
+class Moment(typing.NamedTuple):
+    time: int
+    room: Coordinates
+
+
+class Timeline:
+    """
+    Point-in-time index over a finished game, built from its EventLog.
+
+    For every player it keeps the times they entered a new room, and for every
+    item the times its holder changed. Lookups bisect those arrays, so every
+    query takes O(log turns) and never replays the game.
+
+    "At time T" means after everything that happened during the turn whose
+    time_val was T. Times before the first turn (T < 0) give the start state.
+    """
+
+    def __init__(self, log: EventLog) -> None:
+        num_players = len(log.start_x)
+        num_items = len(log.item_start_holder)
+
+        # Per player: when they entered each room (starting at time -1 in their start room)
+        self.move_times = [array("i", [-1]) for _ in range(num_players)]
+        self.move_x = [array("i", [log.start_x[p]]) for p in range(num_players)]
+        self.move_y = [array("i", [log.start_y[p]]) for p in range(num_players)]
+        self.deaths: list[typing.Optional[Moment]] = [None] * num_players
+
+        # Per item: when its holder changed (-1 while lying in room (x, y))
+        self.holder_times = [array("i", [-1]) for _ in range(num_items)]
+        self.holders = [array("h", [log.item_start_holder[i]]) for i in range(num_items)]
+        self.item_x = [array("i", [log.item_start_x[i]]) for i in range(num_items)]
+        self.item_y = [array("i", [log.item_start_y[i]]) for i in range(num_items)]
+        self.first_grabs: list[typing.Optional[Moment]] = [None] * num_items
+        self.last_grabs: list[typing.Optional[Moment]] = [None] * num_items
+        self.first_drops: list[typing.Optional[Moment]] = [None] * num_items
+        self.last_drops: list[typing.Optional[Moment]] = [None] * num_items
+
+        for i in range(len(log)):
+            kind = log.kind[i]
+            time = log.time[i]
+            player = log.player[i]
+            room = Coordinates(log.x[i], log.y[i])
+            if kind == EventKind.MOVE:
+                self.move_times[player].append(time)
+                self.move_x[player].append(room.x)
+                self.move_y[player].append(room.y)
+            elif kind == EventKind.KILL:
+                self.deaths[player] = Moment(time, room)
+            elif kind == EventKind.GRAB:
+                self.grab(log.item[i], player, time, room)
+            elif kind == EventKind.DROP:
+                self.drop(log.item[i], time, room)
+            elif kind == EventKind.SWAP:
+                self.drop(log.other[i], time, room)
+                self.grab(log.item[i], player, time, room)
+
+        self.death_times = array("i", sorted(d.time for d in self.deaths if d is not None))
+        self.num_players = num_players
+
+    def grab(self, item: int, player: int, time: int, room: Coordinates) -> None:
+        self.set_holder(item, player, time, Coordinates(-1, -1))
+        if self.first_grabs[item] is None:
+            self.first_grabs[item] = Moment(time, room)
+        self.last_grabs[item] = Moment(time, room)
+
+    def drop(self, item: int, time: int, room: Coordinates) -> None:
+        self.set_holder(item, -1, time, room)
+        if self.first_drops[item] is None:
+            self.first_drops[item] = Moment(time, room)
+        self.last_drops[item] = Moment(time, room)
+
+    def set_holder(self, item: int, holder: int, time: int, room: Coordinates) -> None:
+        self.holder_times[item].append(time)
+        self.holders[item].append(holder)
+        self.item_x[item].append(room.x)
+        self.item_y[item].append(room.y)
+
+    def room_of(self, player: int, time: int) -> Coordinates:
+        """
+        :param player: Index of the player in mansion.players
+        :param time: Minutes since the start of the game
+        :returns: The room the player was in at that time
+        """
+        i = bisect.bisect_right(self.move_times[player], time) - 1
+        return Coordinates(self.move_x[player][max(i, 0)], self.move_y[player][max(i, 0)])
+
+    def holder_of(self, item: int, time: int) -> int:
+        """
+        :param item: Index of the item in mansion.items
+        :param time: Minutes since the start of the game
+        :returns: Index of the player holding the item at that time, -1 if nobody was
+        """
+        i = bisect.bisect_right(self.holder_times[item], time) - 1
+        return self.holders[item][max(i, 0)]
+
+    def item_room_at(self, item: int, time: int) -> Coordinates:
+        """
+        :param item: Index of the item in mansion.items
+        :param time: Minutes since the start of the game
+        :returns: The room the item was in at that time (its holder's room if held)
+        """
+        i = max(bisect.bisect_right(self.holder_times[item], time) - 1, 0)
+        holder = self.holders[item][i]
+        if holder >= 0:
+            return self.room_of(holder, time)
+        return Coordinates(self.item_x[item][i], self.item_y[item][i])
+
+    def dead_at(self, time: int) -> int:
+        """
+        :param time: Minutes since the start of the game
+        :returns: Number of players dead at that time
+        """
+        return bisect.bisect_right(self.death_times, time)
+
+    def alive_at(self, time: int) -> int:
+        """
+        :param time: Minutes since the start of the game
+        :returns: Number of players alive at that time (including the murderer)
+        """
+        return self.num_players - self.dead_at(time)
+
+    def death(self, player: int) -> typing.Optional[Moment]:
+        """
+        :returns: When and where the player died, None if they never did
+        """
+        return self.deaths[player]
+
+    def first_grab(self, item: int) -> typing.Optional[Moment]:
+        """
+        :returns: When and where the item was first picked up, None if it never was
+        """
+        return self.first_grabs[item]
+
+    def last_grab(self, item: int) -> typing.Optional[Moment]:
+        """
+        :returns: When and where the item was last picked up, None if it never was
+        """
+        return self.last_grabs[item]
+
+    def first_drop(self, item: int) -> typing.Optional[Moment]:
+        """
+        :returns: When and where the item was first dropped, None if it never was
+        """
+        return self.first_drops[item]
+
+    def last_drop(self, item: int) -> typing.Optional[Moment]:
+        """
+        :returns: When and where the item was last dropped, None if it never was
+        """
+        return self.last_drops[item]
+
+
+def index_game(case_number: str) -> tuple[Mansion, Timeline]:
+    """
+    Plays a game to completion while recording it, then indexes the recording
+
+    :param case_number: The "case number" used to seed the game
+    :returns: The finished mansion and the Timeline over its game
+    """
+    mansion = Mansion(case_number)
+    log = EventLog().attach(mansion)
+    while mansion.next_turn():
+        pass
+    return mansion, Timeline(log)
+
+
+if __name__ == "__main__":
+    print("🔍 Hint: To start the investigation, you need to run `main.py`, not this file.")
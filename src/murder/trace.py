@@ -0,0 +1,401 @@
+import mmap
+import struct
+import typing
+from array import array
+
+from murder.catalog import ItemTemplate, RoomTemplate
+from murder.dice import Dice
+from murder.doors import DOOR_STEPS
+from murder.item import Item
+from murder.mansion import Mansion
+from murder.person import Person
+from murder.room import Room
+from murder.utils import Coordinates, hash
+
+MAGIC = b"MMTR"
+VERSION = 3
+# Door recorded when a player didn't go through any door (0-3 are the doors, see DOOR_STEPS)
+STAY = 4
+# The decision streams, in the order they are stored in a trace file
+STREAMS = ("range_ids", "rolls", "doors", "pursuits")
+
+HEADER = struct.Struct("<4sHIIIIIII")
+LENGTH = struct.Struct("<I")
+STRING = struct.Struct("<H")
+RANGE = struct.Struct("<ii")
+DOORS = struct.Struct("<4d4i")
+ITEM_ROOM = struct.Struct("<i")
+
+
+class Layout(typing.NamedTuple):
+    """
+    How a game was set up, as it was when recorded: the catalog or the way
+    mansions are generated can change without affecting old traces.
+    """
+
+    case_number: str
+    width: int
+    height: int
+    # Per room id (x * height + y)
+    rooms: tuple[RoomTemplate, ...]
+    players: tuple[str, ...]
+    murderer: int
+    # Room id of The Foyer, where everyone starts
+    start: int
+    items: tuple[ItemTemplate, ...]
+    # Per item: room id it starts in, -1 if the murderer starts with it
+    item_rooms: tuple[int, ...]
+
+
+class Trace(typing.NamedTuple):
+    """
+    Every decision a game left to chance, each stream in the order the
+    decisions were made.
+
+    Streams are byte-sized values: the number randint() rolled for each
+    decision (rolls) and which of the ranges it was rolled in (range_ids),
+    the doors players took (STAY if none was), and the doors the murderer
+    took while pursuing someone.
+    """
+
+    layout: Layout
+    # randint(a, b) ranges the game rolled in, range_ids are indexes into this
+    ranges: tuple[tuple[int, int], ...]
+    range_ids: typing.Sequence[int]
+    rolls: typing.Sequence[int]
+    doors: typing.Sequence[int]
+    pursuits: typing.Sequence[int]
+
+
+def door_taken(before: typing.Sequence[int], after: typing.Sequence[int]) -> int:
+    """
+    :param before: (x, y) room a player went through a door from
+    :param after: (x, y) room they ended up in
+    :returns: The door they took, STAY if they didn't move
+    """
+    step = (after[0] - before[0], after[1] - before[1])
+    return STAY if step == (0, 0) else DOOR_STEPS.index(step)
+
+
+class RecordingDice(Dice):
+    """
+    Draws like Dice, and keeps every decision in its Trace streams
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.ranges: dict[tuple[int, int], int] = {}
+        self.streams = {name: array("B") for name in STREAMS}
+        self.in_door = False  # Rolls made while going through a door are part of the door taken
+
+    def randint(self, a: int, b: int) -> int:
+        number = super().randint(a, b)
+        if not self.in_door:
+            self.streams["range_ids"].append(self.ranges.setdefault((a, b), len(self.ranges)))
+            self.streams["rolls"].append(number)
+        return number
+
+    def door(self, player, weights, costs, dim, table) -> Coordinates:
+        before = player.get_location()
+        self.in_door = True
+        try:
+            after = super().door(player, weights, costs, dim, table)
+        finally:
+            self.in_door = False
+        self.streams["doors"].append(door_taken(before, after))
+        return after
+
+
+class ReplayDice(Dice):
+    """
+    Makes every decision the way a Trace says it was made, without drawing
+    from the random stream at all
+    """
+
+    def __init__(self, trace: Trace) -> None:
+        super().__init__(hash(trace.layout.case_number))
+        self.ranges = trace.ranges
+        self.range_ids = trace.range_ids
+        self.rolls = trace.rolls
+        self.rolled = 0
+        self.next_door = iter(trace.doors)
+
+    def randint(self, a: int, b: int) -> int:
+        """
+        :returns: The next number the trace rolled
+        :raises ValueError: If the trace rolled it in another range, or has no rolls left
+        """
+        roll = self.rolled
+        try:
+            recorded = self.ranges[self.range_ids[roll]]
+        except IndexError:
+            raise ValueError(f"The trace has no roll {roll}, the game rolled randint({a}, {b})") from None
+        if recorded != (a, b):
+            raise ValueError(f"Roll {roll} of the trace is randint{recorded}, the game rolled randint({a}, {b})")
+        self.rolled = roll + 1
+        return self.rolls[roll]
+
+    def door(self, player, weights, costs, dim, table) -> Coordinates:
+        door = next(self.next_door, None)
+        if door is None:
+            raise ValueError("The trace has no doors left, the game went through another one")
+        if door != STAY:
+            player.moves -= costs[door]
+        return through(player, door)
+
+
+def through(player: Person, door: int) -> Coordinates:
+    """
+    :param player: A player going through a door
+    :param door: The door they take, STAY to not move
+    :returns: The room the door leads to (the grid's own Coordinates, nothing is allocated)
+    """
+    if door == STAY:
+        return player.get_location()
+    dx, dy = DOOR_STEPS[door]
+    return player.grid.location(player.room_id + dx * player.grid.height + dy)
+
+
+class ReplayMansion(Mansion):
+    """
+    A mansion set up from a trace's Layout, whose turns make the trace's
+    decisions. Playing it with next_turn() plays the recorded game again.
+
+    The murderer pursues through the doors the trace says they took, so the
+    spatial index is never searched, and is left where the game started.
+    """
+
+    def __init__(self, trace: Trace) -> None:
+        """
+        :param trace: The game to replay
+        """
+        self.layout = trace.layout
+        super().__init__(trace.layout.case_number)
+        self.rng = ReplayDice(trace)
+        self.next_pursuit = iter(trace.pursuits)
+
+    def generate_players(self) -> list[Person]:
+        players = [Person(name, p) for p, name in enumerate(self.layout.players)]
+        self.murderer = self.layout.murderer
+        players[self.murderer].set_murderer(True)
+        return players
+
+    def generate_rooms(self) -> typing.Sequence[typing.Sequence[Room]]:
+        rooms = [template.new_room() for template in self.layout.rooms]
+        mansion = [rooms[x * self.layout.height : (x + 1) * self.layout.height] for x in range(self.layout.width)]
+        self.enter_players(mansion, *divmod(self.layout.start, self.layout.height))
+        return mansion
+
+    def spawn_items(self) -> list[Item]:
+        items: list[Item] = []
+        for template, room in zip(self.layout.items, self.layout.item_rooms):
+            item = template.new_item() if template.location else Item(template.item_name)
+            if room < 0:
+                self.players[self.murderer].pick_up_item(item)
+            else:
+                x, y = divmod(room, self.layout.height)
+                self.room_map[x][y].add_item(item)
+            items.append(item)
+        return items
+
+    def choose_door(
+        self, player: Person, weights: typing.Sequence[float], costs: typing.Sequence[int], dim: tuple[int, int]
+    ) -> Coordinates:
+        return self.rng.door(player, weights, costs, dim, None)
+
+    def pursue(self, player: Person) -> Coordinates:
+        """
+        :raises ValueError: If the trace has no pursuits left
+        """
+        door = next(self.next_pursuit, None)
+        if door is None:
+            raise ValueError("The trace has no pursuits left, the murderer pursued someone again")
+        return through(player, door)
+
+
+def layout_of(mansion: Mansion, case_number: str) -> Layout:
+    """
+    :param mansion: A mansion that hasn't played any turns yet
+    :param case_number: The case number the mansion was made with
+    :returns: How the mansion is set up
+    """
+    room_map = mansion.get_rooms()
+    height = len(room_map[0])
+    item_rooms = {id(item): -1 for item in mansion.get_items()}
+    rooms = []
+    for x, column in enumerate(room_map):
+        for y, room in enumerate(column):
+            rooms.append(RoomTemplate(room.get_room_name(), tuple(room.door_weights), tuple(room.door_costs)))
+            for item in room.get_items():
+                item_rooms[id(item)] = x * height + y
+    return Layout(
+        case_number=case_number,
+        width=len(room_map),
+        height=height,
+        rooms=tuple(rooms),
+        players=tuple(p.get_name() for p in mansion.get_players()),
+        murderer=mansion.murderer,
+        start=mansion.get_players()[0].room_id,
+        items=tuple(ItemTemplate(item.get_item_name(), item.get_location() or "") for item in mansion.get_items()),
+        item_rooms=tuple(item_rooms[id(item)] for item in mansion.get_items()),
+    )
+
+
+def record(mansion: Mansion, case_number: str) -> Trace:
+    """
+    Plays a game to the end, recording every decision it leaves to chance.
+    The game plays out exactly as it would have without recording.
+
+    :param mansion: A mansion that hasn't played any turns yet
+    :param case_number: The case number the mansion was made with
+    :returns: The game's trace
+    """
+    layout = layout_of(mansion, case_number)
+    dice = RecordingDice()
+    dice.setstate(mansion.rng.getstate())
+    mansion.rng = dice
+    pursue = mansion.pursue
+    wrapped = mansion.__dict__.get("pursue")
+
+    def recording_pursue(player: Person) -> Coordinates:
+        before = player.get_location()
+        after = pursue(player)
+        dice.streams["pursuits"].append(door_taken(before, after))
+        return after
+
+    # Like murder.events.EventLog, record on the mansion itself so Mansion.pursue() never changes
+    mansion.__dict__["pursue"] = recording_pursue
+    try:
+        while mansion.next_turn():
+            pass
+    finally:
+        if wrapped is None:
+            del mansion.__dict__["pursue"]
+        else:
+            mansion.__dict__["pursue"] = wrapped
+    return Trace(layout, tuple(dice.ranges), **dice.streams)
+
+
+def replay(trace: Trace, *, recorder=None) -> Mansion:
+    """
+    :param trace: A recorded game
+    :param recorder: Optional murder.events.EventLog that records everything that happens
+    :returns: The game, played to the end again from its trace
+    """
+    mansion = ReplayMansion(trace)
+    if recorder is not None:
+        recorder.attach(mansion)
+    while mansion.next_turn():
+        pass
+    return mansion
+
+
+def pack_string(text: str) -> bytes:
+    data = text.encode()
+    return STRING.pack(len(data)) + data
+
+
+def dumps(trace: Trace) -> bytes:
+    """
+    :param trace: A recorded game
+    :returns: The trace in its binary form: a header, the layout, the ranges,
+        then every stream as a 4 byte length and one byte per decision
+    """
+    layout = trace.layout
+    parts = [
+        HEADER.pack(
+            MAGIC,
+            VERSION,
+            layout.width,
+            layout.height,
+            len(layout.players),
+            layout.murderer,
+            layout.start,
+            len(layout.items),
+            len(trace.ranges),
+        ),
+        pack_string(layout.case_number),
+    ]
+    parts += [pack_string(name) for name in layout.players]
+    for room in layout.rooms:
+        parts += [pack_string(room.name), DOORS.pack(*room.door_weights, *room.door_costs)]
+    for item, room in zip(layout.items, layout.item_rooms):
+        parts += [pack_string(item.item_name), pack_string(item.location), ITEM_ROOM.pack(room)]
+    parts += [RANGE.pack(a, b) for a, b in trace.ranges]
+    for name in STREAMS:
+        stream = bytes(getattr(trace, name))
+        parts += [LENGTH.pack(len(stream)), stream]
+    return b"".join(parts)
+
+
+def loads(buffer: typing.Union[bytes, bytearray, memoryview, mmap.mmap]) -> Trace:
+    """
+    Reads a trace without copying its streams: they are views into the buffer
+
+    :param buffer: A trace in its binary form (see dumps())
+    :returns: The trace
+    :raises ValueError: If the buffer doesn't hold a trace this version can read
+    """
+    view = memoryview(buffer)
+    magic, version, width, height, num_players, murderer, start, num_items, num_ranges = HEADER.unpack_from(view, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a version {VERSION} murder mystery trace")
+    offset = HEADER.size
+
+    def read(layout: struct.Struct) -> tuple:
+        nonlocal offset
+        values = layout.unpack_from(view, offset)
+        offset += layout.size
+        return values
+
+    def read_string() -> str:
+        nonlocal offset
+        (size,) = read(STRING)
+        offset += size
+        return bytes(view[offset - size : offset]).decode()
+
+    case_number = read_string()
+    players = tuple(read_string() for _ in range(num_players))
+    rooms = []
+    for _ in range(width * height):
+        name = read_string()
+        doors = read(DOORS)
+        rooms.append(RoomTemplate(name, doors[:4], doors[4:]))
+    items, item_rooms = [], []
+    for _ in range(num_items):
+        items.append(ItemTemplate(read_string(), read_string()))
+        item_rooms.append(read(ITEM_ROOM)[0])
+    ranges = tuple(read(RANGE) for _ in range(num_ranges))
+
+    streams = {}
+    for name in STREAMS:
+        (size,) = read(LENGTH)
+        streams[name] = view[offset : offset + size]
+        offset += size
+
+    layout = Layout(case_number, width, height, tuple(rooms), players, murderer, start, tuple(items), tuple(item_rooms))
+    return Trace(layout, ranges, **streams)
+
+
+def save(trace: Trace, path: str) -> None:
+    """
+    :param trace: A recorded game
+    :param path: File to write the trace to
+    """
+    with open(path, "wb") as file:
+        file.write(dumps(trace))
+
+
+def load(path: str) -> Trace:
+    """
+    Memory-maps a trace file, so only the parts a replay reads are loaded
+
+    :param path: File written by save()
+    :returns: The trace
+    """
+    with open(path, "rb") as file:
+        return loads(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+if __name__ == "__main__":
+    print("🔍 Hint: To start the investigation, you need to run `main.py`, not this file.")
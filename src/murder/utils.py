@@ -1,13 +1,69 @@
+import abc
+import functools
 import os
+import pathlib
 import time
 import typing
 
+# The "res" folder lives next to "src", two levels above this package
+RESOURCE_DIR = pathlib.Path(__file__).resolve().parent.parent.parent / "res"
+
 
 class Coordinates(typing.NamedTuple):
     x: int
     y: int
 
 
+# A room's door weights and door costs, one per door (N, S, E, W)
+DoorWeights = typing.Sequence[float]
+DoorCosts = typing.Sequence[int]
+
+
+# Grids only keep shared Coordinates for this many rooms, bigger mansions allocate the rest
+SHARED_COORDINATES = 1 << 16
+
+
+class Grid:
+    """
+    Numbers the rooms of a width x height mansion as x * height + y, and keeps
+    one shared Coordinates per room (up to SHARED_COORDINATES rooms), so
+    turning a room id back into (x, y) doesn't allocate anything
+    """
+
+    __slots__ = ("height", "coordinates")
+
+    def __init__(self, width: int, height: int) -> None:
+        self.height = height
+        rooms = min(width * height, SHARED_COORDINATES)
+        self.coordinates = tuple(Coordinates(*divmod(room_id, height)) for room_id in range(rooms))
+
+    def room_id(self, x: int, y: int) -> int:
+        """
+        :returns: The id of room_map[x][y]
+        """
+        return x * self.height + y
+
+    def location(self, room_id: int) -> Coordinates:
+        """
+        :returns: The (x,y) coordinates of a room id
+        """
+        if room_id < len(self.coordinates):
+            return self.coordinates[room_id]
+        return Coordinates(*divmod(room_id, self.height))
+
+
+# Grid of a person who isn't in a mansion (yet): any room fits, no Coordinates are shared
+LOOSE_GRID = Grid(0, 1 << 16)
+
+
+@functools.lru_cache(maxsize=None)
+def shared_grid(width: int, height: int) -> Grid:
+    """
+    :returns: The Grid of a width x height mansion, shared by every mansion that size
+    """
+    return Grid(width, height)
+
+
 def valid_case_number(case_number: str) -> bool:
     """
     This method can be used to limit "case number" types. It accepts all case
@@ -41,6 +97,16 @@ def hash(case_number: str) -> int:
     return seed_val
 
 
+def resource_path(file_name: str) -> pathlib.Path:
+    """
+    Locates a resource file independently of the current working directory
+
+    :param file_name: Name of the file inside the "res" folder (e.g. "Rooms.in")
+    :returns: Absolute path to the resource file
+    """
+    return RESOURCE_DIR / file_name
+
+
 def wait(milli: int) -> None:
     """
     Sleep method
@@ -58,3 +124,101 @@ def clear_screen():
     Clears terminal
     """
     os.system("cls" if os.name == "nt" else "clear")
+
+
+class Renderer(abc.ABC):
+    """
+    Where the game's text goes. Mansion, MurderMystery and the questions only
+    ever print, pause and clear the screen through a renderer, so the same game
+    can be shown in a terminal or run headless.
+    """
+
+    @abc.abstractmethod
+    def print(self, text: str = "", end: str = "\n") -> None:
+        """
+        Shows a line of text
+
+        :param text: The text to show
+        :param end: Appended to the text, like print()'s end
+        """
+
+    @abc.abstractmethod
+    def wait(self, milli: int) -> None:
+        """
+        Pauses for dramatic effect
+
+        :param milli: milliseconds to pause
+        """
+
+    @abc.abstractmethod
+    def clear_screen(self) -> None:
+        """
+        Clears everything shown so far
+        """
+
+
+class TerminalRenderer(Renderer):
+    """
+    Prints to the terminal, pausing with wait() and clearing with clear_screen()
+    """
+
+    def __init__(self, speed: float = 1.0) -> None:
+        """
+        :param speed: Pauses are divided by this (2.0 waits half as long)
+        """
+        self.speed = speed
+
+    def print(self, text: str = "", end: str = "\n") -> None:
+        print(text, end=end)
+
+    def wait(self, milli: int) -> None:
+        if self.speed > 0 and milli / self.speed >= 1:
+            wait(int(milli / self.speed))
+
+    def clear_screen(self) -> None:
+        clear_screen()
+
+
+class HeadlessRenderer(Renderer):
+    """
+    Never sleeps or starts a process. Text is kept in `lines` if `capture` is
+    True, otherwise it is thrown away.
+    """
+
+    def __init__(self, capture: bool = False) -> None:
+        self.capture = capture
+        self.lines: list[str] = []
+
+    def print(self, text: str = "", end: str = "\n") -> None:
+        if self.capture:
+            self.lines.append(text + end)
+
+    def wait(self, milli: int) -> None:
+        pass
+
+    def clear_screen(self) -> None:
+        pass
+
+
+class ScriptRenderer(Renderer):
+    """
+    Never sleeps or starts a process. Everything shown is kept in `steps`, in
+    order, as ("print", text), ("wait", milliseconds) and ("clear", None), to be
+    played back later (for example to a network client, see murder.server).
+    """
+
+    def __init__(self) -> None:
+        self.steps: list[tuple[str, typing.Any]] = []
+
+    def print(self, text: str = "", end: str = "\n") -> None:
+        self.steps.append(("print", text + end))
+
+    def wait(self, milli: int) -> None:
+        self.steps.append(("wait", milli))
+
+    def clear_screen(self) -> None:
+        self.steps.append(("clear", None))
+
+
+# The renderer used unless another one is given
+TERMINAL_RENDERER = TerminalRenderer()
@@ -0,0 +1,59 @@
+import murder.mansion
+from murder.answer_key import (
+    SOURCE_CODE_LINES,
+    answer_key,
+    format_time,
+    source_code_line,
+)
+from murder.mansion import Mansion
+from murder.questions import make_worksheet
+
+
+def test_answer_key_100():
+    m = Mansion("100")
+    while m.next_turn():
+        pass
+    worksheet = make_worksheet(m)
+
+    key = answer_key("100", worksheet)
+    assert len(key) == len(worksheet.questions())
+    assert key[:5] == ["Monsieur Verde", "14", "24", "Professor Purple", "5"]
+
+    # Regenerating the worksheet from the case number gives the same key
+    assert answer_key("100") == key
+
+
+def test_answer_key_namesakes():
+    """
+    Case 38 has two guests named "Mr. Brown", and asks where the second one died
+    """
+    m = Mansion("38")
+    while m.next_turn():
+        pass
+    worksheet = make_worksheet(m)
+
+    seed = next(seed for seed in worksheet.seeds if seed[1] == "Mr. Brown")
+    brown = m.players[seed.player]
+    assert [p.get_name() for p in m.players].index("Mr. Brown") < seed.player
+    assert brown.get_name() == "Mr. Brown" and not brown.is_alive()
+
+    x, y = brown.get_location()
+    key = answer_key("38", worksheet)
+    assert key[len(worksheet.hard_coded) + worksheet.seeds.index(seed)] == m.room_map[x][y].get_room_name()
+
+
+def test_source_code_lines():
+    """
+    Every source code question must point at a line that still exists
+    """
+    with open(murder.mansion.__file__) as file:
+        lines = file.readlines()
+
+    for question, (_, text) in SOURCE_CODE_LINES.items():
+        assert text in lines[source_code_line(question) - 1]
+
+
+def test_format_time():
+    assert format_time(6, 0) == "6:00pm"
+    assert format_time(6, 65) == "7:05pm"
+    assert format_time(6, 285) == "10:45pm"
@@ -0,0 +1,31 @@
+from murder.batch import parse_case_numbers, play_case, run_batch
+
+
+def test_play_case_100():
+    """
+    Make sure the summary matches the known outcome of seed 100
+    """
+    summary = play_case("100")
+
+    assert summary.case_number == "100"
+    assert summary.murderer == "Monsieur Verde"
+    assert summary.time_val == 285
+    assert summary.alive == 1
+    assert len(summary.victims) == 5
+    assert "Monsieur Verde" not in summary.victims
+
+
+def test_run_batch_is_deterministic():
+    """
+    Results must not depend on the number of workers or the chunk size
+    """
+    cases = [str(n) for n in range(90, 110)]
+    serial = run_batch(cases, workers=1)
+
+    assert run_batch(cases, workers=2, chunk_size=3) == serial
+    assert run_batch(range(90, 110), workers=2, chunk_size=7) == serial
+    assert [s.case_number for s in serial] == cases
+
+
+def test_parse_case_numbers():
+    assert parse_case_numbers(["1-3", "abc", "7"]) == ["1", "2", "3", "abc", "7"]
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from murder.bench import DEFAULT_BASELINE, benchmarks, main, regressions, run
+
+
+def test_every_benchmark_runs():
+    """
+    Run every benchmark for a moment, and make sure the stored baseline covers them all
+    """
+    results = run(min_time=0.0, repeat=1)
+    assert set(results) == set(benchmarks())
+    assert all(seconds > 0 for seconds in results.values())
+
+    baseline = json.loads(DEFAULT_BASELINE.read_text())
+    assert set(baseline) == set(results)
+
+
+def test_regressions():
+    baseline = {"a": 1.0, "b": 1.0, "c": 1.0}
+    results = {"a": 1.1, "b": 1.5, "c": 0.5, "new": 9.0}
+    assert regressions(results, baseline, 0.2) == {"b": 0.5}
+    assert regressions(results, baseline, 0.05) == {"a": pytest.approx(0.1), "b": 0.5}
+
+
+def test_missing_baseline(tmp_path, monkeypatch, capsys):
+    """
+    Make sure a missing baseline fails the run (from any working directory),
+    unless the run saves one
+    """
+    monkeypatch.chdir(tmp_path)
+    path = str(tmp_path / "baseline.json")
+    args = ["--filter", "pursue", "--min-time", "0", "--repeat", "1", "--baseline", path]
+    with pytest.raises(SystemExit) as exit:
+        main(args)
+    assert exit.value.code == 1
+    assert f"No baseline at {path}" in capsys.readouterr().out
+
+    main(args + ["--save"])
+    main(args + ["--threshold", "1000"])  # Timings this short are too noisy to count regressions
+    assert set(json.loads((tmp_path / "baseline.json").read_text())) == {
+        name for name in benchmarks() if "pursue" in name
+    }
+
+
+def test_save_with_a_filter(tmp_path):
+    """
+    Make sure saving some of the benchmarks keeps the baseline of the others
+    """
+    path = str(tmp_path / "baseline.json")
+    args = ["--min-time", "0", "--repeat", "1", "--baseline", path, "--save"]
+    main(args + ["--filter", "pursue"])
+    main(args + ["--filter", "questions"])
+    assert set(json.loads((tmp_path / "baseline.json").read_text())) == {
+        name for name in benchmarks() if "pursue" in name or "questions" in name
+    }
@@ -0,0 +1,31 @@
+from murder.catalog import get_catalog
+from murder.mansion import Mansion
+
+
+def test_catalog_contents():
+    catalog = get_catalog()
+
+    assert len(catalog.people) == 30
+    assert len(catalog.rooms) == 27
+    assert len(catalog.items) == 27
+    assert len(catalog.hard_coded_questions) == 5
+    assert len(catalog.seed_questions) == 9
+    assert len(catalog.source_code_questions) == 7
+
+    assert catalog.rooms[0].name == "Dining Room"
+    assert catalog.rooms[0].door_weights == (0.25, 0.35, 0.25, 0.15)
+    assert catalog.item_by_location["Hall"].item_name == "Candelabra"
+
+
+def test_catalog_is_shared_but_games_are_not():
+    """
+    The catalog is parsed once, but every game gets its own rooms and items
+    """
+    assert get_catalog() is get_catalog()
+
+    m_1 = Mansion("100")
+    m_2 = Mansion("100")
+    assert m_1.room_map[0][0] is not m_2.room_map[0][0]
+    assert m_1.room_map[0][0].get_door_weights() is not m_2.room_map[0][0].get_door_weights()
+    assert m_1.items[0] is not m_2.items[0]
+    assert m_1.players[0] is not m_2.players[0]
@@ -0,0 +1,61 @@
+import random
+
+from murder.batch import summarize
+from murder.doors import CLOSED, DoorTable, alias_table, outcome_probabilities
+from murder.mansion import Mansion
+from murder.person import Person
+from murder.utils import Coordinates
+
+
+def play(case_number: str, doors: bool = False, alias: bool = False) -> tuple:
+    mansion = Mansion(case_number)
+    if doors:
+        mansion.doors = DoorTable(mansion.get_rooms(), alias=alias)
+    while mansion.next_turn():
+        pass
+    return summarize(case_number, mansion), [p.get_location() for p in mansion.get_players()]
+
+
+def test_door_table_plays_the_same_games():
+    """
+    The precomputed table has to consume the random stream exactly like
+    Person.choose_door(), so every game plays out the same
+    """
+    for n in range(60):
+        assert play(str(n), doors=True) == play(str(n))
+
+
+def test_alias_table_is_exact():
+    probabilities = outcome_probabilities([0.25, CLOSED, 0.4, 0.1])
+    keep, aliases = alias_table(probabilities)
+
+    rebuilt = [0.0] * len(probabilities)
+    for column, (own, alias) in enumerate(zip(keep, aliases)):
+        rebuilt[column] += own / len(keep)
+        rebuilt[alias] += (1.0 - own) / len(keep)
+    assert all(abs(a - b) < 1e-12 for a, b in zip(rebuilt, probabilities))
+    assert probabilities[1] == 0.0
+    assert abs(sum(probabilities) - 1.0) < 1e-12
+
+
+def test_outcome_probabilities_match_choose_door():
+    """
+    The alias tables are built from outcome_probabilities(), so it has to
+    match how often Person.choose_door() takes each door
+    """
+    weights, costs = [0.25, 0.35, 0.25, 0.15], [4, 4, 3, 3]
+    rng = random.Random(11)
+    person = Person("Watson")
+    counts = [0] * 5
+    trials = 40000
+    # Room reached from (1, 1) -> door taken (N, S, E, W, or none)
+    doors = {(0, 1): 0, (2, 1): 1, (1, 2): 2, (1, 0): 3, (1, 1): 4}
+    for _ in range(trials):
+        person.set_moves(3)
+        dest = person.choose_door(weights, costs, Coordinates(1, 1), (3, 3), rng)
+        counts[doors[dest]] += 1
+
+    # With 3 moves left, the 4-move doors (N and S) can't be afforded
+    expected = outcome_probabilities([CLOSED, CLOSED, 0.25, 0.15])
+    for count, p in zip(counts, expected):
+        assert abs(count / trials - p) < 0.01
@@ -0,0 +1,78 @@
+from murder.events import EventKind, EventLog
+from murder.mansion import Mansion
+
+
+def play(case_number: str) -> tuple[Mansion, EventLog]:
+    m = Mansion(case_number)
+    log = EventLog().attach(m)
+    while m.next_turn():
+        pass
+    return m, log
+
+
+def test_recording_does_not_change_the_game():
+    m, log = play("100")
+
+    assert m.alive_players() == 1
+    assert m.time_val == 285
+    assert len(log) > 0
+
+
+def test_kills_match_the_dead():
+    """
+    Every dead player has exactly one KILL event, in the room they lie in
+    """
+    for case_number in ["99", "100", "7", "12345"]:
+        m, log = play(case_number)
+        kills = log.of_kind(EventKind.KILL)
+
+        dead = [i for i, p in enumerate(m.players) if not p.is_alive()]
+        assert sorted(k.player for k in kills) == dead
+        for k in kills:
+            assert k.other == m.murderer
+            assert (k.x, k.y) == tuple(m.players[k.player].get_location())
+            assert m.items[k.item].is_marked()
+        assert len(log.of_kind(EventKind.COOL_DOWN)) == len(kills)
+
+
+def test_replaying_events_reproduces_the_end_state():
+    """
+    Starting positions plus MOVE events give the final positions, and
+    GRAB/DROP/SWAP events give the final item holders
+    """
+    for case_number in ["99", "100", "7", "12345"]:
+        m, log = play(case_number)
+
+        start = Mansion(case_number)
+        positions = list(zip(log.start_x, log.start_y))
+        holders = {start.items.index(p.holds): i for i, p in enumerate(start.players) if p.holds is not None}
+        for event in log:
+            if event.kind == EventKind.MOVE:
+                positions[event.player] = (event.x, event.y)
+            elif event.kind == EventKind.GRAB:
+                holders[event.item] = event.player
+            elif event.kind == EventKind.DROP:
+                del holders[event.item]
+            elif event.kind == EventKind.SWAP:
+                del holders[event.other]
+                holders[event.item] = event.player
+
+        assert positions == [tuple(p.get_location()) for p in m.players]
+        assert holders == {m.items.index(p.holds): i for i, p in enumerate(m.players) if p.holds is not None}
+
+
+def test_every_door_is_a_move():
+    """
+    Every MOVE goes through one door, to a room next to the player's last one,
+    and players who go through two doors in a turn get two MOVE events
+    """
+    for case_number in ["99", "100", "7", "12345"]:
+        m, log = play(case_number)
+        positions = list(zip(log.start_x, log.start_y))
+        moves_per_turn: dict[tuple[int, int], int] = {}
+        for move in log.of_kind(EventKind.MOVE):
+            x, y = positions[move.player]
+            assert abs(move.x - x) + abs(move.y - y) == 1
+            positions[move.player] = (move.x, move.y)
+            moves_per_turn[move.time, move.player] = moves_per_turn.get((move.time, move.player), 0) + 1
+        assert max(moves_per_turn.values()) == 2
@@ -0,0 +1,66 @@
+import zipfile
+
+from murder.answer_key import answer_key
+from murder.grading import grade_submissions, normalize_answer, read_submissions
+
+
+def write_submission(path, case_number, answers):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(case_number + "\n" + "".join(a + "\n" for a in answers))
+
+
+def test_grade_directory_and_archive(tmp_path):
+    key_100 = answer_key("100")
+    key_99 = answer_key("99")
+
+    submissions = tmp_path / "section"
+    write_submission(submissions / "alice" / "Answers.out", "100", key_100)
+    write_submission(submissions / "bob" / "Answers.out", "100", ["Nobody"] + key_100[1:3])
+    write_submission(submissions / "carol" / "Answers.out", "99", [a.upper() for a in key_99])
+
+    grades = grade_submissions(read_submissions(str(submissions)), workers=1)
+    assert [(g.submission, g.score, g.total) for g in grades] == [
+        ("alice/Answers.out", len(key_100), len(key_100)),
+        ("bob/Answers.out", 2, len(key_100)),
+        ("carol/Answers.out", len(key_99), len(key_99)),
+    ]
+    assert grades[1].results == "011" + "0" * (len(key_100) - 3)
+
+    archive = tmp_path / "section.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        for path in sorted(submissions.rglob("*.out")):
+            z.write(path, path.relative_to(submissions))
+    assert grade_submissions(read_submissions(str(archive)), workers=2) == grades
+
+
+def test_bad_case_numbers(tmp_path):
+    """
+    Make sure submissions without a usable case number score 0 (with the reason
+    why) instead of stopping everyone else's grading
+    """
+    key_100 = answer_key("100")
+    write_submission(tmp_path / "alice" / "Answers.out", "100", key_100)
+    (tmp_path / "bob" / "Answers.out").parent.mkdir()
+    (tmp_path / "bob" / "Answers.out").write_text("")
+    write_submission(tmp_path / "carol" / "Answers.out", "   ", key_100)
+    write_submission(tmp_path / "dave" / "Answers.out", "the butler did it", key_100)
+
+    grades = grade_submissions(read_submissions(str(tmp_path)), workers=1)
+    assert [(g.submission, g.score, g.total) for g in grades] == [
+        ("alice/Answers.out", len(key_100), len(key_100)),
+        ("bob/Answers.out", 0, 0),
+        ("carol/Answers.out", 0, 0),
+        ("dave/Answers.out", 0, 0),
+    ]
+    assert [g.error for g in grades] == [
+        "",
+        "'' is not a case number",
+        "'' is not a case number",
+        "'the butler did it' is not a case number",
+    ]
+
+
+def test_normalize_answer():
+    assert normalize_answer(" 07:05 PM ") == normalize_answer("7:05pm")
+    assert normalize_answer("the  Knife") == normalize_answer("The Knife")
+    assert normalize_answer("Alive") != normalize_answer("Untouched")
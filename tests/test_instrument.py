@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from murder.dice import Dice
+from murder.instrument import PHASES, ROLLS, Profiler, profile_case
+from murder.mansion import Mansion
+from murder.person import Person
+from murder.room import Room
+from murder.sparse import SparseMansion, SparseRooms
+
+
+def play_to_end(mansion: Mansion) -> None:
+    while mansion.next_turn():
+        pass
+
+
+def test_profiled_games_play_the_same():
+    """
+    Make sure a profiled game ends exactly like an unprofiled one, and that
+    detaching puts every object back the way it was
+    """
+    for case in ("3", "24", "100"):
+        expected = Mansion(case)
+        play_to_end(expected)
+
+        mansion = Mansion(case)
+        profiler = Profiler()
+        profiler.attach(mansion, case)
+        with pytest.raises(ValueError):
+            profiler.attach(mansion)
+        play_to_end(mansion)
+        assert mansion.snapshot() == expected.snapshot()
+
+        profiler.detach(mansion)
+        assert all(type(p) is Person for p in mansion.get_players())
+        assert all(type(room) is Room for column in mansion.get_rooms() for room in column)
+        assert not {"next_turn", "choose_door"} & set(vars(mansion))
+        assert type(mansion.rng) is Dice and set(vars(mansion.rng)) == {"gauss_next"}
+
+
+def test_profiled_sparse_games_detach():
+    """
+    Make sure detaching from a sparse mansion puts back the class its rooms are made with
+    """
+    mansion = SparseMansion("5", width=200, height=200, guests=50)
+    profiler = Profiler()
+    profiler.attach(mansion, "5")
+    for _ in range(10):
+        mansion.next_turn()
+    profiler.detach(mansion)
+    rooms = mansion.get_rooms()
+    assert isinstance(rooms, SparseRooms) and rooms.room_class is Room
+    assert all(type(room) is Room for _, room in rooms.materialized())
+
+
+def test_profile_counts():
+    mansion = Mansion("24")
+    profiler = Profiler()
+    profile = profiler.attach(mansion, "24")
+    play_to_end(mansion)
+
+    victims = len(mansion.get_players()) - mansion.alive_players()
+    assert profile.turns == mansion.time() // 5
+    assert profile.functions["Person.kill"] == victims
+    assert profile.functions["Dice.randint(1, 3)"] == victims
+    assert profile.functions["Room.add_player"] == profile.functions["Room.remove_player"]
+    assert profile.calls["rooms"] == 2 * profile.functions["Room.add_player"]
+    # Every decision draws at least one random number, moving rooms never does
+    for phase, rolls in ROLLS.items():
+        decisions = sum(profile.functions[f"Dice.randint{roll}"] for roll in rolls)
+        assert profile.draws[phase] >= decisions
+    assert profile.draws["rooms"] == 0
+    assert profile.other_draws == 0
+    assert sum(profile.phase_seconds.values()) < profile.seconds
+
+
+def test_total_and_json():
+    profiler = Profiler()
+    profiler.games.extend(profile_case(case) for case in ("3", "24"))
+    total = profiler.total()
+    assert total.games == 2
+    assert total.turns == sum(p.turns for p in profiler.games)
+    assert total.functions["Mansion.choose_door"] == sum(p.functions["Mansion.choose_door"] for p in profiler.games)
+
+    exported = json.loads(profiler.to_json())
+    assert exported["total"] == total.as_dict()
+    assert [game["case_number"] for game in exported["games"]] == ["3", "24"]
+    assert set(exported["total"]["phases"]) == set(PHASES)
@@ -0,0 +1,55 @@
+import pytest
+
+from murder.dice import Dice
+from murder.mansion import Mansion
+
+np = pytest.importorskip("numpy")
+from murder.lockstep import LockstepGames  # noqa: E402
+
+
+def outcomes(time_val, alive, weapons):
+    return np.stack([time_val, alive, weapons], axis=1).astype(float)
+
+
+def test_lockstep_matches_reference_statistically():
+    """
+    Play the same starting states with both engines (the reference one with
+    fresh random streams) and compare the mean game length, number of
+    survivors and number of murder weapons
+    """
+    cases = [str(n) for n in range(100)]
+    reference = []
+    for replay in range(4):
+        for case in cases:
+            mansion = Mansion(case)
+            mansion.rng = Dice(f"{case}/{replay}")
+            while mansion.next_turn():
+                pass
+            weapons = sum(item.is_marked() for item in mansion.get_items())
+            reference.append((mansion.time(), mansion.alive_players(), weapons))
+    reference = np.array(reference, dtype=float)
+
+    games = LockstepGames.from_cases(cases, repeat=100, seed=3)
+    games.run()
+    lockstep = outcomes(games.time_val, games.alive_players(), games.weapons_used())
+
+    for column in range(3):
+        a, b = reference[:, column], lockstep[:, column]
+        standard_error = np.sqrt(a.var() / len(a) + b.var() / len(b))
+        assert abs(a.mean() - b.mean()) < 4 * standard_error
+
+
+def test_lockstep_games_are_consistent():
+    games = LockstepGames.from_cases(["100", "99", "7"], repeat=50, seed=1)
+    again = LockstepGames.from_cases(["100", "99", "7"], repeat=50, seed=1)
+    games.run()
+    again.run()
+
+    assert games.num_games == 150
+    assert not games.running.any()
+    assert (games.time_val == again.time_val).all()
+    # The murderer never dies, and everyone else died if and only if they have a death time
+    assert games.alive[np.arange(150), games.murderer].all()
+    assert ((games.death_time >= 0) == ~games.alive).all()
+    assert (games.weapons_used() == (~games.alive).sum(axis=1)).all()
+    assert (games.time_val <= 300).all()
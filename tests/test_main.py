@@ -0,0 +1,21 @@
+import time
+
+from murder.main import MurderMystery
+from murder.utils import HeadlessRenderer
+
+
+def test_play_game_headless():
+    """
+    A headless game (with the intro) must finish without pausing, and still
+    report how it ended
+    """
+    renderer = HeadlessRenderer(capture=True)
+    start = time.perf_counter()
+    game = MurderMystery("100", True, renderer)
+    game.play_game()
+    assert time.perf_counter() - start < 5
+
+    text = "".join(renderer.lines)
+    assert "Thornwood Mansion" in text
+    assert "The game ended at 10:45pm" in text
+    assert "5 players were murdered. The murderer got away." in text
@@ -129,3 +129,157 @@ def test_mansion_next_turn_2():
     assert murderer.is_murderer() == True
     assert murderer.has_item() == False
     assert murderer.get_item_name() == None
+
+
+def test_mansion_interleaved_games(tmp_path, monkeypatch):
+    """
+    Make sure two games can be played in lockstep, from any working directory,
+    without disturbing each other's random stream
+    """
+    monkeypatch.chdir(tmp_path)
+    m_100 = Mansion("100")
+    m_99 = Mansion("99")
+
+    running = [m_100, m_99]
+    while running:
+        running = [m for m in running if m.next_turn()]
+
+    assert m_100.time_val == 285
+    assert m_99.time_val == 120
+    assert m_100.alive_players() == 1
+    assert m_99.alive_players() == 1
+
+
+def test_mansion_occupancy_counts():
+    """
+    Make sure the incremental room and alive counts match a full recount after
+    every turn, including in a game with two guests both named "Mr. Brown"
+    """
+    m = Mansion("24")
+    assert [p.name for p in m.players].count("Mr. Brown") == 2
+
+    while True:
+        playing = m.next_turn()
+        assert m.alive_players() == sum(p.is_alive() for p in m.players)
+        for x, column in enumerate(m.room_map):
+            for y, room in enumerate(column):
+                people = [p for p in m.players if tuple(p.get_location()) == (x, y)]
+                # Rooms go by name, so namesakes may swap places in them
+                assert sorted(p.name for p in room.get_people()) == sorted(p.name for p in people)
+                assert room.alive_people() == sum(p.is_alive() for p in room.get_people())
+        if not playing:
+            break
+
+
+def test_mansion_namesakes_leave_by_name():
+    """
+    Make sure rooms still let the first person with a leaving player's name
+    out, which decides these games with two guests both named "Mr. Brown"
+    """
+    # Case number -> (end time, players alive at the end)
+    expected = {
+        "24": (300, [1, 2, 5]),
+        "65": (300, [1, 4]),
+        "89": (300, [0, 4, 5]),
+        "147": (300, [2, 4]),
+        "328": (300, [1, 4]),
+        "371": (175, [5]),
+    }
+    for case, (time_val, alive) in expected.items():
+        m = Mansion(case)
+        while m.next_turn():
+            pass
+        assert (m.time_val, [p.index for p in m.players if p.is_alive()]) == (time_val, alive)
+
+
+class CheckedPursuit(Mansion):
+    """
+    Checks every pursuit the spatial index picks against Person.pursue()
+    checking every player
+    """
+
+    pursuits = 0
+
+    def pursue(self, player):
+        expected = player.pursue(player.get_location(), self.players)
+        destination = super().pursue(player)
+        assert destination == expected
+        CheckedPursuit.pursuits += 1
+        return destination
+
+
+def test_mansion_pursue_namesakes():
+    """
+    Make sure the murderer never pursues someone with their own name, in
+    every game with two guests both named "Mr. Brown"
+    """
+    CheckedPursuit.pursuits = 0
+    murderers = []
+    for case in range(400):
+        m = CheckedPursuit(str(case))
+        if [p.name for p in m.players].count("Mr. Brown") < 2:
+            continue
+        murderers.append(m.players[m.murderer].name)
+        while m.next_turn():
+            pass
+    assert "Mr. Brown" in murderers
+    assert CheckedPursuit.pursuits > 0
+
+
+def test_mansion_room_ids():
+    """
+    Positions are kept as room ids (x * height + y), while get_location()
+    still hands back (x, y) Coordinates
+    """
+    m = Mansion("100")
+    height = len(m.room_map[0])
+    for player in m.players:
+        x, y = player.get_location()
+        assert player.room_id == x * height + y
+        assert player.get_location() == player.room == (x, y)
+        assert not hasattr(player, "__dict__")
+
+    player = m.players[0]
+    player.set_location(len(m.room_map) - 1, height - 1)
+    assert player.room_id == len(m.room_map) * height - 1
+    assert player.get_location() is m.grid.coordinates[-1]
+    assert not hasattr(m.items[0], "__dict__") and not hasattr(m.room_map[0][0], "__dict__")
+
+
+def test_mansion_turns():
+    """
+    Make sure the turn deltas add up to the game the plain next_turn() loop plays
+    """
+    for case in ("3", "24", "100"):
+        expected = Mansion(case)
+        while expected.next_turn():
+            pass
+
+        m = Mansion(case)
+        rooms = [p.room_id for p in m.players]
+        dead: list[int] = []
+        deltas = list(m.turns())
+        for delta in deltas:
+            for player, room in delta.moved:
+                rooms[player] = room
+            dead += delta.died
+        assert [d.time_val for d in deltas] == [5 * i for i in range(len(deltas))]
+        assert [d.over for d in deltas] == [False] * (len(deltas) - 1) + [True]
+        assert rooms == [p.room_id for p in expected.players]
+        assert sorted(dead) == [i for i, p in enumerate(expected.players) if not p.is_alive()]
+        assert (m.time(), m.end) == (expected.time(), expected.end)
+        assert list(m.turns()) == []
+
+
+def test_mansion_step_and_run_until():
+    m = Mansion("100")
+    assert m.step(0) == []
+    assert [d.time_val for d in m.step(3)] == [0, 5, 10]
+
+    first_death = m.run_until(lambda delta: len(delta.died) > 0)
+    assert first_death is not None and first_death.died == (0,) and first_death.time_val == 30
+    assert len(first_death.weapons) == 1
+    assert m.time() == 35
+
+    assert m.run_until(lambda delta: False) is None
+    assert m.time() == 285
@@ -0,0 +1,96 @@
+import math
+import random
+
+import pytest
+
+from murder.mansion import Mansion
+from murder.markov import MovementChain, solve, solve_python
+from murder.person import Person
+
+
+def test_chain_rows_are_distributions():
+    chain = MovementChain(Mansion("100"))
+    assert chain.size == 24
+    for row in chain.rows:
+        assert abs(sum(row.values()) - 1.0) < 1e-12
+
+    occupancy = chain.occupancy((3, 1), 5)
+    assert len(occupancy) == 6
+    assert occupancy[0][chain.index((3, 1))] == 1.0
+    assert occupancy[1] == chain.transition_matrix()[chain.index((3, 1))]
+
+
+def test_chain_matches_simulated_turns():
+    """
+    One turn of the chain has to match how often next_turn() takes a guest
+    from a room to each other room
+    """
+    mansion = Mansion("100")
+    chain = MovementChain(mansion)
+    rooms = mansion.get_rooms()
+    dim = (len(rooms), len(rooms[0]))
+    rng = random.Random(5)
+    guest = Person("Watson")
+    counts = [0] * chain.size
+    trials = 20000
+    for _ in range(trials):
+        guest.set_location(2, 1)
+        guest.set_moves(rng.randint(3, 7))
+        for _ in range(2):
+            if guest.get_moves() <= 0:
+                break
+            x, y = guest.get_location()
+            weights, costs = rooms[x][y].get_door_weights(), rooms[x][y].get_door_costs()
+            guest.set_location(*guest.choose_door(weights, costs, guest.get_location(), dim, rng))
+        counts[chain.index(guest.get_location())] += 1
+
+    row = chain.rows[chain.index((2, 1))]
+    for room in range(chain.size):
+        assert abs(counts[room] / trials - row.get(room, 0.0)) < 0.015
+
+
+def test_stationary_and_hitting_times():
+    chain = MovementChain(Mansion("100"))
+    stationary = chain.stationary()
+    assert abs(sum(stationary) - 1.0) < 1e-9
+    assert all(abs(a - b) < 1e-9 for a, b in zip(chain.step(stationary), stationary))
+
+    times = chain.hitting_times((0, 0))
+    assert times[chain.index((0, 0))] == 0.0
+    # Kac's lemma: the mean return time is 1 / stationary probability
+    returns = 1.0 + sum(p * times[j] for j, p in chain.rows[0].items())
+    assert abs(returns - 1.0 / stationary[0]) < 1e-6
+
+
+def test_hitting_times_with_leaking_rooms():
+    """
+    Make sure rooms that can move to a room the target can't be reached from
+    (like room 16 in case 15, with room 12 as the target) never reach it for sure
+    """
+    chain = MovementChain(Mansion("15"))
+    times = chain.hitting_times(chain.room(12))
+    assert math.isinf(times[16])
+    for goal in range(chain.size):
+        times = chain.hitting_times(chain.room(goal))
+        for i, row in enumerate(chain.rows):
+            if i != goal and not math.isinf(times[i]):
+                assert all(not math.isinf(times[j]) for j, p in row.items() if p > 0.0)
+                assert abs(times[i] - 1.0 - sum(p * times[j] for j, p in row.items())) < 1e-6
+
+
+def test_solve():
+    """
+    Make sure NumPy (when installed) and the pure Python fallback agree
+    """
+    for solver in (solve, solve_python):
+        x = solver([[2.0, 1.0], [1.0, 3.0]], [3.0, 5.0])
+        assert abs(x[0] - 0.8) < 1e-12 and abs(x[1] - 1.4) < 1e-12
+        with pytest.raises(ValueError):
+            solver([[1.0, 2.0], [2.0, 4.0]], [1.0, 2.0])
+
+    chain = MovementChain(Mansion("100"))
+    matrix = [[1.0 if i == j else 0.0 for j in range(chain.size)] for i in range(chain.size)]
+    matrix = [[a - b for a, b in zip(row, p)] for row, p in zip(matrix, chain.transition_matrix())]
+    matrix[-1] = [1.0] * chain.size
+    rhs = [0.0] * (chain.size - 1) + [1.0]
+    assert all(abs(a - b) < 1e-9 for a, b in zip(solve(matrix, rhs), solve_python(matrix, rhs)))
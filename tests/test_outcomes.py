@@ -0,0 +1,60 @@
+import pytest
+
+from murder.batch import play_case
+from murder.events import EventKind, EventLog
+from murder.mansion import Mansion
+from murder.outcomes import OutcomeStore, build
+
+
+def test_store_matches_the_games(tmp_path):
+    """
+    Make sure every stored outcome matches the game, down to when each victim died
+    """
+    path = str(tmp_path / "outcomes.bin")
+    build(path, 90, 130, workers=1)
+
+    with OutcomeStore(path) as store:
+        assert len(store) == 40 and 90 in store and 130 not in store
+        for case_number in (90, 100, 129):
+            outcome = store[case_number]
+            summary = play_case(str(case_number))
+            mansion = Mansion(str(case_number))
+            log = EventLog().attach(mansion)
+            while mansion.next_turn():
+                pass
+
+            names = [p.get_name() for p in mansion.get_players()]
+            assert names[outcome.murderer] == summary.murderer
+            assert tuple(n for i, n in enumerate(names) if outcome.victims >> i & 1) == summary.victims
+            assert outcome.time_val == summary.time_val
+            assert {e.player: e.time for e in log.of_kind(EventKind.KILL)} == {
+                i: t for i, t in enumerate(outcome.death_times) if t >= 0
+            }
+            assert (outcome.width, outcome.height, outcome.items) == (
+                len(mansion.get_rooms()),
+                len(mansion.get_rooms()[0]),
+                len(mansion.get_items()),
+            )
+        with pytest.raises(KeyError):
+            store[130]
+
+
+def test_scan(tmp_path):
+    path = str(tmp_path / "outcomes.bin")
+    build(path, 0, 60, workers=1)
+
+    with OutcomeStore(path) as store:
+        outcomes = [store[n] for n in range(60)]
+        expected = [o.case_number for o in outcomes if 3 <= o.deaths <= 4 and o.time_val == 300]
+        assert store.scan(deaths=(3, 4), time_val=300) == expected
+        assert store.scan() == list(range(60))
+
+
+def test_build_checks_player_slots(tmp_path, monkeypatch):
+    """
+    Make sure a game with more players than death time columns is refused
+    instead of being cut short
+    """
+    monkeypatch.setattr("murder.outcomes.NUM_PLAYERS", 3)
+    with pytest.raises(ValueError, match="room for 3"):
+        build(str(tmp_path / "outcomes.bin"), 0, 2, workers=1)
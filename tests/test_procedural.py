@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from murder.procedural import Deck, ProceduralMansion, copy_name
+
+
+def test_deck_draws_every_card_once_per_copy():
+    deck = Deck("abcde")
+    rng = random.Random(3)
+    draws = [deck.draw(rng) for _ in range(12)]
+    assert sorted(card for card, copy in draws[:5]) == list("abcde")
+    assert sorted(card for card, copy in draws[5:10]) == list("abcde")
+    assert [copy for card, copy in draws] == [0] * 5 + [1] * 5 + [2] * 2
+    with pytest.raises(ValueError):
+        Deck([])
+
+
+def test_procedural_mansion():
+    """
+    Make sure a big mansion is generated the way it was asked for, the same
+    way every time, and plays to the end
+    """
+    mansion = ProceduralMansion("42", width=40, height=30, guests=100)
+    rooms = [room for column in mansion.get_rooms() for room in column]
+    assert (len(mansion.get_rooms()), len(mansion.get_rooms()[0])) == (40, 30)
+    assert len(mansion.get_players()) == 100
+    assert sum(p.is_murderer() for p in mansion.get_players()) == 1
+
+    # Every room is used once per copy, so names only repeat if the catalog repeats them
+    names = [room.get_room_name() for room in rooms]
+    assert len(set(names)) == len(names)
+    assert names.count("The Foyer") == 1
+    x, y = mansion.get_players()[0].get_location()
+    assert mansion.get_rooms()[x][y].get_room_name() == "The Foyer"
+    assert x in (0, 39) or y in (0, 29)
+    assert mansion.get_rooms()[x][y].alive_people() == 100
+    for room in rooms:
+        for item in room.get_items():
+            assert item.get_location() == room.get_room_name()
+
+    again = ProceduralMansion("42", width=40, height=30, guests=100)
+    assert [p.get_name() for p in again.get_players()] == [p.get_name() for p in mansion.get_players()]
+    assert [i.get_item_name() for i in again.get_items()] == [i.get_item_name() for i in mansion.get_items()]
+
+    while mansion.next_turn():
+        pass
+    assert mansion.time() == (mansion.end - mansion.start) * 60
+
+
+def test_procedural_mansion_sizes():
+    assert copy_name("Lounge", 0) == "Lounge"
+    assert copy_name("Lounge", 1) == "Lounge 2"
+
+    tiny = ProceduralMansion("1", width=1, height=1, guests=2)
+    assert tiny.get_rooms()[0][0].get_room_name() == "The Foyer"
+    assert tiny.get_items()[-1].get_item_name() == "Revolver"
+    for width, height, guests in ((0, 3, 6), (4, 0, 6), (4, 3, 1)):
+        with pytest.raises(ValueError):
+            ProceduralMansion("1", width=width, height=height, guests=guests)
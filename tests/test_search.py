@@ -0,0 +1,31 @@
+from murder.batch import play_case
+from murder.search import Constraints, parse_clock, search
+
+
+def test_search_finds_what_brute_force_finds():
+    """
+    Make sure cutting games short never loses a match, with any number of workers
+    """
+    cases = [str(n) for n in range(300)]
+    summaries = [play_case(case) for case in cases]
+    for constraints in (
+        Constraints(min_victims=3, min_time=parse_clock("9pm"), weapons=("Old Sword",)),
+        Constraints(max_victims=1),
+        Constraints(min_victims=5, max_time=150),
+        Constraints(murderer="Monsieur Verde"),
+    ):
+        expected = [s for s in summaries if constraints.matches(s)]
+        assert list(search(cases, constraints, workers=1)) == expected
+        found = search(cases, constraints, workers=2, chunk_size=40)
+        assert sorted(found, key=lambda s: int(s.case_number)) == expected
+
+
+def test_search_limit():
+    constraints = Constraints(min_victims=5)
+    assert len(list(search(range(300), constraints, workers=2, chunk_size=20, limit=3))) == 3
+    assert list(search(range(300), constraints, workers=1, limit=0)) == []
+
+
+def test_parse_clock():
+    assert parse_clock("9pm") == 180
+    assert parse_clock("8:30PM") == 150
@@ -0,0 +1,108 @@
+import asyncio
+import io
+import os
+
+import pytest
+
+from murder.server import (
+    CASE_NUMBER_REQUEST,
+    INTRO_REQUEST,
+    GameServer,
+    answers_path,
+    connect,
+)
+
+
+def test_many_sessions_at_once(tmp_path):
+    """
+    Play several sessions at once through the local client, and make sure
+    each one got its own game, questions and answers file
+    """
+    cases = [str(n) for n in range(95, 125)]
+
+    async def play_all() -> list[str]:
+        server = GameServer(speed=0, answers_dir=str(tmp_path))
+        listening = await server.start()
+        port = listening.sockets[0].getsockname()[1]
+        outputs = [io.StringIO() for _ in cases]
+        async with listening:
+            await asyncio.gather(
+                *(
+                    connect(port=port, lines=[case, "y"] + [f"answer {case}"] * 20, output=output)
+                    for case, output in zip(cases, outputs)
+                )
+            )
+        server.close()
+        return [output.getvalue() for output in outputs]
+
+    outputs = asyncio.run(play_all())
+    for case, text in zip(cases, outputs):
+        assert text.count(CASE_NUMBER_REQUEST) == 1
+        assert "Thornwood Mansion" in text
+        assert "The game ended at" in text
+        assert "Question 1 / " in text
+        assert text.endswith("Your answers have been recorded.\n")
+    assert "The game ended at 10:45pm" in outputs[cases.index("100")]
+
+    files = sorted(tmp_path.iterdir())
+    assert len(files) == len(cases)
+    for file in files:
+        lines = file.read_text().splitlines()
+        case = file.name.split("-")[0]
+        assert lines[0] == case
+        assert set(lines[1:]) == {f"answer {case}"}
+
+
+def test_unanswered_session_times_out():
+    """
+    Make sure a client that stops answering doesn't hold on to its session
+    """
+
+    async def play() -> tuple[str, GameServer]:
+        server = GameServer(speed=0, timeout=0.2)
+        listening = await server.start()
+        output = io.StringIO()
+        async with listening:
+            await connect(port=listening.sockets[0].getsockname()[1], lines=["100"], output=output)
+        server.close()
+        return output.getvalue(), server
+
+    text, server = asyncio.run(play())
+    assert text.endswith(INTRO_REQUEST + "\n")
+    assert server.active == 0
+
+
+def test_sessions_end_with_an_error_line():
+    """
+    Make sure a blank case number, or an answer longer than a line can be,
+    ends the session with a message instead of an error on the server
+    """
+
+    async def play(lines: list[str]) -> tuple[str, GameServer]:
+        server = GameServer(speed=0, timeout=5)
+        listening = await server.start()
+        output = io.StringIO()
+        async with listening:
+            await connect(port=listening.sockets[0].getsockname()[1], lines=lines, output=output)
+        server.close()
+        return output.getvalue(), server
+
+    for lines, error in (([""], "That is not a valid case number."), (["1" * 100_000], "That answer is too long.")):
+        text, server = asyncio.run(play(lines))
+        assert text.endswith(f"{CASE_NUMBER_REQUEST}\n{error}\n")
+        assert server.active == 0
+
+
+def test_answers_stay_in_their_folder(tmp_path):
+    """
+    Make sure whatever a client sends as its case number, the answers file
+    is written inside the answers folder
+    """
+    folder = os.path.realpath(tmp_path)
+    assert answers_path(str(tmp_path), "100", 3) == os.path.join(folder, "100-3.out")
+    assert answers_path(str(tmp_path), "../../etc/passwd", 1) == os.path.join(folder, "______etc_passwd-1.out")
+    assert answers_path(str(tmp_path), "/tmp/x y", 2) == os.path.join(folder, "_tmp_x_y-2.out")
+
+    os.symlink(tmp_path.parent, tmp_path / "up-1.out")
+    with pytest.raises(ValueError):
+        answers_path(str(tmp_path), "up", 1)
@@ -0,0 +1,46 @@
+from murder.mansion import Mansion
+from murder.snapshot import play_with_snapshots
+
+
+def play_to_end(mansion: Mansion) -> None:
+    while mansion.next_turn():
+        pass
+
+
+def test_restore_replays_the_same_game():
+    """
+    Make sure going back to any turn and playing on ends the game exactly like
+    it ended the first time, even on a mansion that played a different game
+    """
+    for case in ("3", "24", "100"):
+        mansion = Mansion(case)
+        snapshots = play_with_snapshots(mansion)
+        assert [s.time_val for s in snapshots[:-1]] == [5 * i for i in range(len(snapshots) - 1)]
+
+        for turn in (0, 1, len(snapshots) // 2, len(snapshots) - 2):
+            mansion.restore(snapshots[turn])
+            assert mansion.snapshot() == snapshots[turn]
+            play_to_end(mansion)
+            assert mansion.snapshot() == snapshots[-1]
+
+        other = Mansion(case)
+        play_to_end(other)
+        other.restore(snapshots[1])
+        assert [p.get_location() for p in other.get_players()] == [
+            other.grid.location(r) for r in snapshots[1].room_ids
+        ]
+        assert other.alive_players() == sum(snapshots[1].alive)
+        play_to_end(other)
+        assert other.snapshot() == snapshots[-1]
+
+
+def test_snapshots_share_unchanged_rooms():
+    """
+    Make sure consecutive snapshots store the rooms nobody went in or out of once
+    """
+    snapshots = play_with_snapshots(Mansion("24"))
+    for before, after in zip(snapshots, snapshots[1:]):
+        for a, b in zip(before.room_items, after.room_items):
+            assert (a is b) == (a == b)
+        for a, b in zip(before.occupants, after.occupants):
+            assert (a is b) == (a == b)
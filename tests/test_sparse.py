@@ -0,0 +1,103 @@
+import random
+
+import pytest
+
+from murder.catalog import get_catalog
+from murder.instrument import Profiler
+from murder.room import Room
+from murder.sparse import SparseMansion, SparseRooms, shuffled
+
+
+def final_state(mansion) -> tuple:
+    return (
+        mansion.time(),
+        [(p.get_location(), p.is_alive(), p.get_item_name()) for p in mansion.get_players()],
+        [i.is_marked() for i in mansion.get_items()],
+    )
+
+
+def test_shuffled():
+    assert sorted(shuffled(random.Random(1), 100)) == list(range(100))
+    first = list(zip(range(5), shuffled(random.Random(1), 10**12)))
+    assert len({n for _, n in first}) == 5
+
+
+def test_sparse_rooms():
+    rooms = SparseRooms(30, 20, seed=5)
+    templates = get_catalog().rooms
+    assert (len(rooms), len(rooms[0])) == (30, 20)
+    assert rooms[-1][-1] is rooms[29][19]
+    with pytest.raises(IndexError):
+        rooms[0][20]
+    assert len(rooms.rooms) == 1
+
+    # Every block of room ids holds every template once, with shared door weights and costs
+    block = [rooms.template(room_id) for room_id in range(len(templates), 2 * len(templates))]
+    assert sorted(t.name for t, _ in block) == sorted(t.name for t in templates)
+    assert {copy for _, copy in block} == {1}
+    room = rooms.room(1, 0)
+    template, _ = rooms.template(20)
+    assert room.get_door_weights() is template.door_weights
+    assert rooms.peek(1, 0) is room and rooms.peek(2, 0) is None
+
+    rooms[3][4] = Room("The Foyer", [0.25] * 4, [3] * 4)
+    assert rooms[3][4].get_room_name() == "The Foyer"
+    names = [room.get_room_name() for column in rooms for room in column]
+    assert len(names) == len(set(names)) == 600
+
+
+def test_sparse_mansion_plays_like_a_dense_one():
+    """
+    Make sure the facade behaves like a list of lists: the same mansion with
+    every room made up front plays the same game
+    """
+    sparse = SparseMansion("8", width=60, height=40, guests=80)
+    dense = SparseMansion("8", width=60, height=40, guests=80)
+    dense.room_map = [list(column) for column in dense.room_map]
+    assert len(sparse.get_items()) == 81
+    for mansion in (sparse, dense):
+        while mansion.next_turn():
+            pass
+    assert final_state(sparse) == final_state(dense)
+    assert isinstance(sparse.room_map, SparseRooms)
+    assert len(sparse.room_map.rooms) < 60 * 40
+
+
+def test_huge_sparse_mansion():
+    mansion = SparseMansion("3", width=3000, height=3000, guests=40, items=100)
+    profiler = Profiler()
+    profile = profiler.attach(mansion)
+    while mansion.next_turn():
+        pass
+    profiler.detach(mansion)
+
+    assert isinstance(mansion.room_map, SparseRooms)
+    assert len(mansion.room_map.rooms) < 2000
+    assert len(mansion.spatial_index.cells) < 2000
+    assert profile.functions["Room.add_player"] > 0
+    assert all(type(room) is Room for _, room in mansion.room_map.materialized())
+
+
+def test_sparse_rooms_are_pruned():
+    """
+    Make sure only the rooms somebody or something is in are kept, besides The
+    Foyer, and that rooms made again are the same as new
+    """
+    mansion = SparseMansion("5", width=200, height=200, guests=30, items=20)
+    room_map = mansion.room_map
+    assert isinstance(room_map, SparseRooms)
+    for _ in range(20):
+        mansion.next_turn()
+        in_use = {p.room_id for p in mansion.get_players()}
+        in_use |= {room_id for room_id, room in room_map.materialized() if room.get_items()}
+        assert set(room_map.rooms) == in_use | room_map.kept
+        assert [room_map.rooms[room_id].get_room_name() for room_id in room_map.kept] == ["The Foyer"]
+
+    room_id = next(room_id for room_id in range(200 * 200) if room_id not in room_map.rooms)
+    x, y = divmod(room_id, 200)
+    room = room_map[x][y]
+    template, _ = room_map.template(room_id)
+    assert (room.get_people(), room.get_items(), room.alive_people()) == ([], [], 0)
+    assert room.get_door_weights() is template.door_weights
+    room_map.prune()
+    assert room_map.peek(x, y) is None
@@ -0,0 +1,49 @@
+import random
+
+from murder.spatial import SpatialIndex
+
+
+def brute_force_nearest(where: dict[int, tuple[int, int]], x: int, y: int, exclude: set[int]) -> int:
+    best, best_distance = -1, float("inf")
+    for player in sorted(where):
+        px, py = where[player]
+        distance = ((px - x) ** 2 + (py - y) ** 2) ** 0.5
+        if player not in exclude and distance < best_distance:
+            best, best_distance = player, distance
+    return best
+
+
+def test_spatial_index_matches_brute_force():
+    """
+    Make sure ring search finds the same player (including on ties) as
+    checking every player, while players move around and get removed
+    """
+    rng = random.Random(7)
+    width, height = 37, 23
+    index = SpatialIndex(width, height, cell_size=4)
+    where = {}
+    for player in range(60):
+        where[player] = (rng.randrange(width), rng.randrange(height))
+        index.place(player, *where[player])
+
+    for _ in range(2000):
+        player = rng.randrange(60)
+        if rng.random() < 0.05:
+            where.pop(player, None)
+            index.remove(player)
+        elif player in where:
+            where[player] = (rng.randrange(width), rng.randrange(height))
+            index.place(player, *where[player])
+
+        x, y = rng.randrange(width), rng.randrange(height)
+        exclude = {rng.randrange(60) for _ in range(rng.randrange(3))}
+        assert index.nearest(x, y, exclude) == brute_force_nearest(where, x, y, exclude)
+    assert len(index) == len(where)
+
+
+def test_spatial_index_empty():
+    index = SpatialIndex(6, 4)
+    assert index.nearest(0, 0) == -1
+    index.place(3, 5, 3)
+    assert index.nearest(0, 0, exclude={3}) == -1
+    assert index.nearest(0, 0) == 3
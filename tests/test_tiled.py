@@ -0,0 +1,70 @@
+import pytest
+
+from murder.procedural import ProceduralMansion
+from murder.sparse import SparseMansion
+from murder.tiled import Tile, TiledGame, columns_of, rooms_in
+
+
+def play(mansion, tiles, processes=False):
+    with TiledGame(mansion, tiles, seed=7, processes=processes) as game:
+        game.run()
+        game.write_back()
+    return mansion
+
+
+def outcome(mansion):
+    players = [(p.get_location(), p.is_alive(), p.get_item_name()) for p in mansion.get_players()]
+    return mansion.time(), players, [i.is_marked() for i in mansion.get_items()]
+
+
+def test_columns_of():
+    assert [list(columns_of(t, 3, 10)) for t in range(3)] == [[0, 1, 2], [3, 4, 5], [6, 7, 8, 9]]
+    assert [list(columns_of(t, 4, 2)) for t in range(4)] == [[], [0], [], [1]]
+
+
+def test_tiled_game_is_reproducible():
+    """
+    Make sure a seed and a tile count always play the same game, whether the
+    tiles run in worker processes or not
+    """
+    first = play(ProceduralMansion("42", width=40, height=30, guests=100), 3)
+    again = play(ProceduralMansion("42", width=40, height=30, guests=100), 3)
+    workers = play(ProceduralMansion("42", width=40, height=30, guests=100), 3, processes=True)
+    assert outcome(first) == outcome(again) == outcome(workers)
+    assert first.time() == (first.end - first.start) * 60
+
+
+def test_tiled_game_write_back():
+    """
+    Make sure the mansion written back holds every player and item exactly once
+    """
+    for tiles in (1, 2, 5):
+        mansion = play(SparseMansion("3", width=60, height=50, guests=200), tiles)
+        rooms = mansion.get_rooms()
+        for p in mansion.get_players():
+            x, y = p.get_location()
+            assert [q.index for q in rooms[x][y].get_people()].count(p.index) == 1
+        assert mansion.alive_players() == sum(p.is_alive() for p in mansion.get_players())
+
+        held = [id(p.holds) for p in mansion.get_players() if p.holds is not None]
+        lying = [id(item) for room_id, room in rooms_in(rooms) for item in room.get_items()]
+        assert sorted(held + lying) == sorted(id(item) for item in mansion.get_items())
+        for room_id, room in rooms_in(rooms):
+            assert room.alive_people() == sum(p.is_alive() for p in room.occupants.values())
+
+
+def test_tile_doors_of():
+    """
+    Make sure a tile of a dense mansion refuses rooms it wasn't given the doors
+    of, and a tile of a sparse one takes them from the layout
+    """
+    dense = Tile(0, range(2), (4, 3), murderer=0, num_players=2, marked=set())
+    dense.doors[0] = ((0.5,) * 4, (1,) * 4)
+    assert dense.doors_of(0) == ((0.5,) * 4, (1,) * 4)
+    with pytest.raises(ValueError):
+        dense.doors_of(1)
+
+    sparse = Tile(0, range(2), (4, 3), murderer=0, num_players=2, marked=set(), layout=(4, 3, 9))
+    assert sparse.layout is not None
+    template, _ = sparse.layout.template(1)
+    assert sparse.doors_of(1) == (template.door_weights, template.door_costs)
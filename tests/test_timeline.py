@@ -0,0 +1,49 @@
+from murder.mansion import Mansion
+from murder.timeline import index_game
+
+
+def test_timeline_matches_turn_by_turn_state():
+    """
+    Compare every query against the state of a second copy of the game,
+    played turn by turn
+    """
+    for case_number in ["99", "100", "7", "12345"]:
+        _, timeline = index_game(case_number)
+
+        m = Mansion(case_number)
+        assert timeline.alive_at(-5) == len(m.players)
+        while True:
+            before = m.time_val
+            playing = m.next_turn()
+            if m.time_val == before:
+                break
+            for p, player in enumerate(m.players):
+                assert timeline.room_of(p, before) == player.get_location()
+            for i, item in enumerate(m.items):
+                holder = timeline.holder_of(i, before)
+                assert (holder >= 0 and m.players[holder].get_holds() is item) or (
+                    holder == -1 and not any(p.get_holds() is item for p in m.players)
+                )
+            assert timeline.alive_at(before) == m.alive_players()
+            assert timeline.dead_at(before) == len(m.players) - m.alive_players()
+            if not playing:
+                break
+
+
+def test_timeline_deaths_and_items():
+    m, timeline = index_game("100")
+
+    for p, player in enumerate(m.players):
+        death = timeline.death(p)
+        if player.is_alive():
+            assert death is None
+        else:
+            assert death is not None
+            assert death.room == player.get_location()
+            assert death.time < m.time_val
+
+    for i, item in enumerate(m.items):
+        first, last = timeline.first_grab(i), timeline.last_grab(i)
+        assert (first is None) == (last is None)
+        if first is not None and last is not None:
+            assert first.time <= last.time
@@ -0,0 +1,84 @@
+import pytest
+
+from murder.dice import Dice
+from murder.doors import DoorTable
+from murder.events import EventLog
+from murder.mansion import Mansion
+from murder.procedural import ProceduralMansion
+from murder.trace import dumps, load, loads, record, replay, save
+from murder.utils import hash
+
+
+def final_state(mansion: Mansion) -> tuple:
+    return (
+        mansion.time(),
+        [(p.get_name(), p.get_location(), p.is_alive(), p.get_item_name()) for p in mansion.get_players()],
+        [(i.get_item_name(), i.is_marked()) for i in mansion.get_items()],
+    )
+
+
+def test_replay_plays_the_recorded_game():
+    """
+    Make sure replaying a trace (straight away, and after a round trip through
+    its binary form) ends the game exactly like the recording, event for event
+    """
+    for case in ("1", "24", "100", "2024"):
+        expected = Mansion(case)
+        expected_log = EventLog().attach(expected)
+        while expected.next_turn():
+            pass
+
+        recorded = Mansion(case)
+        trace = record(recorded, case)
+        assert final_state(recorded) == final_state(expected)
+
+        for again in (trace, loads(dumps(trace))):
+            log = EventLog()
+            mansion = replay(again, recorder=log)
+            assert final_state(mansion) == final_state(expected)
+            assert list(log) == list(expected_log)
+
+
+def test_replay_never_draws_from_the_random_stream(tmp_path):
+    """
+    Make sure a replay only reads decisions from the trace, and that traces
+    recorded with alias sampling replay too
+    """
+    mansion = Mansion("77")
+    mansion.doors = DoorTable(mansion.get_rooms(), alias=True)
+    trace = record(mansion, "77")
+    save(trace, str(tmp_path / "77.trace"))
+
+    replayed = replay(load(str(tmp_path / "77.trace")))
+    assert final_state(replayed) == final_state(mansion)
+    assert replayed.rng.getstate() == Dice(hash("77")).getstate()
+
+
+def test_trace_of_a_big_mansion():
+    """
+    Make sure mansions with more than 255 guests and rooms along a side fit in a trace
+    """
+    expected = ProceduralMansion("1", width=300, height=20, guests=300)
+    while expected.next_turn():
+        pass
+
+    trace = record(ProceduralMansion("1", width=300, height=20, guests=300), "1")
+    assert loads(dumps(trace)) == trace
+    assert final_state(replay(loads(dumps(trace)))) == final_state(expected)
+
+
+def test_replay_checks_every_roll():
+    """
+    Make sure a replay stops with an error when the game rolls in another
+    range than the trace did, or rolls more than the trace holds, instead of
+    quietly playing a different game
+    """
+    trace = record(Mansion("1"), "1")
+    moves = trace.ranges.index((3, 7))
+    changed = trace._replace(ranges=trace.ranges[:moves] + ((3, 8),) + trace.ranges[moves + 1 :])
+    with pytest.raises(ValueError, match=r"Roll 0 of the trace is randint\(3, 8\), the game rolled randint\(3, 7\)"):
+        replay(changed)
+
+    cut = trace._replace(range_ids=trace.range_ids[:10], rolls=trace.rolls[:10])
+    with pytest.raises(ValueError, match=r"The trace has no roll 10"):
+        replay(cut)